@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Parallel product processing scaling benchmark.
+
+Runs the same synthetic campaign brief through PipelineOrchestrator with
+1..N workers and prints wall-clock time and speedup relative to the
+sequential run. GenAI latency is simulated with a fixed sleep so the
+benchmark needs no API keys.
+
+Usage:
+    python benchmarks/parallel_scaling.py --products 16 --max-workers 8 --latency 0.5
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.clients.genai_client import GenAIClient
+from src.orchestrator import PipelineOrchestrator
+
+
+class SleepingGenAIClient(GenAIClient):
+    """GenAI client that simulates provider latency with a fixed sleep."""
+    
+    def __init__(self, latency: float):
+        super().__init__(api_key="benchmark")
+        self.latency = latency
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        time.sleep(self.latency)
+        return Image.new('RGB', size, color=(30, 90, 160))
+
+
+def write_brief(directory: Path, product_count: int) -> str:
+    """Write a synthetic brief with the requested number of products."""
+    brief = {
+        'campaign_id': 'scaling_benchmark',
+        'products': [
+            {'product_id': f'sku_{i:04d}', 'name': f'Product {i}'}
+            for i in range(product_count)
+        ],
+        'target_region': 'US',
+        'target_audience': 'benchmark shoppers',
+        'campaign_message': 'Scaling benchmark message'
+    }
+    brief_path = directory / 'brief.json'
+    brief_path.write_text(json.dumps(brief))
+    return str(brief_path)
+
+
+def run_once(brief_path: str, work_dir: Path, workers: int, latency: float) -> float:
+    """Run the orchestrator once and return wall-clock seconds."""
+    config = {
+        'storage': {
+            'input_dir': str(work_dir / 'input'),
+            'output_dir': str(work_dir / f'output_{workers}')
+        },
+        'aspect_ratios': ['1:1', '9:16', '16:9'],
+        'logging': {'level': 'ERROR', 'file': None},
+        'performance': {
+            'parallel_processing': workers > 1,
+            'max_workers': workers
+        }
+    }
+    orchestrator = PipelineOrchestrator(config)
+    orchestrator.genai_client = SleepingGenAIClient(latency)
+    
+    start = time.perf_counter()
+    result = orchestrator.run(brief_path)
+    elapsed = time.perf_counter() - start
+    
+    if not result.success:
+        raise RuntimeError(f"Benchmark run failed: {result.errors}")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=16, help='Products in the synthetic brief')
+    parser.add_argument('--max-workers', type=int, default=8, help='Largest worker count to measure')
+    parser.add_argument('--latency', type=float, default=0.5, help='Simulated GenAI latency in seconds')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        brief_path = write_brief(work_dir, args.products)
+        
+        worker_counts = sorted({1, 2, 4, args.max_workers} & set(range(1, args.max_workers + 1)))
+        baseline = None
+        
+        print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+        for workers in worker_counts:
+            elapsed = run_once(brief_path, work_dir, workers, args.latency)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.2f} {baseline / elapsed:>7.2f}x")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,8 +13,6 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any
 
-from src.orchestrator import PipelineOrchestrator
-
 
 def parse_arguments() -> argparse.Namespace:
     """
@@ -39,16 +37,96 @@ Examples:
   
   # Enable verbose debug logging
   python pipeline.py --brief campaign_brief.yaml --verbose
+  
+  # Process every brief in a directory (or a glob, or a .jsonl file) in one process
+  python pipeline.py --briefs briefs/ --batch-concurrency 4
+  
+  # Review drafts of a brief in seconds, then build the final assets
+  python pipeline.py --brief campaign_brief.yaml --preview
+  python pipeline.py --brief campaign_brief.yaml
+  
+  # Continue an interrupted run without redoing completed work
+  python pipeline.py --brief campaign_brief.yaml --resume
+  
+  # Run as a daemon accepting briefs on http://127.0.0.1:8080/jobs
+  python pipeline.py --serve --port 8080
+  
+  # Record provider responses, then rerun offline against the recording
+  python pipeline.py --brief campaign_brief.yaml --record-cassette cassettes/spring
+  python pipeline.py --brief campaign_brief.yaml --replay-cassette cassettes/spring
+  
+  # Measure throughput with synthetic briefs and a local image generator
+  python pipeline.py bench --briefs 2 --products 20 --output bench.json
         """
     )
     
-    parser.add_argument(
+    brief_group = parser.add_mutually_exclusive_group(required=True)
+    brief_group.add_argument(
         '--brief',
         type=str,
-        required=True,
         help='Path to campaign brief file (JSON or YAML format)'
     )
     
+    brief_group.add_argument(
+        '--briefs',
+        type=str,
+        help='Batch mode: directory of briefs, glob pattern, or .jsonl file with one brief per line'
+    )
+    
+    brief_group.add_argument(
+        '--serve',
+        action='store_true',
+        help='Daemon mode: keep the pipeline warm and accept briefs over a local HTTP API'
+    )
+    
+    parser.add_argument(
+        '--host',
+        type=str,
+        default=None,
+        help='Daemon mode: interface to bind (default: server.host or 127.0.0.1)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=None,
+        help='Daemon mode: port to listen on (default: server.port or 8080)'
+    )
+    
+    parser.add_argument(
+        '--batch-concurrency',
+        type=int,
+        default=None,
+        help='Number of briefs to run concurrently in batch mode (default: performance.max_concurrent_briefs or 1)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume an interrupted run from its checkpoint journal'
+    )
+    
+    parser.add_argument(
+        '--preview',
+        action='store_true',
+        help='Write reduced-resolution drafts and a contact sheet per campaign for quick review'
+    )
+    
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        '--record-cassette',
+        type=str,
+        metavar='DIR',
+        help='Record GenAI responses and their latency to a cassette directory'
+    )
+    
+    cassette_group.add_argument(
+        '--replay-cassette',
+        type=str,
+        metavar='DIR',
+        help='Serve GenAI responses from a recorded cassette instead of calling the provider'
+    )
+    
     parser.add_argument(
         '--config',
         type=str,
@@ -153,10 +231,22 @@ def _apply_cli_overrides(config: Dict[str, Any], args: argparse.Namespace) -> Di
     if args.compliance:
         config.setdefault('compliance', {})['enabled'] = True
     
+    # Draft-resolution preview instead of final assets
+    if args.preview:
+        config.setdefault('preview', {})['enabled'] = True
+    
     # Override logging level for verbose mode
     if args.verbose:
         config.setdefault('logging', {})['level'] = 'DEBUG'
     
+    # Record or replay GenAI responses
+    if args.record_cassette:
+        cassette_config = config.setdefault('genai', {}).get('cassette') or {}
+        config['genai']['cassette'] = {**cassette_config, 'mode': 'record', 'dir': args.record_cassette}
+    elif args.replay_cassette:
+        cassette_config = config.setdefault('genai', {}).get('cassette') or {}
+        config['genai']['cassette'] = {**cassette_config, 'mode': 'replay', 'dir': args.replay_cassette}
+    
     return config
 
 
@@ -176,7 +266,10 @@ def validate_configuration(config: Dict[str, Any]) -> None:
     
     genai_config = config['genai']
     
-    if not genai_config.get('api_key'):
+    # The local generator and cassette replay never call a provider
+    offline = (genai_config.get('provider') == 'local'
+               or (genai_config.get('cassette') or {}).get('mode') == 'replay')
+    if not offline and not genai_config.get('api_key'):
         raise ValueError(
             "GenAI API key not configured. "
             "Set OPENAI_API_KEY environment variable or update config.yaml"
@@ -250,6 +343,79 @@ def print_summary(result) -> None:
     print("="*60 + "\n")
 
 
+def run_batch(orchestrator, config: Dict[str, Any], args: argparse.Namespace) -> int:
+    """
+    Run every brief matched by --briefs on one warm orchestrator.
+    
+    Args:
+        orchestrator: Orchestrator shared by all briefs
+        config: Configuration dictionary
+        args: Parsed command-line arguments
+    
+    Returns:
+        Exit code (0 if every brief succeeded, 1 otherwise)
+    """
+    from src.batch import BatchRunner, resolve_briefs
+    
+    staging_dir = Path(config['storage']['output_dir']) / '.batch_briefs'
+    brief_paths = resolve_briefs(args.briefs, str(staging_dir))
+    
+    concurrency = args.batch_concurrency
+    if concurrency is None:
+        concurrency = config.get('performance', {}).get('max_concurrent_briefs', 1)
+    
+    print(f"\nProcessing {len(brief_paths)} campaign briefs ({concurrency} concurrent)")
+    print("-" * 60)
+    runner = BatchRunner(orchestrator, max_concurrent_briefs=concurrency)
+    results, report = runner.run(brief_paths, resume=args.resume)
+    
+    for result in results:
+        print_summary(result)
+    print(f"Batch report: {runner.default_report_path}")
+    
+    return 0 if report['success'] else 1
+
+
+def run_server(orchestrator, config: Dict[str, Any], args: argparse.Namespace) -> int:
+    """
+    Serve briefs over HTTP until SIGINT or SIGTERM, then drain and exit.
+    
+    Args:
+        orchestrator: Orchestrator shared by all jobs
+        config: Configuration dictionary
+        args: Parsed command-line arguments
+    
+    Returns:
+        Exit code (always 0 after a clean drain)
+    """
+    import signal
+    import threading
+    from src.server import PipelineServer
+    
+    server_config = config.get('server', {})
+    server = PipelineServer(
+        orchestrator,
+        host=args.host or server_config.get('host', '127.0.0.1'),
+        port=args.port if args.port is not None else server_config.get('port', 8080),
+        max_concurrent_jobs=server_config.get('max_concurrent_jobs', 1),
+        max_queued_jobs=server_config.get('max_queued_jobs', 64)
+    )
+    
+    stop_requested = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_requested.set())
+    
+    server.start()
+    print(f"\nServing on http://{server.host}:{server.port} (Ctrl+C to drain and stop)")
+    
+    while not stop_requested.wait(0.5):
+        pass
+    
+    print("\nDraining queued jobs...")
+    server.shutdown(drain=True)
+    return 0
+
+
 def main() -> int:
     """
     Main entry point for the pipeline.
@@ -257,12 +423,16 @@ def main() -> int:
     Returns:
         Exit code (0 for success, 1 for failure)
     """
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from src.bench import main as bench_main
+        return bench_main(sys.argv[2:])
+    
     try:
         # Parse command-line arguments
         args = parse_arguments()
         
         # Validate brief file exists
-        if not Path(args.brief).exists():
+        if args.brief and not Path(args.brief).exists():
             print(f"Error: Campaign brief file not found: {args.brief}", file=sys.stderr)
             return 1
         
@@ -273,14 +443,24 @@ def main() -> int:
         print("Validating configuration...")
         validate_configuration(config)
         
-        # Initialize pipeline orchestrator
+        # Initialize pipeline orchestrator (imported here so --help and bad
+        # configurations fail fast without loading the pipeline)
         print("Initializing pipeline orchestrator...")
-        orchestrator = PipelineOrchestrator(config)
+        from src.orchestrator import create_orchestrator
+        orchestrator = create_orchestrator(config)
         
-        # Execute pipeline
-        print(f"\nProcessing campaign brief: {args.brief}")
-        print("-" * 60)
-        result = orchestrator.run(args.brief)
+        try:
+            if args.serve:
+                return run_server(orchestrator, config, args)
+            if args.briefs:
+                return run_batch(orchestrator, config, args)
+            
+            # Execute pipeline
+            print(f"\nProcessing campaign brief: {args.brief}")
+            print("-" * 60)
+            result = orchestrator.run(args.brief, resume=args.resume)
+        finally:
+            orchestrator.close()
         
         # Print summary
         print_summary(result)
@@ -0,0 +1,197 @@
+"""Asyncio-based pipeline orchestrator that overlaps generation and compositing."""
+
+import asyncio
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.models import CampaignBrief, GeneratedAsset
+from src.orchestrator import PipelineOrchestrator
+
+
+class AsyncPipelineOrchestrator(PipelineOrchestrator):
+    """
+    Pipeline orchestrator that keeps many GenAI requests in flight.
+    
+    Every product becomes an asyncio task. Generation calls are bounded by
+    a semaphore and awaited through the client's async interface (clients
+    without one run on a dedicated I/O thread pool), while cropping,
+    text overlay, saving and compliance checks run on a separate CPU pool,
+    so finished images are composited while other prompts are still
+    pending. The public run(brief_path) -> PipelineResult contract is
+    unchanged.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the async orchestrator.
+        
+        Args:
+            config: Configuration dictionary (see PipelineOrchestrator). Reads
+                performance.max_inflight_generations (default: 8) and
+                performance.cpu_workers (default: CPU count).
+        """
+        super().__init__(config)
+        
+        perf_config = config.get('performance', {})
+        self.max_inflight_generations = max(1, int(perf_config.get('max_inflight_generations', 8)))
+        self.cpu_workers = max(1, int(perf_config.get('cpu_workers') or os.cpu_count() or 1))
+    
+    def _process_products(self, brief: CampaignBrief,
+                          metrics: Dict[str, Any]) -> Tuple[List[GeneratedAsset], List[str]]:
+        """
+        Process every product on an event loop.
+        
+        Args:
+            brief: CampaignBrief containing the products to process
+            metrics: Run metrics dictionary (unused by this engine)
+        
+        Returns:
+            Tuple of (outputs, errors) in brief order
+        """
+        self.logger.info(
+            f"Processing products asynchronously "
+            f"({self.max_inflight_generations} in-flight generations, {self.cpu_workers} CPU workers)"
+        )
+        return asyncio.run(self._aprocess_products(brief))
+    
+    async def _aprocess_products(self, brief: CampaignBrief) -> Tuple[List[GeneratedAsset], List[str]]:
+        """
+        Schedule one task per product and gather their results in brief order.
+        
+        Args:
+            brief: CampaignBrief containing the products to process
+        
+        Returns:
+            Tuple of (outputs, errors)
+        """
+        generation_slots = asyncio.Semaphore(self.max_inflight_generations)
+        
+        with ThreadPoolExecutor(max_workers=self.max_inflight_generations,
+                                thread_name_prefix="genai") as io_executor, \
+             ThreadPoolExecutor(max_workers=self.cpu_workers,
+                                thread_name_prefix="composite") as cpu_executor:
+            try:
+                results = await asyncio.gather(*[
+                    self._aprocess_product(brief, product, generation_slots, io_executor, cpu_executor)
+                    for product in brief.products
+                ])
+            finally:
+                # Connection pools are bound to this run's event loop
+                aclose = getattr(self.genai_client, 'aclose', None)
+                if inspect.iscoroutinefunction(aclose):
+                    await aclose()
+        
+        outputs = []
+        errors = []
+        for product_outputs, error in results:
+            outputs.extend(product_outputs)
+            if error:
+                errors.append(error)
+        
+        return outputs, errors
+    
+    async def _aprocess_product(self, brief: CampaignBrief, product,
+                                generation_slots: asyncio.Semaphore,
+                                io_executor: ThreadPoolExecutor,
+                                cpu_executor: ThreadPoolExecutor) -> Tuple[List[GeneratedAsset], Optional[str]]:
+        """
+        Acquire a hero image for one product and composite its variants.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to process
+            generation_slots: Semaphore bounding in-flight generations
+            io_executor: Thread pool for asset lookup and GenAI calls
+            cpu_executor: Thread pool for compositing, saving and compliance
+        
+        Returns:
+            Tuple of (outputs, error message or None)
+        """
+        loop = asyncio.get_running_loop()
+        
+        try:
+            self.logger.info(f"Processing product: {product.product_id} ({product.name})")
+            
+            product_outputs = self._resumed_outputs(brief, product)
+            if product_outputs is None:
+                hero_image, was_generated = await loop.run_in_executor(
+                    io_executor, self._lookup_hero_image, brief, product
+                )
+                
+                if not hero_image:
+                    prompt = self._build_generation_prompt(brief, product)
+                    async with generation_slots:
+                        with self._timed(brief, 'generate', product.product_id):
+                            hero_image = await self._agenerate_hero(brief, product, prompt, io_executor)
+                    await loop.run_in_executor(
+                        io_executor, self._on_hero_generated, brief, product, hero_image
+                    )
+                    was_generated = True
+                
+                product_outputs = await loop.run_in_executor(
+                    cpu_executor, self._composite_product, brief, product, hero_image, was_generated
+                )
+            
+            self.logger.log_operation(
+                f"Product {product.product_id}",
+                "success",
+                {"assets_generated": len(product_outputs)}
+            )
+            return product_outputs, None
+        
+        except Exception as e:
+            error_msg = f"Failed to process product {product.product_id}: {str(e)}"
+            self.logger.error(error_msg)
+            return [], error_msg
+    
+    async def _agenerate_hero(self, brief: CampaignBrief, product, prompt: str,
+                              io_executor: ThreadPoolExecutor):
+        """
+        Generate a product's hero image at every planned size (see _generate_hero).
+        
+        The sizes are requested concurrently within the product's generation slot.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to generate for
+            prompt: Generation prompt
+            io_executor: Thread pool used for blocking client calls
+        
+        Returns:
+            Hero image
+        """
+        if self.generation_plan is None:
+            return await self._agenerate_hero_image(prompt, io_executor)
+        
+        sizes = self.generation_plan.sizes
+        images = await asyncio.gather(*[
+            self._agenerate_hero_image(prompt, io_executor, size) for size in sizes
+        ])
+        self._keep_extra_heroes(brief, product, dict(zip(sizes[1:], images[1:])))
+        return images[0]
+    
+    async def _agenerate_hero_image(self, prompt: str, io_executor: ThreadPoolExecutor,
+                                    size: Optional[Tuple[int, int]] = None):
+        """
+        Generate a hero image without blocking the event loop.
+        
+        Clients with a native agenerate_image() are awaited directly; other
+        (duck-typed) clients run their blocking generate_image() on the
+        I/O thread pool.
+        
+        Args:
+            prompt: Generation prompt
+            io_executor: Thread pool used for blocking client calls
+            size: Image size, or None for the client's default
+        
+        Returns:
+            PIL Image object
+        """
+        args = (prompt,) if size is None else (prompt, size)
+        agenerate = getattr(self.genai_client, 'agenerate_image', None)
+        if inspect.iscoroutinefunction(agenerate):
+            return await agenerate(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(io_executor, self.genai_client.generate_image, *args)
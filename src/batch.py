@@ -0,0 +1,153 @@
+"""Multi-brief batch execution on a single warm orchestrator."""
+
+import glob
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.models import PipelineResult
+from src.orchestrator import PipelineOrchestrator
+from src.utils.reporter import PipelineReporter
+
+
+BRIEF_EXTENSIONS = {'.json', '.yaml', '.yml'}
+
+
+def resolve_briefs(spec: str, staging_dir: str) -> List[str]:
+    """
+    Expand a --briefs argument into an ordered list of brief files.
+    
+    Args:
+        spec: A directory of brief files, a glob pattern, or a .jsonl file
+            with one brief object per line
+        staging_dir: Directory where briefs from a .jsonl file are written
+    
+    Returns:
+        List of brief file paths
+    
+    Raises:
+        FileNotFoundError: If the spec matches no briefs
+        ValueError: If a .jsonl line is not valid JSON
+    """
+    path = Path(spec)
+    
+    if path.is_dir():
+        briefs = sorted(
+            str(p) for p in path.iterdir()
+            if p.is_file() and p.suffix.lower() in BRIEF_EXTENSIONS
+        )
+    elif path.is_file() and path.suffix.lower() == '.jsonl':
+        briefs = _stage_jsonl_briefs(path, Path(staging_dir))
+    elif glob.has_magic(spec):
+        briefs = sorted(
+            p for p in glob.glob(spec)
+            if Path(p).is_file() and Path(p).suffix.lower() in BRIEF_EXTENSIONS
+        )
+    elif path.is_file():
+        briefs = [str(path)]
+    else:
+        briefs = []
+    
+    if not briefs:
+        raise FileNotFoundError(f"No campaign briefs found for: {spec}")
+    
+    return briefs
+
+
+def _stage_jsonl_briefs(jsonl_path: Path, staging_dir: Path) -> List[str]:
+    """
+    Write each line of a .jsonl file to its own brief file.
+    
+    Args:
+        jsonl_path: File with one JSON brief per line
+        staging_dir: Directory to write the individual briefs to
+    
+    Returns:
+        List of written brief file paths
+    """
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    briefs = []
+    
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number} of {jsonl_path}: {e}")
+            
+            brief_path = staging_dir / f"{jsonl_path.stem}_{line_number:05d}.json"
+            with open(brief_path, 'w', encoding='utf-8') as out:
+                json.dump(data, out)
+            briefs.append(str(brief_path))
+    
+    return briefs
+
+
+class BatchRunner:
+    """Runs many campaign briefs through one warm orchestrator."""
+    
+    def __init__(self, orchestrator: PipelineOrchestrator, max_concurrent_briefs: int = 1):
+        """
+        Initialize the batch runner.
+        
+        Args:
+            orchestrator: Orchestrator shared by every brief, so GenAI clients,
+                fonts and compliance templates are loaded once
+            max_concurrent_briefs: Number of briefs to run at the same time
+        """
+        self.orchestrator = orchestrator
+        self.max_concurrent_briefs = max(1, max_concurrent_briefs)
+    
+    @property
+    def default_report_path(self) -> str:
+        """Where run() writes the batch report unless given a report_path (the orchestrator's output directory)."""
+        return str(Path(self.orchestrator.asset_manager.output_dir) / "batch_report.json")
+    
+    def run(self, brief_paths: List[str], report_path: Optional[str] = None,
+            resume: bool = False) -> Tuple[List[PipelineResult], dict]:
+        """
+        Execute every brief and write an aggregated batch report.
+        
+        A failing brief is recorded in its PipelineResult and does not stop
+        the batch.
+        
+        Args:
+            brief_paths: Brief files to process
+            report_path: Optional path for the batch report JSON
+            resume: Resume each brief from its checkpoint journal
+        
+        Returns:
+            Tuple of (results in brief order, batch report dictionary)
+        """
+        start_time = datetime.now()
+        logger = self.orchestrator.logger
+        logger.info(
+            f"Starting batch of {len(brief_paths)} briefs "
+            f"({self.max_concurrent_briefs} concurrent)"
+        )
+        
+        if self.max_concurrent_briefs > 1 and len(brief_paths) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_briefs,
+                                    thread_name_prefix="brief") as executor:
+                results = list(executor.map(
+                    lambda brief_path: self.orchestrator.run(brief_path, resume=resume), brief_paths
+                ))
+        else:
+            results = [self.orchestrator.run(brief_path, resume=resume) for brief_path in brief_paths]
+        
+        end_time = datetime.now()
+        report = PipelineReporter.generate_batch_report(
+            brief_paths=brief_paths,
+            results=results,
+            start_time=start_time,
+            end_time=end_time,
+            output_dir=str(self.orchestrator.asset_manager.output_dir),
+            output_path=report_path or self.default_report_path
+        )
+        
+        logger.info("\n" + PipelineReporter.format_batch_summary(report))
+        return results, report
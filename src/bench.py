@@ -0,0 +1,428 @@
+"""Throughput benchmark that runs synthetic briefs through the full orchestrator."""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from src.models import PipelineResult
+from src.orchestrator import create_orchestrator
+from src.utils.reporter import PipelineReporter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Modules `pipeline.py --brief` imports before it starts processing
+STARTUP_MODULES = ("pipeline", "src.orchestrator")
+
+# Import time allowed for STARTUP_MODULES in a fresh interpreter
+STARTUP_BUDGET_SECONDS = 0.5
+
+# GenAI SDKs and compliance dependencies, loaded only on first use
+DEFERRED_MODULES = ("openai", "httpx", "vertexai", "google.cloud.aiplatform", "cv2", "sklearn")
+
+# Slowest imports listed in the startup report
+STARTUP_SLOWEST = 10
+
+
+def write_synthetic_briefs(directory: Path, brief_count: int, product_count: int) -> List[str]:
+    """
+    Write synthetic campaign briefs.
+    
+    Args:
+        directory: Directory to write the briefs to
+        brief_count: Number of briefs (campaigns)
+        product_count: Products per brief
+    
+    Returns:
+        List of brief file paths
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    brief_paths = []
+    for b in range(brief_count):
+        brief = {
+            'campaign_id': f'bench_{b:03d}',
+            'products': [
+                {'product_id': f'sku_{b:03d}_{p:04d}', 'name': f'Benchmark Product {p}'}
+                for p in range(product_count)
+            ],
+            'target_region': 'US',
+            'target_audience': 'benchmark shoppers',
+            'campaign_message': 'Synthetic benchmark campaign message for overlay'
+        }
+        brief_path = directory / f'bench_{b:03d}.json'
+        brief_path.write_text(json.dumps(brief))
+        brief_paths.append(str(brief_path))
+    return brief_paths
+
+
+def run_benchmark(briefs: int = 1, products: int = 8, aspect_ratios: Optional[List[str]] = None,
+                  latency: float = 0.0, image_size: int = 1024,
+                  base_config: Optional[Dict[str, Any]] = None,
+                  work_dir: Optional[str] = None, response_format: Optional[str] = None,
+                  round_trip: float = 0.0, local_settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run synthetic briefs through the orchestrator and measure throughput.
+    
+    Args:
+        briefs: Number of briefs to run, one after another on a warm orchestrator
+        products: Products per brief
+        aspect_ratios: Aspect ratios to render (default: 1:1, 9:16, 16:9)
+        latency: Simulated GenAI latency in seconds per image
+        image_size: Edge length of the generated square hero images
+        base_config: Configuration whose performance and text_overlay
+            sections, and genai rate_limits, circuit_breakers and
+            retry_budgets, are used
+            (everything else is replaced)
+        work_dir: Directory for briefs and outputs (default: a temporary one)
+        response_format: Simulated image delivery: None (direct), "b64_json"
+            (inline base64 PNG) or "url" (PNG fetched with a second request)
+        round_trip: Seconds per simulated download in "url" mode
+        local_settings: Further `provider: local` settings (e.g.,
+            latency_distribution, failure_rate, rate_limit_rate, seed)
+    
+    Returns:
+        Benchmark result dictionary (see main() for the layout)
+    
+    Raises:
+        RuntimeError: If any brief fails while no failures are injected
+    """
+    if work_dir is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_benchmark(briefs, products, aspect_ratios, latency, image_size, base_config, tmp,
+                                 response_format, round_trip, local_settings)
+    
+    root = Path(work_dir)
+    brief_paths = write_synthetic_briefs(root / 'briefs', briefs, products)
+    aspect_ratios = aspect_ratios or ['1:1', '9:16', '16:9']
+    
+    config = dict(base_config or {})
+    genai_config = {
+        key: value for key, value in (config.get('genai') or {}).items()
+        if key in ('rate_limits', 'circuit_breakers', 'retry_budgets')
+    }
+    genai_config.update({
+        'provider': 'local',
+        'latency_seconds': latency,
+        'image_size': [image_size, image_size],
+        'response_format': response_format,
+        'round_trip_seconds': round_trip,
+        **(local_settings or {})
+    })
+    config.update({
+        'storage': {'input_dir': str(root / 'input'), 'output_dir': str(root / 'output')},
+        'genai': genai_config,
+        'aspect_ratios': aspect_ratios,
+        'logging': {'level': 'ERROR', 'file': None},
+        'compliance': {'enabled': False}
+    })
+    
+    # The local provider goes through the same caching, coalescing, rate
+    # limiting and circuit breaking as a real one
+    orchestrator = create_orchestrator(config)
+    
+    cpu_start = _cpu_seconds()
+    start = time.perf_counter()
+    try:
+        results = [orchestrator.run(brief_path) for brief_path in brief_paths]
+    finally:
+        orchestrator.close()
+    wall_seconds = time.perf_counter() - start
+    cpu_seconds = _cpu_seconds() - cpu_start
+    # Sampled before any other subprocess (e.g. git) can inflate the child peak
+    peak_rss = _peak_rss_mb()
+    
+    failed = [result for result in results if not result.success]
+    injected = any((local_settings or {}).get(key) for key in ('failure_rate', 'rate_limit_rate'))
+    if failed and not injected:
+        raise RuntimeError(f"Benchmark run failed: {failed[0].errors}")
+    
+    assets = sum(len(result.outputs) for result in results)
+    cpu_count = os.cpu_count() or 1
+    return {
+        "benchmark": {
+            "briefs": briefs,
+            "products_per_brief": products,
+            "aspect_ratios": aspect_ratios,
+            "latency_seconds": latency,
+            "image_size": image_size,
+            "response_format": response_format or "direct",
+            "round_trip_seconds": round_trip if response_format == "url" else 0.0,
+            "local_provider": local_settings or {},
+            "engine": str(config.get('performance', {}).get('engine', 'sync')),
+            "performance": config.get('performance', {})
+        },
+        "environment": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": cpu_count
+        },
+        "results": {
+            "wall_seconds": round(wall_seconds, 4),
+            "assets": assets,
+            "assets_per_second": round(assets / wall_seconds, 4) if wall_seconds > 0 else None,
+            "cpu_seconds": round(cpu_seconds, 4),
+            "cpu_utilization": round(cpu_seconds / wall_seconds, 4) if wall_seconds > 0 else None,
+            "cpu_utilization_per_core": round(cpu_seconds / wall_seconds / cpu_count, 4) if wall_seconds > 0 else None,
+            "peak_rss_mb": peak_rss,
+            "errors": sum(len(result.errors) for result in results),
+            "stage_latency": _stage_latency(results),
+            "genai": [
+                {name: value for name, value in result.metrics.items() if name.startswith('genai_')}
+                for result in results
+            ]
+        }
+    }
+
+
+def measure_startup(runs: int = 5, modules: Tuple[str, ...] = STARTUP_MODULES) -> Dict[str, Any]:
+    """
+    Measure how long the pipeline takes to import, from `python -X importtime`.
+    
+    Each run imports the modules in a fresh interpreter. Only imports made
+    on their behalf count; interpreter and site initialisation do not.
+    
+    Args:
+        runs: Fresh interpreters to measure (the first also compiles bytecode)
+        modules: Modules to import, in order
+    
+    Returns:
+        Dictionary with import_seconds and process_seconds (median and
+        min), the slowest_imports of the fastest run by self time, the
+        DEFERRED_MODULES that were loaded (should be none), and whether the
+        fastest run stayed within STARTUP_BUDGET_SECONDS
+    
+    Raises:
+        subprocess.CalledProcessError: If an import fails
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    root = Path(__file__).resolve().parent.parent
+    samples = []
+    
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=root, capture_output=True, text=True, check=True
+        )
+        process_seconds = time.perf_counter() - start
+        samples.append((_import_seconds(completed.stderr, modules), process_seconds, completed.stderr))
+    
+    import_seconds = [sample[0][0] for sample in samples]
+    fastest = min(samples, key=lambda sample: sample[0][0])
+    imported = fastest[0][1]
+    return {
+        "modules": list(modules),
+        "runs": len(samples),
+        "import_seconds": {
+            "median": round(statistics.median(import_seconds), 4),
+            "min": round(min(import_seconds), 4)
+        },
+        "process_seconds": {
+            "median": round(statistics.median(sample[1] for sample in samples), 4),
+            "min": round(min(sample[1] for sample in samples), 4)
+        },
+        "slowest_imports": [
+            {"module": name, "self_ms": round(self_us / 1000, 2)}
+            for name, self_us in sorted(imported.items(), key=lambda item: -item[1])[:STARTUP_SLOWEST]
+        ],
+        "deferred_loaded": [
+            module for module in DEFERRED_MODULES
+            if any(name == module or name.startswith(module + ".") for name in imported)
+        ],
+        "budget_seconds": STARTUP_BUDGET_SECONDS,
+        "within_budget": min(import_seconds) <= STARTUP_BUDGET_SECONDS
+    }
+
+
+def _import_seconds(importtime_log: str, modules: Tuple[str, ...]) -> Tuple[float, Dict[str, int]]:
+    """
+    Total the import time of the given top-level imports in an importtime log.
+    
+    Args:
+        importtime_log: stderr of `python -X importtime`
+        modules: Top-level imports to count
+    
+    Returns:
+        Tuple of (seconds, {module: self microseconds}) covering the
+        modules and everything imported on their behalf
+    """
+    total_us = 0
+    imported: Dict[str, int] = {}
+    pending: Dict[str, int] = {}
+    
+    # Lines come in post-order: a module's dependencies are listed, further
+    # indented, before the module itself
+    for line in importtime_log.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].startswith("import time:"):
+            continue
+        try:
+            self_us = int(parts[0][len("import time:"):])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue  # Header line
+        name = parts[2].strip()
+        pending[name] = self_us
+        
+        if len(parts[2]) - len(parts[2].lstrip()) == 1:
+            # Top level: the pending lines were imported on behalf of this one
+            if name in modules:
+                total_us += cumulative_us
+                imported.update(pending)
+            pending = {}
+    return total_us / 1_000_000, imported
+
+
+def _stage_latency(results: List[PipelineResult]) -> Dict[str, Any]:
+    """Aggregate stage timing spans across every run."""
+    spans = [span for result in results for span in result.timings]
+    return PipelineReporter.summarize_timings(spans)['stages'] if spans else {}
+
+
+def _cpu_seconds() -> float:
+    """User plus system CPU time of this process and its finished children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _peak_rss_mb() -> Optional[Dict[str, float]]:
+    """Peak resident set size of this process and its largest child, in MB."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current git commit, if the code runs from a checkout."""
+    try:
+        completed = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.strip() or None
+
+
+def _print_result(result: Dict[str, Any], output_path: Optional[str]) -> None:
+    """Print a result as JSON, and also write it to output_path if given."""
+    output = json.dumps(result, indent=2)
+    print(output)
+    if output_path:
+        Path(output_path).write_text(output + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point for `python pipeline.py bench`.
+    
+    Prints (and optionally writes) a JSON document with "benchmark" (the
+    parameters), "environment" (commit, Python, CPU count) and "results"
+    (wall time, assets/sec, CPU utilisation, peak RSS and per-stage
+    latency totals and percentiles), suitable for comparing commits.
+    With --startup it prints measure_startup() instead, and fails if the
+    import budget is exceeded or a deferred module is loaded.
+    
+    Args:
+        argv: Command-line arguments after "bench"
+    
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog='pipeline.py bench',
+        description='Run synthetic briefs through the pipeline with a deterministic local image generator'
+    )
+    parser.add_argument('--briefs', type=int, default=1, help='Number of synthetic briefs (default: 1)')
+    parser.add_argument('--products', type=int, default=8, help='Products per brief (default: 8)')
+    parser.add_argument('--aspect-ratios', type=str, default='1:1,9:16,16:9',
+                        help='Comma-separated aspect ratios (default: 1:1,9:16,16:9)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Simulated GenAI latency in seconds per image (default: 0)')
+    parser.add_argument('--image-size', type=int, default=1024,
+                        help='Edge length of generated hero images (default: 1024)')
+    parser.add_argument('--response-format', choices=['direct', 'b64_json', 'url'], default='direct',
+                        help='Simulated image delivery: direct (no encoding), b64_json (inline base64 PNG) '
+                             'or url (PNG downloaded with a second request) (default: direct)')
+    parser.add_argument('--round-trip', type=float, default=0.2,
+                        help='Seconds per simulated download request with --response-format url (default: 0.2)')
+    parser.add_argument('--latency-distribution', choices=['fixed', 'uniform', 'normal', 'lognormal'],
+                        default='fixed', help='Distribution of the simulated GenAI latency (default: fixed)')
+    parser.add_argument('--latency-spread', type=float, default=0.0,
+                        help='Latency spread: +/- seconds (uniform), standard deviation (normal) '
+                             'or sigma (lognormal) (default: 0)')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Probability that a simulated GenAI call fails with a provider error (default: 0)')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help='Probability that a simulated GenAI call is rate limited (default: 0)')
+    parser.add_argument('--retry-delay', type=float, default=1.0,
+                        help='Initial retry delay after an injected failure, in seconds (default: 1)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for simulated images, latencies and failures (default: 0)')
+    parser.add_argument('--config', type=str, default=None,
+                        help='Config file whose performance, text_overlay and genai rate_limits / '
+                             'circuit_breakers / retry_budgets settings are benchmarked')
+    parser.add_argument('--engine', type=str, default=None,
+                        help='Override performance.engine (sync, async or streaming)')
+    parser.add_argument('--startup', action='store_true',
+                        help='Measure pipeline import time with -X importtime instead of throughput')
+    parser.add_argument('--output', type=str, default=None, help='Also write the JSON result to this file')
+    args = parser.parse_args(argv)
+    
+    if args.startup:
+        result = measure_startup()
+        _print_result(result, args.output)
+        return 0 if result['within_budget'] and not result['deferred_loaded'] else 1
+    
+    base_config = {}
+    if args.config:
+        with open(args.config, 'r') as f:
+            loaded = yaml.safe_load(f) or {}
+        base_config = {key: loaded[key] for key in ('performance', 'text_overlay', 'genai') if key in loaded}
+    if args.engine:
+        base_config['performance'] = {**base_config.get('performance', {}), 'engine': args.engine}
+    
+    result = run_benchmark(
+        briefs=args.briefs,
+        products=args.products,
+        aspect_ratios=[ratio.strip() for ratio in args.aspect_ratios.split(',') if ratio.strip()],
+        latency=args.latency,
+        image_size=args.image_size,
+        base_config=base_config,
+        response_format=None if args.response_format == 'direct' else args.response_format,
+        round_trip=args.round_trip,
+        local_settings={
+            'latency_distribution': args.latency_distribution,
+            'latency_spread': args.latency_spread,
+            'failure_rate': args.failure_rate,
+            'rate_limit_rate': args.rate_limit_rate,
+            'retry_delay': args.retry_delay,
+            'seed': args.seed
+        }
+    )
+    
+    _print_result(result, args.output)
+    return 0
+
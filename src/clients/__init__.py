@@ -1,6 +1,13 @@
 """GenAI client modules for image generation."""
 
-from .genai_client import GenAIClient
-from .openai_client import OpenAIClient
+from .genai_client import GenAIClient, ImageRequest, ImageResult
 
-__all__ = ['GenAIClient', 'OpenAIClient']
+__all__ = ['GenAIClient', 'ImageRequest', 'ImageResult', 'OpenAIClient']
+
+
+def __getattr__(name):
+    # Provider clients import their SDKs; load them only when asked for
+    if name == 'OpenAIClient':
+        from .openai_client import OpenAIClient
+        return OpenAIClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
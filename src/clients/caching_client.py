@@ -0,0 +1,116 @@
+"""GenAI client wrapper that serves repeated requests from a disk cache."""
+
+import asyncio
+from typing import List, Optional, Tuple
+from PIL import Image
+
+from .genai_client import GenAIClient, DelegatingGenAIClient, ImageRequest, ImageResult
+from src.managers.genai_cache import GenAICache, cache_key
+
+
+class CachingGenAIClient(DelegatingGenAIClient):
+    """
+    Wraps another GenAI client with a content-addressed image cache.
+    
+    Requests are keyed by provider, model, normalised prompt and size, so
+    rerunning a brief reuses the images it generated before instead of
+    paying for new API calls.
+    """
+    
+    def __init__(self, client: GenAIClient, cache: GenAICache):
+        """
+        Initialize the caching wrapper.
+        
+        Args:
+            client: Client that generates images on a cache miss
+            cache: Cache to read from and write to
+        """
+        super().__init__(client)
+        self.cache = cache
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Return a cached image for the request, generating it on a miss.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If generation fails after retries
+        """
+        key = cache_key(self.provider_name, self.model_id, prompt, size)
+        
+        image = self.cache.get(key)
+        if image is not None:
+            return image
+        
+        image = self.client.generate_image(prompt, size)
+        try:
+            self.cache.put(key, image)
+        except OSError:
+            # A cache that cannot be written must not fail the generation
+            pass
+        return image
+    
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Async counterpart of generate_image(); disk access runs in a thread.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If generation fails after retries
+        """
+        key = cache_key(self.provider_name, self.model_id, prompt, size)
+        
+        image = await asyncio.to_thread(self.cache.get, key)
+        if image is not None:
+            return image
+        
+        image = await self.client.agenerate_image(prompt, size)
+        try:
+            await asyncio.to_thread(self.cache.put, key, image)
+        except OSError:
+            pass
+        return image
+    
+    def generate_images(self, requests: List[ImageRequest], max_workers: int = 1) -> List[ImageResult]:
+        """
+        Serve cached requests and send only the misses to the wrapped client's batch API.
+        
+        Args:
+            requests: Images to generate
+            max_workers: Provider calls allowed in flight at once
+        
+        Returns:
+            One ImageResult per request, in request order
+        """
+        keys = [cache_key(self.provider_name, self.model_id, request.prompt, request.size)
+                for request in requests]
+        results: List[Optional[ImageResult]] = [None] * len(requests)
+        misses = []
+        for index, (request, key) in enumerate(zip(requests, keys)):
+            image = self.cache.get(key)
+            if image is not None:
+                results[index] = ImageResult(request, image=image)
+            else:
+                misses.append(index)
+        
+        generated = self.client.generate_images([requests[index] for index in misses], max_workers)
+        for index, result in zip(misses, generated):
+            results[index] = result
+            if result.ok:
+                try:
+                    self.cache.put(keys[index], result.image)
+                except OSError:
+                    pass
+        return results
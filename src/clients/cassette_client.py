@@ -0,0 +1,245 @@
+"""GenAI clients that record provider responses to a cassette and replay them offline."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image
+
+from .genai_client import GenAIClient, DelegatingGenAIClient, ImageRequest, ImageResult
+from src.managers.cassette import Cassette, request_key
+
+
+class RecordingGenAIClient(DelegatingGenAIClient):
+    """
+    Passes requests to a live provider and records every response.
+    
+    Each call's image (or error) and its observed duration are appended to
+    the cassette, for ReplayGenAIClient to serve later without network
+    access. Only the time spent in the provider is recorded; storing the
+    image happens afterwards.
+    """
+    
+    def __init__(self, client: GenAIClient, cassette: Cassette):
+        """
+        Initialize the recording wrapper.
+        
+        Args:
+            client: Live provider client
+            cassette: Cassette to append to
+        """
+        super().__init__(client)
+        self.cassette = cassette
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Generate an image with the live provider and record the response.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If generation fails (the failure is recorded too)
+        """
+        start = time.perf_counter()
+        try:
+            image = self.client.generate_image(prompt, size)
+        except Exception as e:
+            self._record(prompt, size, time.perf_counter() - start, error=e)
+            raise
+        self._record(prompt, size, time.perf_counter() - start, image=image)
+        return image
+    
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Async counterpart of generate_image(); the cassette is written in a thread.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If generation fails (the failure is recorded too)
+        """
+        start = time.perf_counter()
+        try:
+            image = await self.client.agenerate_image(prompt, size)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self._record, prompt, size, time.perf_counter() - start, None, e)
+            raise
+        await asyncio.to_thread(self._record, prompt, size, time.perf_counter() - start, image)
+        return image
+    
+    def generate_images(self, requests: List[ImageRequest], max_workers: int = 1) -> List[ImageResult]:
+        """
+        Generate a batch with the live provider and record each result.
+        
+        Each image is recorded with the duration of the provider call that
+        produced it.
+        
+        Args:
+            requests: Images to generate
+            max_workers: Provider calls allowed in flight at once
+        
+        Returns:
+            One ImageResult per request, in request order
+        """
+        results = self.client.generate_images(requests, max_workers)
+        for result in results:
+            self._record(result.request.prompt, result.request.size, result.seconds,
+                         result.image, Exception(result.error) if result.error is not None else None)
+        return results
+    
+    def _record(self, prompt: str, size: Tuple[int, int], seconds: float,
+                image: Optional[Image.Image] = None, error: Optional[BaseException] = None) -> None:
+        """Append one response to the cassette; a full disk must not fail the run."""
+        try:
+            self.cassette.record(prompt, size, self.client.provider_name, self.client.model_id,
+                                 seconds, image=image, error=error)
+        except OSError:
+            pass
+
+
+class ReplayGenAIClient(GenAIClient):
+    """
+    Serves recorded responses instead of calling a provider.
+    
+    A request gets the responses recorded for the same normalised prompt
+    and size, in recording order (cycling when it is asked more often than
+    it was recorded), after sleeping for the recorded duration times
+    latency_scale. Recorded failures are raised again. A request that was
+    never recorded raises in strict mode; otherwise it is served a
+    recording chosen by its hash, resized to the requested size, so new
+    briefs still see realistic content and latency.
+    """
+    
+    provider_name = "replay"
+    
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0, strict: bool = False):
+        """
+        Initialize the replay client.
+        
+        Args:
+            cassette: Recorded responses
+            latency_scale: Multiplier for recorded durations (0 replays instantly)
+            strict: Fail requests that were not recorded instead of substituting
+        
+        Raises:
+            ValueError: If the cassette has no recordings
+        """
+        if not len(cassette):
+            raise ValueError(f"Cassette has no recorded interactions: {cassette.cassette_dir}")
+        
+        super().__init__(api_key="replay")
+        self.cassette = cassette
+        self.latency_scale = max(0.0, latency_scale)
+        self.strict = strict
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "replayed": 0,
+            "substituted": 0,
+            "errors": 0
+        }
+    
+    @property
+    def model_id(self) -> str:
+        return self.cassette.cassette_dir.name
+    
+    @property
+    def native_sizes(self) -> List[Tuple[int, int]]:
+        # Plan the sizes that were recorded, so replayed runs request them again
+        return self.cassette.sizes
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Replay the recorded response for a request.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If the recorded call failed, or the request was not
+                recorded in strict mode
+        """
+        interaction = self._next_interaction(prompt, size)
+        delay = interaction["seconds"] * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return self._load(interaction, size)
+    
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Async counterpart of generate_image(); the recorded latency does not hold a thread.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If the recorded call failed, or the request was not
+                recorded in strict mode
+        """
+        interaction = self._next_interaction(prompt, size)
+        delay = interaction["seconds"] * self.latency_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await asyncio.to_thread(self._load, interaction, size)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cumulative request, replayed, substituted and error counts."""
+        with self._lock:
+            return dict(self._counters)
+    
+    def _next_interaction(self, prompt: str, size: Tuple[int, int]) -> Dict[str, Any]:
+        """Pick the recording that answers a request."""
+        key = request_key(prompt, size)
+        recorded = self.cassette.interactions(key)
+        substituted = not recorded
+        
+        with self._lock:
+            self._counters['requests'] += 1
+        if substituted:
+            if self.strict:
+                with self._lock:
+                    self._counters['errors'] += 1
+                raise Exception(f"No recorded response for prompt: {prompt[:60]} ({size[0]}x{size[1]})")
+            keys = self.cassette.keys
+            key = keys[int(hashlib.sha256(key.encode('utf-8')).hexdigest(), 16) % len(keys)]
+            recorded = self.cassette.interactions(key)
+        
+        with self._lock:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self._counters['substituted' if substituted else 'replayed'] += 1
+        return recorded[cursor % len(recorded)]
+    
+    def _load(self, interaction: Dict[str, Any], size: Tuple[int, int]) -> Image.Image:
+        """Turn a recording into the response: its image, or its error raised again."""
+        if interaction.get("image") is None:
+            with self._lock:
+                self._counters['errors'] += 1
+            raise Exception(f"Replayed provider error: {interaction.get('error')}")
+        
+        image = self.cassette.load_image(interaction["image"])
+        if image.size != tuple(size):
+            image = image.resize(tuple(size), Image.Resampling.LANCZOS)
+        return image
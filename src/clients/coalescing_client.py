@@ -0,0 +1,213 @@
+"""GenAI client wrapper that merges concurrent identical requests."""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from PIL import Image
+
+from .genai_client import GenAIClient, DelegatingGenAIClient, ImageRequest, ImageResult
+from src.managers.genai_cache import cache_key
+
+
+class _InFlight:
+    """One outstanding request and the callers waiting on it."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.image: Optional[Image.Image] = None
+        self.error: Optional[BaseException] = None
+
+
+class CoalescingGenAIClient(DelegatingGenAIClient):
+    """
+    Single-flight wrapper: concurrent callers with the same request share one call.
+    
+    Requests are identified like cache entries (provider, model, normalised
+    prompt and size). The first caller performs the generation; callers that
+    arrive while it is outstanding wait for it and receive their own copy of
+    the image, or the same exception. Nothing is remembered once the call
+    completes, so later requests generate again (see CachingGenAIClient for
+    reuse across time).
+    """
+    
+    def __init__(self, client: GenAIClient):
+        """
+        Initialize the coalescing wrapper.
+        
+        Args:
+            client: Client that performs the generations
+        """
+        super().__init__(client)
+        self._in_flight: Dict[str, _InFlight] = {}
+        # Async callers share futures, which belong to one event loop
+        self._async_in_flight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._coalesced = 0
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Generate an image, joining an identical request already in flight.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If the shared generation fails
+        """
+        key = cache_key(self.provider_name, self.model_id, prompt, size)
+        
+        with self._lock:
+            self._requests += 1
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlight()
+                self._in_flight[key] = call
+            else:
+                self._coalesced += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each caller gets its own image so nobody mutates a shared one
+            return call.image.copy()
+        
+        try:
+            call.image = self.client.generate_image(prompt, size)
+            return call.image
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+    
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Async counterpart of generate_image() for callers on one event loop.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If the shared generation fails
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), cache_key(self.provider_name, self.model_id, prompt, size))
+        
+        with self._lock:
+            self._requests += 1
+            future = self._async_in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._async_in_flight[key] = future
+            else:
+                self._coalesced += 1
+        
+        if not leader:
+            # Shielded so a cancelled follower does not cancel the shared call
+            image = await asyncio.shield(future)
+            return image.copy()
+        
+        try:
+            image = await self.client.agenerate_image(prompt, size)
+            future.set_result(image)
+            return image
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_in_flight[key]
+    
+    def generate_images(self, requests: List[ImageRequest], max_workers: int = 1) -> List[ImageResult]:
+        """
+        Generate a batch, joining identical requests as generate_image() does.
+        
+        Identical requests in the batch share one generation, and requests
+        already in flight for another caller wait for it; only the rest are
+        forwarded to the wrapped client's generate_images().
+        
+        Args:
+            requests: Images to generate
+            max_workers: Provider calls allowed in flight at once
+        
+        Returns:
+            One ImageResult per request, in request order
+        """
+        keys = [cache_key(self.provider_name, self.model_id, request.prompt, request.size)
+                for request in requests]
+        calls: Dict[str, _InFlight] = {}
+        led: Dict[str, int] = {}
+        
+        with self._lock:
+            self._requests += len(requests)
+            for index, key in enumerate(keys):
+                if key in calls:
+                    self._coalesced += 1
+                    continue
+                call = self._in_flight.get(key)
+                if call is None:
+                    call = self._in_flight[key] = _InFlight()
+                    led[key] = index
+                else:
+                    self._coalesced += 1
+                calls[key] = call
+        
+        seconds: Dict[str, float] = {}
+        try:
+            forwarded = [requests[index] for index in led.values()]
+            results = self.client.generate_images(forwarded, max_workers) if forwarded else []
+            for key, result in zip(led, results):
+                calls[key].image = result.image
+                calls[key].error = None if result.ok else Exception(result.error)
+                seconds[key] = result.seconds
+        except BaseException as e:
+            for key in led:
+                if calls[key].image is None:
+                    calls[key].error = e
+            raise
+        finally:
+            with self._lock:
+                for key in led:
+                    del self._in_flight[key]
+            for key in led:
+                calls[key].done.set()
+        
+        results = []
+        for index, (request, key) in enumerate(zip(requests, keys)):
+            call = calls[key]
+            if key not in seconds:
+                start = time.perf_counter()
+                call.done.wait()
+                seconds[key] = time.perf_counter() - start
+            if call.error is not None:
+                results.append(ImageResult(request, error=str(call.error), seconds=seconds[key]))
+            else:
+                # Each caller gets its own image so nobody mutates a shared one
+                image = call.image if led.get(key) == index else call.image.copy()
+                results.append(ImageResult(request, image=image, seconds=seconds[key]))
+        return results
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cumulative request and coalesce counts."""
+        with self._lock:
+            return {"requests": self._requests, "coalesced": self._coalesced}
@@ -0,0 +1,392 @@
+"""GenAI client that spreads requests over several providers with failover and hedging."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from PIL import Image
+
+from .genai_client import GenAIClient
+from src.utils.timing import percentile
+
+
+# Successful latencies kept per provider for hedge delays and reports
+LATENCY_WINDOW = 200
+
+# Samples needed before the hedge delay follows the measured percentile
+MIN_HEDGE_SAMPLES = 5
+
+
+class _ProviderStats:
+    """Counters and recent latencies of one provider; guarded by the client's lock."""
+    
+    def __init__(self):
+        self.requests = 0
+        self.wins = 0
+        self.failures = 0
+        self.hedges = 0
+        self.cancelled = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+
+class FailoverGenAIClient(GenAIClient):
+    """
+    Wraps several GenAI clients in priority order.
+    
+    Each request goes to the first provider; if it fails, the next one is
+    tried, and so on. With hedging enabled, a backup request is also sent
+    to the next provider when the current one has not answered within its
+    recent hedge_percentile latency; the first image to arrive wins and the
+    other request is cancelled. Async requests are cancelled outright;
+    synchronous ones cannot be interrupted, so their late results are
+    discarded.
+    """
+    
+    provider_name = "failover"
+    
+    # stats() values that describe current state rather than counting events
+    STATS_GAUGES = ('p50_seconds', 'p95_seconds')
+    
+    def __init__(self, clients: List[GenAIClient], hedge: bool = False,
+                 hedge_percentile: float = 95, hedge_min_delay: float = 1.0,
+                 hedge_initial_delay: float = 10.0):
+        """
+        Initialize the failover client.
+        
+        Args:
+            clients: Provider clients, highest priority first
+            hedge: Send backup requests to the next provider when one is slow
+            hedge_percentile: Latency percentile after which a request is hedged
+            hedge_min_delay: Lower bound on the hedge delay in seconds
+            hedge_initial_delay: Hedge delay until a provider has enough samples
+        
+        Raises:
+            ValueError: If no clients are given
+        """
+        if not clients:
+            raise ValueError("FailoverGenAIClient needs at least one client")
+        
+        super().__init__(clients[0].api_key)
+        self.clients = list(clients)
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_initial_delay = hedge_initial_delay
+        
+        self.names = self._unique_names(self.clients)
+        self._stats = [_ProviderStats() for _ in self.clients]
+        self._lock = threading.Lock()
+    
+    @property
+    def model_id(self) -> str:
+        return "+".join(f"{client.provider_name}:{client.model_id}" for client in self.clients)
+    
+    @property
+    def max_images_per_call(self) -> int:
+        return self.clients[0].max_images_per_call
+    
+    @property
+    def native_sizes(self) -> Optional[List[Tuple[int, int]]]:
+        # Fallbacks fit the primary's sizes to their own
+        return self.clients[0].native_sizes
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Generate an image with the first provider that succeeds.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If every provider fails
+        """
+        if not self.hedge or len(self.clients) == 1:
+            errors = []
+            for index in range(len(self.clients)):
+                try:
+                    return self._call(index, prompt, size)
+                except Exception as e:
+                    errors.append(self._describe_failure(index, e))
+            raise Exception(f"All GenAI providers failed: {'; '.join(errors)}")
+        
+        return self._generate_hedged(self._call, prompt, size)
+    
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Async counterpart of generate_image(); losing hedged requests are cancelled.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If every provider fails
+        """
+        errors = []
+        tasks: Dict[asyncio.Task, int] = {}
+        next_index = 0
+        
+        def launch(hedged: bool) -> None:
+            nonlocal next_index
+            index = next_index
+            next_index += 1
+            if hedged:
+                self._count(index, 'hedges')
+            tasks[asyncio.create_task(self._acall(index, prompt, size))] = index
+        
+        launch(hedged=False)
+        try:
+            while tasks:
+                timeout = None
+                if self.hedge and next_index < len(self.clients):
+                    timeout = self.hedge_delay(next_index - 1)
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    # The latest request is slower than usual: hedge it
+                    launch(hedged=True)
+                    continue
+                
+                for task in done:
+                    index = tasks.pop(task)
+                    if task.exception() is None:
+                        self._count(index, 'wins')
+                        return task.result()
+                    errors.append(self._describe_failure(index, task.exception()))
+                
+                if not tasks and next_index < len(self.clients):
+                    launch(hedged=False)
+        finally:
+            for task, index in tasks.items():
+                task.cancel()
+                self._count(index, 'cancelled')
+        
+        raise Exception(f"All GenAI providers failed: {'; '.join(errors)}")
+    
+    async def aclose(self) -> None:
+        for client in self.clients:
+            await client.aclose()
+    
+    def hedge_delay(self, index: int) -> float:
+        """
+        Seconds to wait on a provider before hedging its request.
+        
+        Args:
+            index: Provider position in the priority list
+        
+        Returns:
+            The provider's recent hedge_percentile latency (or the initial
+            delay while there are too few samples), at least hedge_min_delay
+        """
+        with self._lock:
+            latencies = sorted(self._stats[index].latencies)
+        if len(latencies) < MIN_HEDGE_SAMPLES:
+            return max(self.hedge_min_delay, self.hedge_initial_delay)
+        return max(self.hedge_min_delay, percentile(latencies, self.hedge_percentile))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return per-provider request, win, failure, hedge and cancel counts plus latency percentiles."""
+        with self._lock:
+            providers = {}
+            for name, stats in zip(self.names, self._stats):
+                latencies = sorted(stats.latencies)
+                providers[name] = {
+                    "requests": stats.requests,
+                    "wins": stats.wins,
+                    "failures": stats.failures,
+                    "hedges": stats.hedges,
+                    "cancelled": stats.cancelled,
+                    "p50_seconds": round(percentile(latencies, 50), 4) if latencies else None,
+                    "p95_seconds": round(percentile(latencies, 95), 4) if latencies else None
+                }
+            return providers
+    
+    def _build_prompt(self, product_name: str, audience: str, region: str) -> str:
+        return self.clients[0]._build_prompt(product_name, audience, region)
+    
+    def _generate_batch(self, prompt: str, size: Tuple[int, int], count: int) -> List[Image.Image]:
+        """
+        Generate a batch with the first provider that succeeds, hedged like single images.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+            count: Number of images wanted
+        
+        Returns:
+            Generated images
+        
+        Raises:
+            Exception: If every provider fails
+        """
+        if self.hedge and len(self.clients) > 1:
+            return self._generate_hedged(self._call_batch, prompt, size, count)
+        
+        errors = []
+        for index in range(len(self.clients)):
+            try:
+                return self._call_batch(index, prompt, size, count)
+            except Exception as e:
+                errors.append(self._describe_failure(index, e))
+        raise Exception(f"All GenAI providers failed: {'; '.join(errors)}")
+    
+    def _generate_hedged(self, call: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a synchronous request with hedging.
+        
+        Every attempt runs on its own thread, so concurrent callers never
+        queue for a shared pool, and the hedge delay counts from when the
+        current attempt started.
+        
+        Args:
+            call: _call or _call_batch, invoked as call(index, *args, count_win=False)
+            *args: Request arguments after the provider index
+        
+        Returns:
+            The first successful call's result
+        
+        Raises:
+            Exception: If every provider fails
+        """
+        errors = []
+        futures: Dict[Future, int] = {}
+        started: List[float] = []
+        next_index = 0
+        
+        def launch(hedged: bool) -> None:
+            nonlocal next_index
+            index = next_index
+            next_index += 1
+            if hedged:
+                self._count(index, 'hedges')
+            futures[self._start_attempt(call, index, *args)] = index
+            started.append(time.perf_counter())
+        
+        launch(hedged=False)
+        try:
+            while futures:
+                timeout = None
+                if next_index < len(self.clients):
+                    deadline = started[-1] + self.hedge_delay(next_index - 1)
+                    timeout = max(0.0, deadline - time.perf_counter())
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                if not done:
+                    launch(hedged=True)
+                    continue
+                
+                for future in done:
+                    index = futures.pop(future)
+                    if future.exception() is None:
+                        self._count(index, 'wins')
+                        return future.result()
+                    errors.append(self._describe_failure(index, future.exception()))
+                
+                if not futures and next_index < len(self.clients):
+                    launch(hedged=False)
+        finally:
+            # Running calls cannot be interrupted; their results are dropped
+            for index in futures.values():
+                self._count(index, 'cancelled')
+        
+        raise Exception(f"All GenAI providers failed: {'; '.join(errors)}")
+    
+    @staticmethod
+    def _start_attempt(call: Callable[..., Any], index: int, *args: Any) -> Future:
+        """Start call(index, *args, count_win=False) on a new thread; returns once it runs."""
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        
+        def run() -> None:
+            try:
+                future.set_result(call(index, *args, count_win=False))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=run, name=f"genai-hedge-{index}", daemon=True).start()
+        return future
+    
+    def _call(self, index: int, prompt: str, size: Tuple[int, int], count_win: bool = True) -> Image.Image:
+        """Call one provider, recording its latency or failure."""
+        self._count(index, 'requests')
+        start = time.perf_counter()
+        try:
+            image = self.clients[index].generate_image(prompt, size)
+        except Exception:
+            self._count(index, 'failures')
+            raise
+        self._record_latency(index, time.perf_counter() - start, win=count_win)
+        return image
+    
+    def _call_batch(self, index: int, prompt: str, size: Tuple[int, int], count: int,
+                    count_win: bool = True) -> List[Image.Image]:
+        """Generate a batch with one provider, recording its latency or failure."""
+        client = self.clients[index]
+        self._count(index, 'requests')
+        start = time.perf_counter()
+        try:
+            # Fallbacks may return fewer images per call than the primary
+            step = client.max_images_per_call
+            images = []
+            for offset in range(0, count, step):
+                images.extend(client._generate_batch(prompt, size, min(step, count - offset)))
+        except Exception:
+            self._count(index, 'failures')
+            raise
+        self._record_latency(index, time.perf_counter() - start, win=count_win)
+        return images
+    
+    async def _acall(self, index: int, prompt: str, size: Tuple[int, int]) -> Image.Image:
+        """Async counterpart of _call(); the win is counted by the caller."""
+        self._count(index, 'requests')
+        start = time.perf_counter()
+        try:
+            image = await self.clients[index].agenerate_image(prompt, size)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._count(index, 'failures')
+            raise
+        self._record_latency(index, time.perf_counter() - start, win=False)
+        return image
+    
+    def _record_latency(self, index: int, seconds: float, win: bool) -> None:
+        """Record a successful call's latency (and optionally its win)."""
+        with self._lock:
+            self._stats[index].latencies.append(seconds)
+            if win:
+                self._stats[index].wins += 1
+    
+    def _count(self, index: int, counter: str) -> None:
+        """Increment one provider counter."""
+        with self._lock:
+            stats = self._stats[index]
+            setattr(stats, counter, getattr(stats, counter) + 1)
+    
+    def _describe_failure(self, index: int, error: BaseException) -> str:
+        """Format a provider failure for the combined error message."""
+        return f"{self.names[index]}: {error}"
+    
+    @staticmethod
+    def _unique_names(clients: List[GenAIClient]) -> List[str]:
+        """Name providers for stats, adding the model when a provider appears twice and a count when both do."""
+        providers = [client.provider_name for client in clients]
+        bases = [
+            f"{client.provider_name}:{client.model_id}" if providers.count(client.provider_name) > 1
+            else client.provider_name
+            for client in clients
+        ]
+        names = []
+        for position, base in enumerate(bases):
+            repeat = bases[:position].count(base)
+            names.append(f"{base}#{repeat + 1}" if repeat else base)
+        return names
@@ -3,22 +3,29 @@
 import time
 import io
 import base64
-from typing import Tuple
+import importlib.util
+import threading
+from typing import List, Tuple
 from PIL import Image
 
-try:
-    from google.cloud import aiplatform
-    from vertexai.preview.vision_models import ImageGenerationModel
-    VERTEX_AVAILABLE = True
-except ImportError:
-    VERTEX_AVAILABLE = False
+# Checked without importing: the Vertex AI SDK is only loaded on first generation
+VERTEX_AVAILABLE = importlib.util.find_spec("vertexai") is not None
 
 from src.clients.genai_client import GenAIClient
+from src.utils.circuit_breaker import CircuitOpenError
 
 
 class ImagenClient(GenAIClient):
     """Google Imagen 3 implementation of GenAI client."""
     
+    provider_name = "imagen"
+    
+    # Imagen returns up to four images per generate_images() call
+    max_images_per_call = 4
+    
+    # Output sizes of the 1:1, 9:16, 16:9, 4:3 and 3:4 aspect ratios
+    native_sizes = [(1024, 1024), (768, 1408), (1408, 768), (1280, 896), (896, 1280)]
+    
     def __init__(self, api_key: str, model: str = "imagen-3.0-generate-001", 
                  max_retries: int = 3, retry_delay: int = 2,
                  project_id: str = None, location: str = "us-central1"):
@@ -46,11 +53,28 @@ class ImagenClient(GenAIClient):
                 "Install with: pip install google-cloud-aiplatform"
             )
         
-        # Initialize Vertex AI
-        if project_id:
-            aiplatform.init(project=project_id, location=location)
-        
-        self.model = ImageGenerationModel.from_pretrained(model)
+        self._model = None
+        self._model_lock = threading.Lock()
+    
+    @property
+    def model_id(self) -> str:
+        return self.model_name
+    
+    @property
+    def model(self):
+        """Vertex AI model handle, loaded on first use (from_pretrained is a remote call)."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from google.cloud import aiplatform
+                    from vertexai.preview.vision_models import ImageGenerationModel
+                    
+                    # Initialize Vertex AI
+                    if self.project_id:
+                        aiplatform.init(project=self.project_id, location=self.location)
+                    
+                    self._model = ImageGenerationModel.from_pretrained(self.model_name)
+        return self._model
     
     def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
         """
@@ -63,6 +87,23 @@ class ImagenClient(GenAIClient):
         Returns:
             PIL Image object
             
+        Raises:
+            Exception: If generation fails after retries
+        """
+        return self._generate_batch(prompt, size, 1)[0]
+    
+    def _generate_batch(self, prompt: str, size: Tuple[int, int], count: int) -> List[Image.Image]:
+        """
+        Generate up to four images for one prompt in a single Imagen call.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+            count: Number of images wanted (at most max_images_per_call)
+            
+        Returns:
+            Generated images; fewer than count if the safety filter dropped some
+            
         Raises:
             Exception: If generation fails after retries
         """
@@ -78,36 +119,92 @@ class ImagenClient(GenAIClient):
                 # Imagen supports various aspect ratios
                 aspect_ratio = self._get_aspect_ratio_string(size)
                 
-                response = self.model.generate_images(
-                    prompt=enhanced_prompt,
-                    number_of_images=1,
-                    aspect_ratio=aspect_ratio,
-                    safety_filter_level="block_some",
-                    person_generation="allow_adult",
-                )
+                # Fails fast while the provider's circuit is open
+                self.circuit_breaker.before_call()
+                try:
+                    with self.rate_limiter.acquire():
+                        response = self.model.generate_images(
+                            prompt=enhanced_prompt,
+                            number_of_images=count,
+                            aspect_ratio=aspect_ratio,
+                            safety_filter_level="block_some",
+                            person_generation="allow_adult",
+                        )
+                except Exception as e:
+                    # Quota and invalid-request rejections say nothing about the provider's health
+                    if self._is_provider_failure(e):
+                        self.circuit_breaker.record_failure(e)
+                    else:
+                        self.circuit_breaker.release()
+                    raise
+                except BaseException:
+                    self.circuit_breaker.release()
+                    raise
+                self.circuit_breaker.record_success()
+                self.rate_limiter.on_success()
+                self.retry_budget.on_success()
                 
-                # Get the first generated image
                 if response.images:
-                    image_bytes = response.images[0]._image_bytes
-                    image = Image.open(io.BytesIO(image_bytes))
-                    
-                    # Resize to exact size if needed
-                    if image.size != size:
-                        image = image.resize(size, Image.Resampling.LANCZOS)
+                    images = []
+                    for generated in response.images:
+                        image = Image.open(io.BytesIO(generated._image_bytes))
+                        
+                        # Resize to exact size if needed
+                        if image.size != size:
+                            image = image.resize(size, Image.Resampling.LANCZOS)
+                        images.append(image)
                     
-                    return image
+                    return images
                 else:
                     raise Exception("No images generated in response")
                 
+            except CircuitOpenError:
+                # Retrying cannot help until the circuit probes the provider again
+                raise
+                
             except Exception as e:
                 last_error = e
+                if self._is_rate_limit_error(e):
+                    # Slow down every worker using this provider, not just this one
+                    self.rate_limiter.on_rate_limited()
                 if attempt < self.max_retries:
+                    # Retries draw on the provider's shared budget (fails fast once it is spent)
+                    self.retry_budget.spend(e)
                     print(f"API error occurred. Retrying in {delay}s... (attempt {attempt}/{self.max_retries})")
                     time.sleep(delay)
                     delay *= 2  # Exponential backoff
                 else:
                     raise Exception(f"API error after {self.max_retries} attempts: {str(last_error)}")
     
+    @staticmethod
+    def _is_provider_failure(error: Exception) -> bool:
+        """
+        Check whether an error means Vertex AI itself is failing.
+        
+        Args:
+            error: Error raised while generating
+            
+        Returns:
+            True for ServiceUnavailable, InternalServerError and
+            DeadlineExceeded (HTTP 503, 500 and 504) errors
+        """
+        return (getattr(error, 'code', None) in (500, 503, 504)
+                or type(error).__name__ in ('ServiceUnavailable', 'InternalServerError', 'DeadlineExceeded'))
+    
+    @staticmethod
+    def _is_rate_limit_error(error: Exception) -> bool:
+        """
+        Check whether an error is Vertex AI's quota / rate-limit rejection.
+        
+        Args:
+            error: Error raised while generating
+            
+        Returns:
+            True for HTTP 429 / ResourceExhausted errors
+        """
+        return (getattr(error, 'code', None) == 429
+                or type(error).__name__ in ('ResourceExhausted', 'TooManyRequests'))
+    
     def _get_aspect_ratio_string(self, size: Tuple[int, int]) -> str:
         """
         Convert size tuple to Imagen aspect ratio string.
@@ -1,13 +1,78 @@
 """Base GenAI client interface for image generation."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from PIL import Image
 
+from src.utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from src.utils.rate_limiter import RateLimiter, get_rate_limiter
+from src.utils.retry_budget import RetryBudget, get_retry_budget
+
+
+@dataclass
+class ImageRequest:
+    """One image wanted from a generate_images() batch."""
+    prompt: str
+    size: Tuple[int, int] = (1024, 1024)
+
+
+@dataclass
+class ImageResult:
+    """Outcome of one ImageRequest; exactly one of image and error is set."""
+    request: ImageRequest
+    image: Optional[Image.Image] = None
+    error: Optional[str] = None
+    seconds: float = 0.0  # Duration of the provider call that produced it
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the image was generated."""
+        return self.error is None
+
+
+def plan_batches(requests: List[ImageRequest], max_images_per_call: int) -> List[List[int]]:
+    """
+    Group requests into provider calls.
+    
+    Requests with the same prompt and size can share one call that returns
+    several images; each group holds at most max_images_per_call of them.
+    
+    Args:
+        requests: Requests to plan
+        max_images_per_call: Images one provider call can return
+    
+    Returns:
+        Request indexes per call, in order of first appearance
+    """
+    groups = OrderedDict()
+    for index, request in enumerate(requests):
+        groups.setdefault((request.prompt, tuple(request.size)), []).append(index)
+    
+    limit = max(1, max_images_per_call)
+    return [
+        indexes[start:start + limit]
+        for indexes in groups.values()
+        for start in range(0, len(indexes), limit)
+    ]
+
 
 class GenAIClient(ABC):
     """Abstract base class for GenAI image generation clients."""
     
+    # Short provider name used in cache keys and metrics
+    provider_name = "genai"
+    
+    # Images one provider call can return for a single prompt
+    max_images_per_call = 1
+    
+    # Sizes the model generates natively as (width, height); None if any size works
+    native_sizes: Optional[List[Tuple[int, int]]] = None
+    
     def __init__(self, api_key: str):
         """
         Initialize the GenAI client.
@@ -17,6 +82,26 @@ class GenAIClient(ABC):
         """
         self.api_key = api_key
     
+    @property
+    def model_id(self) -> str:
+        """Identifier of the model behind this client, used in cache keys and metrics."""
+        return ""
+    
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Process-wide limiter shared by every client of this provider."""
+        return get_rate_limiter(self.provider_name)
+    
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Process-wide circuit breaker shared by every client of this provider."""
+        return get_circuit_breaker(self.provider_name)
+    
+    @property
+    def retry_budget(self) -> RetryBudget:
+        """Process-wide retry budget shared by every client of this provider."""
+        return get_retry_budget(self.provider_name)
+    
     @abstractmethod
     def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
         """
@@ -34,6 +119,94 @@ class GenAIClient(ABC):
         """
         pass
     
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Generate an image without blocking the event loop.
+        
+        The default runs generate_image() in a worker thread; clients with a
+        native async API override this so that many requests can be in
+        flight from one event loop without a thread each.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+            
+        Returns:
+            PIL Image object
+            
+        Raises:
+            Exception: If generation fails after retries
+        """
+        return await asyncio.to_thread(self.generate_image, prompt, size)
+    
+    def generate_images(self, requests: List[ImageRequest], max_workers: int = 1) -> List[ImageResult]:
+        """
+        Generate many images with as few provider calls as possible.
+        
+        Requests are grouped by plan_batches(); the groups run on up to
+        max_workers threads. A failed call fails only its own requests, and
+        a call that returns fewer images than asked for (e.g., some were
+        safety-filtered) fails only the requests left without one.
+        
+        Args:
+            requests: Images to generate
+            max_workers: Provider calls allowed in flight at once
+        
+        Returns:
+            One ImageResult per request, in request order
+        """
+        results: List[Optional[ImageResult]] = [None] * len(requests)
+        batches = plan_batches(requests, self.max_images_per_call)
+        
+        def run(batch: List[int]) -> None:
+            request = requests[batch[0]]
+            start = time.perf_counter()
+            try:
+                images = self._generate_batch(request.prompt, request.size, len(batch))
+                error = f"Provider returned fewer images than requested for: {request.prompt[:60]}"
+            except Exception as e:
+                images, error = [], str(e)
+            seconds = time.perf_counter() - start
+            
+            for position, index in enumerate(batch):
+                if position < len(images):
+                    results[index] = ImageResult(requests[index], image=images[position], seconds=seconds)
+                else:
+                    results[index] = ImageResult(requests[index], error=error, seconds=seconds)
+        
+        workers = min(max_workers, len(batches))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="genai-batch") as executor:
+                list(executor.map(run, batches))
+        else:
+            for batch in batches:
+                run(batch)
+        return results
+    
+    async def aclose(self) -> None:
+        """Release async resources (connection pools) bound to the running event loop."""
+        pass
+    
+    def _generate_batch(self, prompt: str, size: Tuple[int, int], count: int) -> List[Image.Image]:
+        """
+        Generate count images for one prompt.
+        
+        Providers whose API returns several images per call override this to
+        make a single call; count never exceeds max_images_per_call.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+            count: Number of images wanted
+        
+        Returns:
+            Generated images (possibly fewer than count)
+        
+        Raises:
+            Exception: If generation fails after retries
+        """
+        return [self.generate_image(prompt, size) for _ in range(count)]
+    
     def _build_prompt(self, product_name: str, audience: str, region: str) -> str:
         """
         Construct an effective generation prompt with context.
@@ -54,3 +227,47 @@ class GenAIClient(ABC):
             f"product-focused composition, suitable for social media advertising."
         )
         return prompt
+
+
+class DelegatingGenAIClient(GenAIClient):
+    """
+    Base class for clients that wrap another client to add behaviour.
+    
+    Provider, model, prompt construction and batch generation are those
+    of the wrapped client; subclasses override generate_image.
+    """
+    
+    def __init__(self, client: GenAIClient):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            client: Client to delegate to
+        """
+        super().__init__(client.api_key)
+        self.client = client
+    
+    @property
+    def provider_name(self) -> str:
+        return self.client.provider_name
+    
+    @property
+    def model_id(self) -> str:
+        return self.client.model_id
+    
+    @property
+    def max_images_per_call(self) -> int:
+        return self.client.max_images_per_call
+    
+    @property
+    def native_sizes(self) -> Optional[List[Tuple[int, int]]]:
+        return self.client.native_sizes
+    
+    def generate_images(self, requests: List[ImageRequest], max_workers: int = 1) -> List[ImageResult]:
+        return self.client.generate_images(requests, max_workers)
+    
+    async def aclose(self) -> None:
+        await self.client.aclose()
+    
+    def _build_prompt(self, product_name: str, audience: str, region: str) -> str:
+        return self.client._build_prompt(product_name, audience, region)
@@ -0,0 +1,288 @@
+"""Deterministic local image generator for offline runs and benchmarks."""
+
+import asyncio
+import base64
+import hashlib
+import math
+import random
+import threading
+import time
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+from PIL import Image, ImageDraw
+
+from .genai_client import GenAIClient
+from src.utils.circuit_breaker import CircuitOpenError
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+class LocalProviderError(Exception):
+    """Injected provider failure, standing in for an HTTP 5xx or timeout."""
+
+
+class LocalRateLimitError(LocalProviderError):
+    """Injected rate-limit rejection, standing in for an HTTP 429."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LocalImageClient(GenAIClient):
+    """
+    GenAI client that renders images locally instead of calling an API.
+    
+    The same prompt, size and seed always produce the same pixels, so runs
+    are reproducible and need no API key. A simulated call precedes each
+    image: it takes latency seconds, drawn from latency_distribution, and
+    fails with probability failure_rate (a provider error) or
+    rate_limit_rate (a 429). Like the real providers, calls pass the
+    provider's shared rate limiter and circuit breaker and are retried with
+    exponential backoff. Latencies and failures are drawn from the seed,
+    the request and its attempt number, so a rerun sees the same sequence
+    whatever the thread scheduling. response_format simulates how a
+    provider delivers the image: "b64_json" round-trips it through an
+    inline base64 PNG, "url" through a PNG fetched with a second request
+    costing round_trip seconds.
+    """
+    
+    provider_name = "local"
+    
+    def __init__(self, latency: float = 0.0, seed: int = 0,
+                 image_size: Optional[Tuple[int, int]] = None,
+                 response_format: Optional[str] = None, round_trip: float = 0.0,
+                 latency_distribution: str = "fixed", latency_spread: float = 0.0,
+                 failure_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: Optional[float] = None, max_retries: int = 3,
+                 retry_delay: float = 1.0):
+        """
+        Initialize the local client.
+        
+        Args:
+            latency: Seconds per simulated call (the median for "lognormal",
+                the mean otherwise)
+            seed: Seed mixed into every image, latency and injected failure
+            image_size: Render every image at this size instead of the
+                requested one (useful to benchmark other hero resolutions)
+            response_format: None to return images directly, or "b64_json" /
+                "url" to simulate a provider's encoding and transport
+            round_trip: Seconds per simulated download in "url" mode
+            latency_distribution: "fixed", "uniform" (latency +/- spread),
+                "normal" (standard deviation spread) or "lognormal" (sigma
+                spread, for a long tail)
+            latency_spread: Spread of the latency distribution
+            failure_rate: Probability that a call fails with a provider error
+            rate_limit_rate: Probability that a call is rate limited
+            retry_after: Retry-After seconds sent with injected rate limits
+            max_retries: Attempts per image before giving up
+            retry_delay: Initial delay between retries in seconds (doubles each retry)
+        
+        Raises:
+            ValueError: If response_format or latency_distribution is not supported
+        """
+        if response_format not in (None, "b64_json", "url"):
+            raise ValueError(f"Unsupported response_format: {response_format}")
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unsupported latency_distribution: {latency_distribution} "
+                f"(expected one of {LATENCY_DISTRIBUTIONS})"
+            )
+        
+        super().__init__(api_key="local")
+        self.latency = latency
+        self.seed = seed
+        self.image_size = image_size
+        self.response_format = response_format
+        self.round_trip = round_trip
+        self.latency_distribution = latency_distribution
+        self.latency_spread = latency_spread
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        
+        # Simulated calls made per request, so each attempt draws its own outcome
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def model_id(self) -> str:
+        size = f":{self.image_size[0]}x{self.image_size[1]}" if self.image_size else ""
+        return f"local-seed{self.seed}{size}"
+    
+    def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Render a deterministic image for a prompt.
+        
+        Args:
+            prompt: Text description; only its hash is used
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If every attempt fails with an injected error
+        """
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with self.circuit_breaker.guard(failures=(LocalProviderError,), ignored=(LocalRateLimitError,)), \
+                        self.rate_limiter.acquire():
+                    seconds, error = self._draw_call(prompt, size)
+                    if seconds > 0:
+                        time.sleep(seconds)
+                    if error:
+                        raise error
+                self.rate_limiter.on_success()
+                self.retry_budget.on_success()
+                break
+            except CircuitOpenError:
+                raise
+            except LocalRateLimitError as e:
+                self.rate_limiter.on_rate_limited(e.retry_after)
+                if attempt == self.max_retries:
+                    raise Exception(f"Rate limit exceeded after {self.max_retries} attempts: {str(e)}")
+                self.retry_budget.spend(e)
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            except LocalProviderError as e:
+                if attempt == self.max_retries:
+                    raise Exception(f"API error after {self.max_retries} attempts: {str(e)}")
+                self.retry_budget.spend(e)
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+        
+        if self.response_format is None:
+            return self._render(prompt, size)
+        
+        payload = self._encode(self._render(prompt, size))
+        if self.response_format == "url" and self.round_trip > 0:
+            time.sleep(self.round_trip)
+        return self._decode(payload)
+    
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Async counterpart of generate_image(); the simulated latency does not hold a thread.
+        
+        Args:
+            prompt: Text description; only its hash is used
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            PIL Image object
+        
+        Raises:
+            Exception: If every attempt fails with an injected error
+        """
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with self.circuit_breaker.guard(failures=(LocalProviderError,), ignored=(LocalRateLimitError,)):
+                    async with self.rate_limiter.acquire_async():
+                        seconds, error = self._draw_call(prompt, size)
+                        if seconds > 0:
+                            await asyncio.sleep(seconds)
+                        if error:
+                            raise error
+                self.rate_limiter.on_success()
+                self.retry_budget.on_success()
+                break
+            except CircuitOpenError:
+                raise
+            except LocalRateLimitError as e:
+                self.rate_limiter.on_rate_limited(e.retry_after)
+                if attempt == self.max_retries:
+                    raise Exception(f"Rate limit exceeded after {self.max_retries} attempts: {str(e)}")
+                self.retry_budget.spend(e)
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            except LocalProviderError as e:
+                if attempt == self.max_retries:
+                    raise Exception(f"API error after {self.max_retries} attempts: {str(e)}")
+                self.retry_budget.spend(e)
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+        
+        if self.response_format is None:
+            return await asyncio.to_thread(self._render, prompt, size)
+        
+        payload = await asyncio.to_thread(lambda: self._encode(self._render(prompt, size)))
+        if self.response_format == "url" and self.round_trip > 0:
+            await asyncio.sleep(self.round_trip)
+        return await asyncio.to_thread(self._decode, payload)
+    
+    def _draw_call(self, prompt: str, size: Tuple[int, int]) -> Tuple[float, Optional[LocalProviderError]]:
+        """
+        Draw the latency and outcome of the next simulated call for a request.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size as (width, height) tuple
+        
+        Returns:
+            Tuple of (latency in seconds, injected error or None)
+        """
+        key = f"{size[0]}x{size[1]}:{prompt}"
+        with self._lock:
+            attempt = self._attempts.get(key, 0) + 1
+            self._attempts[key] = attempt
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+        
+        if self.latency_distribution == "uniform":
+            seconds = rng.uniform(self.latency - self.latency_spread, self.latency + self.latency_spread)
+        elif self.latency_distribution == "normal":
+            seconds = rng.gauss(self.latency, self.latency_spread)
+        elif self.latency_distribution == "lognormal":
+            seconds = self.latency * math.exp(rng.gauss(0.0, self.latency_spread))
+        else:
+            seconds = self.latency
+        
+        roll = rng.random()
+        error = None
+        if roll < self.rate_limit_rate:
+            error = LocalRateLimitError("Simulated rate limit (HTTP 429)", retry_after=self.retry_after)
+        elif roll < self.rate_limit_rate + self.failure_rate:
+            error = LocalProviderError("Simulated provider error (HTTP 503)")
+        return max(0.0, seconds), error
+    
+    def _render(self, prompt: str, size: Tuple[int, int]) -> Image.Image:
+        """Draw the image of a prompt (see generate_image)."""
+        size = self.image_size or size
+        
+        digest = hashlib.sha256(f"{self.seed}:{size[0]}x{size[1]}:{prompt}".encode('utf-8')).digest()
+        width, height = size
+        
+        # Two-colour vertical gradient built from Pillow's native gradient
+        top = digest[0:3]
+        bottom = digest[3:6]
+        mask = Image.linear_gradient('L').resize(size)
+        image = Image.composite(Image.new('RGB', size, tuple(bottom)),
+                                Image.new('RGB', size, tuple(top)), mask)
+        
+        # A few shapes so crops and overlays see realistic, non-uniform content
+        draw = ImageDraw.Draw(image)
+        for i in range(4):
+            offset = 6 + i * 6
+            x0 = digest[offset] * width // 256
+            y0 = digest[offset + 1] * height // 256
+            extent = (digest[offset + 2] % 64 + 32) * min(width, height) // 256
+            colour = tuple(digest[offset + 3:offset + 6])
+            box = (x0, y0, min(width, x0 + extent), min(height, y0 + extent))
+            if i % 2:
+                draw.ellipse(box, fill=colour)
+            else:
+                draw.rectangle(box, fill=colour)
+        
+        return image
+    
+    def _encode(self, image: Image.Image) -> bytes:
+        """Encode an image as the simulated provider would send it."""
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        if self.response_format == "b64_json":
+            return base64.b64encode(buffer.getvalue())
+        return buffer.getvalue()
+    
+    def _decode(self, payload: bytes) -> Image.Image:
+        """Decode a simulated provider payload into an RGB image."""
+        if self.response_format == "b64_json":
+            payload = base64.b64decode(payload)
+        return Image.open(BytesIO(payload)).convert('RGB')
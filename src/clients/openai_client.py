@@ -1,31 +1,95 @@
 """OpenAI DALL-E 3 implementation of GenAI client."""
 
+import asyncio
+import base64
+import threading
 import time
+import weakref
 import requests
 from io import BytesIO
-from typing import Tuple
+from typing import BinaryIO, List, Optional, Tuple, Union
 from PIL import Image
-import openai
 
 from .genai_client import GenAIClient
+from src.utils.circuit_breaker import CircuitOpenError
+
+
+# Keep-alive connections kept open per download pool
+DOWNLOAD_POOL_SIZE = 32
+
+# Upper bound on simultaneous async image downloads per event loop
+ASYNC_MAX_CONNECTIONS = 256
+
+# Bytes read per chunk when streaming an image download into memory
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# How the API returns images: a URL to download, or the PNG inline as base64
+RESPONSE_FORMATS = ("url", "b64_json")
 
 
 class OpenAIClient(GenAIClient):
     """OpenAI DALL-E 3 client for image generation."""
     
-    def __init__(self, api_key: str, model: str = "dall-e-3"):
+    provider_name = "openai"
+    
+    def __init__(self, api_key: str, model: str = "dall-e-3", response_format: str = "url"):
         """
         Initialize OpenAI client.
         
         Args:
             api_key: OpenAI API key
             model: Model name (default: dall-e-3)
+            response_format: "url" to download each image after generation,
+                or "b64_json" to receive it inline and skip the extra round-trip
+            
+        Raises:
+            ValueError: If response_format is not supported
         """
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unsupported response_format: {response_format} (expected one of {RESPONSE_FORMATS})")
+        
         super().__init__(api_key)
         self.model = model
-        self.client = openai.OpenAI(api_key=api_key)
+        self.response_format = response_format
+        self._client = None
+        self._client_lock = threading.Lock()
         self.max_retries = 3
         self.base_delay = 2  # seconds
+        
+        # Image downloads reuse keep-alive connections instead of a new one per image
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=DOWNLOAD_POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Async SDK and download clients, one pair per event loop (their
+        # connection pools cannot be shared across loops)
+        self._async_clients = weakref.WeakKeyDictionary()
+    
+    @property
+    def model_id(self) -> str:
+        return self.model
+    
+    @property
+    def client(self):
+        """OpenAI SDK client, created on first use (importing the SDK dominates startup)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import openai
+                    self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+    
+    @property
+    def max_images_per_call(self) -> int:
+        # DALL-E 2 accepts n up to 10; DALL-E 3 only n=1
+        return 10 if self.model == "dall-e-2" else 1
+    
+    @property
+    def native_sizes(self) -> List[Tuple[int, int]]:
+        if self.model == "dall-e-2":
+            return [(1024, 1024)]
+        return [(1024, 1024), (1024, 1792), (1792, 1024)]
     
     def generate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
         """
@@ -41,30 +105,59 @@ class OpenAIClient(GenAIClient):
         Raises:
             Exception: If generation fails after all retries
         """
+        return self._generate_batch(prompt, size, 1)[0]
+    
+    def _generate_batch(self, prompt: str, size: Tuple[int, int], count: int) -> List[Image.Image]:
+        """
+        Generate several images for one prompt in a single API call.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size (DALL-E 3 supports 1024x1024, 1024x1792, 1792x1024)
+            count: Number of images wanted (at most max_images_per_call)
+            
+        Returns:
+            Generated images, in the order the API returned them
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        import openai
+        
         # Convert size tuple to DALL-E 3 format string
         size_str = self._format_size(size)
         
         for attempt in range(self.max_retries):
             try:
-                # Call DALL-E 3 API
-                response = self.client.images.generate(
-                    model=self.model,
-                    prompt=prompt,
-                    size=size_str,
-                    quality="standard",
-                    n=1
-                )
-                
-                # Extract image URL from response
-                image_url = response.data[0].url
+                # Call DALL-E 3 API once the provider's circuit and the shared
+                # rate limiter admit us (fails fast while the provider is down)
+                with self.circuit_breaker.guard(failures=self._provider_failures()), self.rate_limiter.acquire():
+                    response = self.client.images.generate(
+                        model=self.model,
+                        prompt=prompt,
+                        size=size_str,
+                        quality="standard",
+                        response_format=self.response_format,
+                        n=count
+                    )
+                self.rate_limiter.on_success()
+                self.retry_budget.on_success()
                 
-                # Download and convert to PIL Image
-                image = self._download_image(image_url)
+                # Decode the inline payloads, or download from the returned URLs
+                if self.response_format == "b64_json":
+                    return [self._decode_b64_image(item.b64_json) for item in response.data]
+                return [self._download_image(item.url) for item in response.data]
                 
-                return image
+            except CircuitOpenError:
+                # Retrying cannot help until the circuit probes the provider again
+                raise
                 
             except openai.RateLimitError as e:
+                # Slow down every worker using this provider, not just this one
+                self.rate_limiter.on_rate_limited(self._retry_after(e))
                 if attempt < self.max_retries - 1:
+                    # Retries draw on the provider's shared budget (fails fast once it is spent)
+                    self.retry_budget.spend(e)
                     delay = self._calculate_backoff(attempt)
                     print(f"Rate limit hit. Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
                     time.sleep(delay)
@@ -73,6 +166,7 @@ class OpenAIClient(GenAIClient):
                     
             except openai.APIError as e:
                 if attempt < self.max_retries - 1:
+                    self.retry_budget.spend(e)
                     delay = self._calculate_backoff(attempt)
                     print(f"API error occurred. Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
                     time.sleep(delay)
@@ -81,6 +175,7 @@ class OpenAIClient(GenAIClient):
                     
             except openai.APIConnectionError as e:
                 if attempt < self.max_retries - 1:
+                    self.retry_budget.spend(e)
                     delay = self._calculate_backoff(attempt)
                     print(f"Network error. Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
                     time.sleep(delay)
@@ -93,6 +188,142 @@ class OpenAIClient(GenAIClient):
         
         raise Exception(f"Failed to generate image after {self.max_retries} attempts")
     
+    async def agenerate_image(self, prompt: str, size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
+        """
+        Generate an image using DALL-E 3 through the async SDK.
+        
+        The request and the download await on the event loop, so hundreds
+        of generations can be in flight without a thread each.
+        
+        Args:
+            prompt: Text description for image generation
+            size: Target image size (DALL-E 3 supports 1024x1024, 1024x1792, 1792x1024)
+            
+        Returns:
+            PIL Image object
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        import openai
+        
+        size_str = self._format_size(size)
+        async_client, _ = self._loop_clients()
+        
+        for attempt in range(self.max_retries):
+            try:
+                with self.circuit_breaker.guard(failures=self._provider_failures()):
+                    async with self.rate_limiter.acquire_async():
+                        response = await async_client.images.generate(
+                            model=self.model,
+                            prompt=prompt,
+                            size=size_str,
+                            quality="standard",
+                            response_format=self.response_format,
+                            n=1
+                        )
+                self.rate_limiter.on_success()
+                self.retry_budget.on_success()
+                
+                if self.response_format == "b64_json":
+                    # Decoding is CPU work; keep it off the event loop
+                    return await asyncio.to_thread(self._decode_b64_image, response.data[0].b64_json)
+                return await self._adownload_image(response.data[0].url)
+                
+            except CircuitOpenError:
+                raise
+                
+            except openai.RateLimitError as e:
+                self.rate_limiter.on_rate_limited(self._retry_after(e))
+                if attempt < self.max_retries - 1:
+                    self.retry_budget.spend(e)
+                    delay = self._calculate_backoff(attempt)
+                    print(f"Rate limit hit. Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
+                    await asyncio.sleep(delay)
+                else:
+                    raise Exception(f"Rate limit exceeded after {self.max_retries} attempts: {str(e)}")
+                    
+            except openai.APIError as e:
+                if attempt < self.max_retries - 1:
+                    self.retry_budget.spend(e)
+                    delay = self._calculate_backoff(attempt)
+                    print(f"API error occurred. Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
+                    await asyncio.sleep(delay)
+                else:
+                    raise Exception(f"API error after {self.max_retries} attempts: {str(e)}")
+                    
+            except Exception as e:
+                raise Exception(f"Unexpected error during image generation: {str(e)}")
+        
+        raise Exception(f"Failed to generate image after {self.max_retries} attempts")
+    
+    async def aclose(self) -> None:
+        """Close the SDK and download clients of the running event loop."""
+        clients = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if clients:
+            async_client, http_client = clients
+            await async_client.close()
+            if http_client is not None:
+                await http_client.aclose()
+    
+    def _loop_clients(self):
+        """
+        Return the async SDK client and download client of the running event loop.
+        
+        Returns:
+            Tuple of (openai.AsyncOpenAI, httpx.AsyncClient or None)
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._async_clients.get(loop)
+        if clients is None:
+            import openai
+            try:
+                import httpx
+            except ImportError:  # Installed with openai>=1; without it async downloads use threads
+                httpx = None
+            
+            http_client = None
+            if httpx is not None:
+                http_client = httpx.AsyncClient(
+                    timeout=30,
+                    limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS,
+                                        max_keepalive_connections=DOWNLOAD_POOL_SIZE)
+                )
+            clients = (openai.AsyncOpenAI(api_key=self.api_key), http_client)
+            self._async_clients[loop] = clients
+        return clients
+    
+    async def _adownload_image(self, url: str) -> Image.Image:
+        """
+        Download an image over the event loop's pooled HTTP client.
+        
+        Args:
+            url: Image URL from API response
+            
+        Returns:
+            PIL Image object
+            
+        Raises:
+            Exception: If download fails
+        """
+        _, http_client = self._loop_clients()
+        if http_client is None:
+            return await asyncio.to_thread(self._download_image, url)
+        import httpx
+        
+        buffer = BytesIO()
+        try:
+            async with http_client.stream('GET', url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    buffer.write(chunk)
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to download image: {str(e)}")
+        
+        # Decoding is CPU work; keep it off the event loop
+        buffer.seek(0)
+        return await asyncio.to_thread(self._decode_image, buffer)
+    
     def _download_image(self, url: str) -> Image.Image:
         """
         Download image from URL and convert to PIL Image.
@@ -106,12 +337,58 @@ class OpenAIClient(GenAIClient):
         Raises:
             Exception: If download fails
         """
+        # Stream into one buffer rather than materialising response.content
+        buffer = BytesIO()
+        try:
+            response = self.session.get(url, timeout=30, stream=True)
+            try:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    buffer.write(chunk)
+            finally:
+                response.close()
+        except requests.RequestException as e:
+            raise Exception(f"Failed to download image: {str(e)}")
+        
+        buffer.seek(0)
+        return self._decode_image(buffer)
+    
+    def _decode_b64_image(self, payload: str) -> Image.Image:
+        """
+        Decode an image returned inline by the API.
+        
+        Args:
+            payload: Base64-encoded image file (the b64_json field)
+            
+        Returns:
+            PIL Image object in RGB mode
+            
+        Raises:
+            Exception: If the payload is not a readable image
+        """
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            data = base64.b64decode(payload, validate=True)
+        except (TypeError, ValueError) as e:
+            raise Exception(f"Failed to decode inline image: {str(e)}")
+        return self._decode_image(data)
+    
+    def _decode_image(self, content: Union[bytes, BinaryIO]) -> Image.Image:
+        """
+        Decode an encoded image.
+        
+        Args:
+            content: Encoded image file, as bytes or a readable buffer
             
-            image_data = BytesIO(response.content)
-            image = Image.open(image_data)
+        Returns:
+            PIL Image object in RGB mode
+            
+        Raises:
+            Exception: If the bytes are not a readable image
+        """
+        try:
+            image = Image.open(BytesIO(content) if isinstance(content, bytes) else content)
+            # Image.open is lazy: decode here, off the event loop for async callers
+            image.load()
             
             # Convert to RGB if necessary
             if image.mode != 'RGB':
@@ -119,8 +396,6 @@ class OpenAIClient(GenAIClient):
             
             return image
             
-        except requests.RequestException as e:
-            raise Exception(f"Failed to download image: {str(e)}")
         except Exception as e:
             raise Exception(f"Failed to process downloaded image: {str(e)}")
     
@@ -146,6 +421,36 @@ class OpenAIClient(GenAIClient):
         else:
             return "1792x1024"
     
+    @staticmethod
+    def _provider_failures() -> Tuple[type, ...]:
+        """
+        Errors that count against the provider's circuit breaker.
+        
+        Returns:
+            Connection failures, timeouts and 5xx responses; rejected
+            requests (4xx, including rate limits and content policy) say
+            nothing about the provider's health
+        """
+        import openai
+        return (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """
+        Read the Retry-After header of a rate-limit error.
+        
+        Args:
+            error: Error raised by the OpenAI SDK
+            
+        Returns:
+            Seconds to wait, or None if the response did not say
+        """
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        try:
+            return float(headers.get('retry-after'))
+        except (AttributeError, TypeError, ValueError):
+            return None
+    
     def _calculate_backoff(self, attempt: int) -> float:
         """
         Calculate exponential backoff delay.
@@ -1,14 +1,23 @@
 """Compliance checker for brand and legal validation."""
 
+import importlib.util
+import math
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from PIL import Image
-import numpy as np
-import cv2
 
 from src.models import ComplianceResult
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# OpenCV and NumPy are imported where used, so enabling compliance does not
+# load them until the first logo check; a missing install still fails here
+for _module in ("numpy", "cv2"):
+    if importlib.util.find_spec(_module) is None:
+        raise ImportError(f"Compliance checks require {_module}")
+
 
 class BrandConfig:
     """Configuration for brand compliance checks."""
@@ -29,10 +38,13 @@ class BrandConfig:
         self.min_logo_confidence = min_logo_confidence
         self._logo_template = None
         
-    def load_logo_template(self) -> Optional[np.ndarray]:
+    def load_logo_template(self) -> Optional["np.ndarray"]:
         """Load and cache the logo template."""
         if self._logo_template is None and self.logo_template_path:
             if Path(self.logo_template_path).exists():
+                import numpy as np
+                import cv2
+                
                 template_img = Image.open(self.logo_template_path)
                 self._logo_template = cv2.cvtColor(np.array(template_img), cv2.COLOR_RGB2BGR)
         return self._logo_template
@@ -178,6 +190,9 @@ class ComplianceChecker:
         if template is None:
             return False
         
+        import numpy as np
+        import cv2
+        
         # Convert PIL image to OpenCV format
         img_cv = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
         
@@ -207,6 +222,7 @@ class ComplianceChecker:
             img_small = img_small.convert('RGB')
         
         # Get pixel data
+        import numpy as np
         pixels = np.array(img_small)
         pixels = pixels.reshape(-1, 3)
         
@@ -244,6 +260,6 @@ class ComplianceChecker:
         rgb2 = tuple(int(color2.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
         
         # Calculate Euclidean distance
-        distance = np.sqrt(sum((a - b) ** 2 for a, b in zip(rgb1, rgb2)))
+        distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(rgb1, rgb2)))
         
         return bool(distance <= tolerance)
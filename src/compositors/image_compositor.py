@@ -1,8 +1,14 @@
 """Image compositor for creating aspect ratio variants and text overlays."""
 
 from PIL import Image, ImageDraw, ImageFont, ImageStat
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import os
+import threading
+
+
+# Bump whenever cropping or overlay rendering changes, so incremental
+# builds re-render outputs made by an older compositor
+COMPOSITOR_VERSION = "1"
 
 
 class ImageCompositor:
@@ -15,6 +21,24 @@ class ImageCompositor:
         "16:9": 16/9
     }
     
+    # Fallback font paths tried when font_family cannot be loaded
+    COMMON_FONTS = [
+        "/System/Library/Fonts/Helvetica.ttc",  # macOS
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+        "C:\\Windows\\Fonts\\arial.ttf",  # Windows
+        "Arial.ttf",
+        "Helvetica.ttf"
+    ]
+    
+    # Contact sheet caption size, spacing and background
+    CONTACT_SHEET_FONT_SIZE = 16
+    CONTACT_SHEET_GAP = 16
+    CONTACT_SHEET_BACKGROUND = "#202020"
+    
+    # Loaded fonts shared by all compositors, keyed by (font_family, size)
+    _font_cache: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+    _font_cache_lock = threading.Lock()
+    
     def __init__(self, font_family: str = "Arial", font_size: int = 48, 
                  text_color: str = "#FFFFFF", text_position: str = "bottom",
                  padding: int = 20, background_opacity: float = 0.6):
@@ -222,6 +246,31 @@ class ImageCompositor:
         """
         Load font with specified size.
         
+        Fonts are resolved once per (font family, size) and cached for the
+        life of the process, so repeated overlays skip font discovery.
+        
+        Args:
+            font_size: Font size in points
+        
+        Returns:
+            Font object, falls back to default if specified font not available
+        """
+        key = (self.font_family, font_size)
+        font = self._font_cache.get(key)
+        if font is not None:
+            return font
+        
+        with self._font_cache_lock:
+            font = self._font_cache.get(key)
+            if font is None:
+                font = self._resolve_font(font_size)
+                self._font_cache[key] = font
+        return font
+    
+    def _resolve_font(self, font_size: int) -> ImageFont.FreeTypeFont:
+        """
+        Find and load a font from the configured family or common fallbacks.
+        
         Args:
             font_size: Font size in points
         
@@ -233,16 +282,8 @@ class ImageCompositor:
             font = ImageFont.truetype(self.font_family, font_size)
         except (OSError, IOError):
             # Try common font paths
-            common_fonts = [
-                "/System/Library/Fonts/Helvetica.ttc",  # macOS
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-                "C:\\Windows\\Fonts\\arial.ttf",  # Windows
-                "Arial.ttf",
-                "Helvetica.ttf"
-            ]
-            
             font = None
-            for font_path in common_fonts:
+            for font_path in self.COMMON_FONTS:
                 try:
                     font = ImageFont.truetype(font_path, font_size)
                     break
@@ -423,3 +464,48 @@ class ImageCompositor:
         )
         
         return img_copy
+    
+    def create_contact_sheet(self, rows: List[Tuple[str, List[Tuple[str, Image.Image]]]],
+                             title: str = "", cell_size: int = 256) -> Image.Image:
+        """
+        Lay out labelled thumbnails in a grid for review.
+        
+        Each row starts with its label and holds its images side by side,
+        each scaled to fit a cell_size square and captioned underneath.
+        
+        Args:
+            rows: (row label, [(caption, image), ...]) per row
+            title: Heading drawn above the grid
+            cell_size: Edge length of each thumbnail cell in pixels
+        
+        Returns:
+            RGB contact sheet image
+        """
+        font = self._load_font(self.CONTACT_SHEET_FONT_SIZE)
+        gap = self.CONTACT_SHEET_GAP
+        line_height = self.CONTACT_SHEET_FONT_SIZE + gap // 2
+        columns = max([len(cells) for _, cells in rows] + [1])
+        row_height = line_height + cell_size + line_height + gap
+        
+        width = gap + columns * (cell_size + gap)
+        height = gap + (line_height + gap if title else 0) + len(rows) * row_height
+        sheet = Image.new('RGB', (width, height), self.CONTACT_SHEET_BACKGROUND)
+        draw = ImageDraw.Draw(sheet)
+        
+        y = gap
+        if title:
+            draw.text((gap, y), title, font=font, fill=self.text_color)
+            y += line_height + gap
+        
+        for label, cells in rows:
+            draw.text((gap, y), label, font=font, fill=self.text_color)
+            for column, (caption, image) in enumerate(cells):
+                x = gap + column * (cell_size + gap)
+                thumbnail = image.convert('RGB')
+                thumbnail.thumbnail((cell_size, cell_size), Image.Resampling.BILINEAR)
+                left = x + (cell_size - thumbnail.width) // 2
+                sheet.paste(thumbnail, (left, y + line_height + (cell_size - thumbnail.height) // 2))
+                draw.text((left, y + line_height + cell_size + gap // 4), caption, font=font, fill=self.text_color)
+            y += row_height
+        
+        return sheet
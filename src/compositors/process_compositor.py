@@ -0,0 +1,164 @@
+"""Process-pool compositing engine backed by shared-memory pixel buffers."""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.compositors.image_compositor import ImageCompositor
+
+
+# Compositor instance owned by each worker process (set by _init_worker)
+_worker_compositor: Optional[ImageCompositor] = None
+
+# Shared buffers are laid out as RGBA so workers can map them without a copy
+_SHARED_MODE = 'RGBA'
+
+
+def _init_worker(compositor_settings: Dict) -> None:
+    """Build the per-process ImageCompositor used by every task."""
+    global _worker_compositor
+    _worker_compositor = ImageCompositor(**compositor_settings)
+
+
+def _composite_worker(shm_name: str, size: tuple, ratio_str: str,
+                      text: str, output_path: str) -> Tuple[str, Dict[str, float]]:
+    """
+    Crop, overlay and encode one aspect ratio variant inside a worker process.
+    
+    The hero image is mapped directly from shared memory; only the cropped
+    region is copied into the worker's own address space.
+    
+    Args:
+        shm_name: Name of the shared memory block holding the hero pixels
+        size: Hero image (width, height)
+        ratio_str: Aspect ratio to render (e.g., "9:16")
+        text: Text message to overlay
+        output_path: PNG file path to write
+    
+    Returns:
+        Tuple of (path of the written file, seconds spent per stage)
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        started = time.perf_counter()
+        hero = Image.frombuffer(_SHARED_MODE, size, shm.buf, 'raw', _SHARED_MODE, 0, 1)
+        variant = _worker_compositor.create_variants(hero, [ratio_str])[ratio_str]
+        # Detach from the shared buffer before the mapping is closed
+        variant = variant.copy()
+        del hero
+        cropped = time.perf_counter()
+        
+        final_image = _worker_compositor.add_text_overlay(variant, text)
+        overlaid = time.perf_counter()
+        final_image.save(output_path, format='PNG', optimize=True)
+        saved = time.perf_counter()
+        
+        return output_path, {
+            'crop': cropped - started,
+            'overlay': overlaid - cropped,
+            'save': saved - overlaid
+        }
+    finally:
+        shm.close()
+
+
+class ProcessCompositor:
+    """Runs crop, text overlay and PNG encoding in a pool of worker processes."""
+    
+    def __init__(self, compositor_settings: Dict, max_workers: Optional[int] = None):
+        """
+        Initialize the process compositor.
+        
+        Args:
+            compositor_settings: Keyword arguments for ImageCompositor in each worker
+            max_workers: Number of worker processes (default: CPU count)
+        """
+        self.compositor_settings = dict(compositor_settings)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.compositor_settings,)
+                )
+            return self._executor
+    
+    def start(self) -> None:
+        """Spawn the worker processes now instead of on the first render."""
+        executor = self._get_executor()
+        wait([executor.submit(os.getpid) for _ in range(self.max_workers)])
+    
+    def render_variants(self, hero_image: Image.Image, aspect_ratios: List[str],
+                        text: str, output_paths: Dict[str, str],
+                        timings: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, str]:
+        """
+        Render and save every aspect ratio variant of a hero image.
+        
+        The decoded hero is written once to a shared memory block that all
+        workers map, so large images are not pickled per aspect ratio.
+        
+        Args:
+            hero_image: Source image to create variants from
+            aspect_ratios: Aspect ratio strings to render
+            text: Text message to overlay
+            output_paths: Mapping of aspect ratio to destination file path
+            timings: Optional dictionary that receives, per aspect ratio, the
+                seconds each worker spent cropping, overlaying and saving
+        
+        Returns:
+            Dictionary mapping aspect ratio to written file path, in the
+            order of aspect_ratios
+        
+        Raises:
+            ValueError: If an aspect ratio is not supported
+        """
+        for ratio_str in aspect_ratios:
+            if ratio_str not in ImageCompositor.ASPECT_RATIOS:
+                raise ValueError(f"Unsupported aspect ratio: {ratio_str}")
+        
+        hero = hero_image if hero_image.mode == _SHARED_MODE else hero_image.convert(_SHARED_MODE)
+        pixels = hero.tobytes()
+        
+        shm = shared_memory.SharedMemory(create=True, size=len(pixels))
+        futures = {}
+        try:
+            shm.buf[:len(pixels)] = pixels
+            del pixels
+            
+            executor = self._get_executor()
+            for ratio_str in aspect_ratios:
+                futures[ratio_str] = executor.submit(
+                    _composite_worker, shm.name, hero.size, ratio_str,
+                    text, output_paths[ratio_str]
+                )
+            saved = {}
+            for ratio_str, future in futures.items():
+                saved[ratio_str], stage_seconds = future.result()
+                if timings is not None:
+                    timings[ratio_str] = stage_seconds
+            return saved
+        finally:
+            # Workers must be done with the block before it is unlinked
+            wait(futures.values())
+            shm.close()
+            shm.unlink()
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool and release its processes."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
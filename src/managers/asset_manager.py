@@ -11,16 +11,30 @@ class AssetManager:
     
     SUPPORTED_FORMATS = {'.png', '.jpg', '.jpeg'}
     
-    def __init__(self, input_dir: str, output_dir: str):
+    # Encoder settings and file extension per output format: optimised PNG
+    # for final assets, fast JPEG for previews
+    OUTPUT_FORMATS = {
+        'png': ({'format': 'PNG', 'optimize': True}, '.png'),
+        'jpeg': ({'format': 'JPEG', 'quality': 85}, '.jpg')
+    }
+    
+    def __init__(self, input_dir: str, output_dir: str, output_format: str = 'png'):
         """
         Initialize AssetManager with input and output directories.
         
         Args:
             input_dir: Directory containing input product assets
             output_dir: Directory for saving generated outputs
+            output_format: Format outputs are saved in ("png" or "jpeg")
+        
+        Raises:
+            ValueError: If the output format is not supported
         """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
+        self.output_format = output_format
         
         # Create directories if they don't exist
         self.input_dir.mkdir(parents=True, exist_ok=True)
@@ -54,6 +68,21 @@ class AssetManager:
         
         return None
     
+    def has_asset(self, product_id: str) -> bool:
+        """
+        Check whether an asset file exists for a product, without loading it.
+        
+        Args:
+            product_id: Product identifier to look up
+            
+        Returns:
+            True if a file with a supported format exists
+        """
+        return any(
+            (self.input_dir / f"{product_id}{ext}").is_file()
+            for ext in self.SUPPORTED_FORMATS
+        )
+    
     def save_asset(
         self,
         campaign_id: str,
@@ -66,7 +95,7 @@ class AssetManager:
         Save generated asset with organized directory structure.
         
         Creates directory structure: output/{campaign_id}/{product_id}/
-        Filename format: {aspect_ratio}_{product_id}.png
+        Filename format: {aspect_ratio}_{product_id}.png (.jpg for JPEG output)
         
         Args:
             campaign_id: Campaign identifier
@@ -78,18 +107,33 @@ class AssetManager:
         Returns:
             Full path to saved file
         """
-        # Create directory structure
+        file_path = self.get_output_path(campaign_id, product_id, aspect_ratio)
+        
+        # Save image with high quality (or quickly, for previews)
+        save_options, _ = self.OUTPUT_FORMATS[self.output_format]
+        if save_options['format'] == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(file_path, **save_options)
+        
+        return str(file_path)
+    
+    def get_output_path(self, campaign_id: str, product_id: str, aspect_ratio: str) -> Path:
+        """
+        Resolve the output path for an asset, creating its product directory.
+        
+        Args:
+            campaign_id: Campaign identifier
+            product_id: Product identifier
+            aspect_ratio: Aspect ratio (e.g., "1x1", "9x16", "16x9")
+            
+        Returns:
+            Path where the asset should be written
+        """
         product_dir = self.output_dir / campaign_id / product_id
         product_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate filename
         filename = self._generate_filename(product_id, aspect_ratio)
-        file_path = product_dir / filename
-        
-        # Save image with high quality
-        image.save(file_path, format='PNG', optimize=True)
-        
-        return str(file_path)
+        return product_dir / filename
     
     def organize_outputs(self, campaign_id: str) -> Dict[str, list]:
         """
@@ -137,4 +181,5 @@ class AssetManager:
         """
         # Normalize aspect ratio format (ensure it uses 'x' separator)
         normalized_ratio = aspect_ratio.replace(':', 'x').lower()
-        return f"{normalized_ratio}_{product_id}.png"
+        _, extension = self.OUTPUT_FORMATS[self.output_format]
+        return f"{normalized_ratio}_{product_id}{extension}"
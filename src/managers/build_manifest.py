@@ -0,0 +1,124 @@
+"""Build manifest for incremental output rebuilds."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+
+def hash_image(image: Image.Image) -> str:
+    """
+    Compute a content hash of a decoded image.
+    
+    Args:
+        image: PIL Image to hash
+    
+    Returns:
+        Hex SHA-256 digest of the image mode, size and pixel data
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode('utf-8'))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def compute_fingerprint(hero_hash: str, aspect_ratio: str, message: str,
+                        render_settings: Dict[str, Any]) -> str:
+    """
+    Compute the fingerprint of one output from everything that shapes it.
+    
+    Args:
+        hero_hash: Content hash of the hero image (see hash_image)
+        aspect_ratio: Aspect ratio of the output
+        message: Overlay text
+        render_settings: Text overlay settings, compositor version and
+            encoder settings
+    
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    payload = json.dumps({
+        "hero": hero_hash,
+        "aspect_ratio": aspect_ratio,
+        "message": message,
+        "render": render_settings
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """Tracks the fingerprint each output file was last built from."""
+    
+    def __init__(self, manifest_path: str):
+        """
+        Initialize the manifest, loading previous entries if present.
+        
+        Args:
+            manifest_path: JSON file storing the fingerprints
+        """
+        self.manifest_path = Path(manifest_path)
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self._entries = json.load(f).get('outputs', {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs a full rebuild
+                self._entries = {}
+    
+    @staticmethod
+    def key(product_id: str, aspect_ratio: str) -> str:
+        """Return the manifest key for one output."""
+        return f"{product_id}/{aspect_ratio}"
+    
+    def is_up_to_date(self, key: str, fingerprint: str) -> Optional[str]:
+        """
+        Check whether an output was already built from this fingerprint.
+        
+        Args:
+            key: Output key (see key())
+            fingerprint: Fingerprint of the current inputs
+        
+        Returns:
+            Path of the existing output if it is up to date, None otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        
+        if entry and entry.get('fingerprint') == fingerprint and Path(entry['file_path']).exists():
+            return entry['file_path']
+        return None
+    
+    def record(self, key: str, fingerprint: str, file_path: str) -> None:
+        """
+        Record that an output was built from a fingerprint.
+        
+        Args:
+            key: Output key (see key())
+            fingerprint: Fingerprint of the inputs used
+            file_path: Path of the written output
+        """
+        with self._lock:
+            self._entries[key] = {"fingerprint": fingerprint, "file_path": file_path}
+            self._dirty = True
+    
+    def save(self) -> None:
+        """Write the manifest atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"outputs": dict(self._entries)}
+            self._dirty = False
+        
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
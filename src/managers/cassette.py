@@ -0,0 +1,170 @@
+"""Cassette directories of recorded GenAI responses for offline replay."""
+
+import hashlib
+import json
+import os
+import threading
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.managers.genai_cache import normalize_prompt
+
+
+def request_key(prompt: str, size: Tuple[int, int]) -> str:
+    """
+    Identify a request independently of the provider that served it.
+    
+    Args:
+        prompt: Generation prompt (normalised here)
+        size: Requested image size
+    
+    Returns:
+        Hex SHA-256 key
+    """
+    payload = json.dumps({
+        "prompt": normalize_prompt(prompt),
+        "size": [int(size[0]), int(size[1])]
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded provider responses: what each request returned and how long it took.
+    
+    interactions.jsonl holds one record per provider call, in the order the
+    calls finished: request key, prompt, size, provider, model, observed
+    seconds, and either the image file name or the error message. Images
+    are stored once under images/, named by the SHA-256 of their PNG bytes.
+    Records are appended and flushed as they happen, so a recording
+    interrupted by a crash keeps everything up to its last complete line.
+    """
+    
+    def __init__(self, cassette_dir: str):
+        """
+        Initialize the cassette, loading any interactions already recorded.
+        
+        Args:
+            cassette_dir: Directory holding interactions.jsonl and images/
+        """
+        self.cassette_dir = Path(cassette_dir)
+        self.interactions_path = self.cassette_dir / "interactions.jsonl"
+        self.images_dir = self.cassette_dir / "images"
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._load()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(recorded) for recorded in self._interactions.values())
+    
+    @property
+    def keys(self) -> List[str]:
+        """Request keys with at least one recorded interaction, in recording order."""
+        with self._lock:
+            return list(self._interactions)
+    
+    @property
+    def sizes(self) -> List[Tuple[int, int]]:
+        """Distinct requested sizes, in recording order."""
+        with self._lock:
+            return list(dict.fromkeys(
+                tuple(interaction['size'])
+                for recorded in self._interactions.values() for interaction in recorded
+            ))
+    
+    def interactions(self, key: str) -> List[Dict[str, Any]]:
+        """
+        Return the interactions recorded for a request.
+        
+        Args:
+            key: Request key (see request_key)
+        
+        Returns:
+            Interaction records in recording order (empty if none)
+        """
+        with self._lock:
+            return list(self._interactions.get(key, ()))
+    
+    def record(self, prompt: str, size: Tuple[int, int], provider: str, model: str,
+               seconds: float, image: Optional[Image.Image] = None,
+               error: Optional[BaseException] = None) -> None:
+        """
+        Append one provider call to the cassette.
+        
+        Args:
+            prompt: Generation prompt
+            size: Requested image size
+            provider: Provider that served the call
+            model: Model that served the call
+            seconds: Observed duration of the call
+            image: Returned image, if the call succeeded
+            error: Raised error, if the call failed
+        """
+        record = {
+            "key": request_key(prompt, size),
+            "prompt": prompt,
+            "size": [int(size[0]), int(size[1])],
+            "provider": provider,
+            "model": model,
+            "seconds": round(seconds, 6),
+            "image": self._store_image(image) if image is not None else None,
+            "error": str(error) if error is not None else None
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        
+        with self._lock:
+            self.cassette_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.interactions_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._interactions.setdefault(record["key"], []).append(record)
+    
+    def load_image(self, name: str) -> Image.Image:
+        """
+        Load a recorded image.
+        
+        Args:
+            name: Image file name from an interaction record
+        
+        Returns:
+            PIL Image in RGB mode
+        """
+        with Image.open(self.images_dir / name) as image:
+            return image.convert('RGB')
+    
+    def _store_image(self, image: Image.Image) -> str:
+        """Write an image once under its content hash and return the file name."""
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        data = buffer.getvalue()
+        name = f"{hashlib.sha256(data).hexdigest()}.png"
+        
+        path = self.images_dir / name
+        if not path.exists():
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        return name
+    
+    def _load(self) -> None:
+        """Read the recorded interactions, skipping a torn final line."""
+        if not self.interactions_path.exists():
+            return
+        
+        data = self.interactions_path.read_bytes()
+        complete_length = data.rfind(b"\n") + 1
+        if complete_length < len(data):
+            # Drop a torn final write so new records start on a fresh line
+            with open(self.interactions_path, 'r+b') as f:
+                f.truncate(complete_length)
+        
+        for line in data[:complete_length].decode('utf-8').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._interactions.setdefault(record["key"], []).append(record)
@@ -0,0 +1,211 @@
+"""Content-addressed on-disk cache for generated images."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalise a prompt so trivially different spellings share a cache entry.
+    
+    Args:
+        prompt: Generation prompt
+    
+    Returns:
+        Prompt in Unicode NFC form with runs of whitespace collapsed
+    """
+    return " ".join(unicodedata.normalize('NFC', prompt).split())
+
+
+def cache_key(provider: str, model: str, prompt: str, size: Tuple[int, int]) -> str:
+    """
+    Compute the cache key of a generation request.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+        model: Model identifier
+        prompt: Generation prompt (normalised here)
+        size: Requested image size
+    
+    Returns:
+        Hex SHA-256 key
+    """
+    payload = json.dumps({
+        "provider": provider,
+        "model": model,
+        "prompt": normalize_prompt(prompt),
+        "size": [int(size[0]), int(size[1])]
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenAICache:
+    """
+    Stores generated images on disk, bounded by total size.
+    
+    Images are PNG files named by their cache key under objects/. An
+    index.json records each entry's size, creation and last access time.
+    When the total size exceeds max_bytes, the least recently used entries
+    are evicted; entries older than ttl_seconds are treated as misses.
+    """
+    
+    # stats() values that describe current state rather than counting events
+    STATS_GAUGES = ('entries', 'total_bytes')
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 ** 3,
+                 ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache, loading its index if present.
+        
+        Args:
+            cache_dir: Directory holding the index and image files
+            max_bytes: Upper bound on the total size of stored images
+            ttl_seconds: Maximum entry age; None keeps entries until evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = ttl_seconds
+        
+        self._entries: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        # Serializes index writes so an older snapshot never replaces a newer one
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bytes_read": 0,
+            "bytes_written": 0
+        }
+        
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r') as f:
+                    self._entries = json.load(f).get('entries', {})
+            except (OSError, ValueError):
+                # A corrupt index only costs regenerating the images
+                self._entries = {}
+    
+    def get(self, key: str) -> Optional[Image.Image]:
+        """
+        Look up an image.
+        
+        Args:
+            key: Cache key (see cache_key())
+        
+        Returns:
+            Decoded image, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self.ttl_seconds is not None and now - entry['created'] > self.ttl_seconds:
+                self._remove(key)
+                self._counters['expired'] += 1
+                entry = None
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+        
+        path = self._path(key)
+        try:
+            image = Image.open(path)
+            image.load()
+        except (OSError, ValueError):
+            with self._lock:
+                self._remove(key)
+                self._counters['misses'] += 1
+            return None
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]['last_access'] = now
+                self._dirty = True
+            self._counters['hits'] += 1
+            self._counters['bytes_read'] += int(entry['bytes'])
+        return image
+    
+    def put(self, key: str, image: Image.Image) -> None:
+        """
+        Store an image, evicting least recently used entries if needed.
+        
+        Args:
+            key: Cache key (see cache_key())
+            image: Image to store
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        image.save(tmp_path, format='PNG')
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {"bytes": size, "created": now, "last_access": now}
+            self._counters['bytes_written'] += size
+            self._evict()
+            self._dirty = True
+        self.flush()
+    
+    def flush(self) -> None:
+        """Write the index atomically if anything changed."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = {"entries": dict(self._entries)}
+                self._dirty = False
+            
+            tmp_path = self.index_path.with_suffix(f'.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.index_path)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cumulative counters plus the current entry count and size."""
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "total_bytes": sum(int(entry['bytes']) for entry in self._entries.values())
+            }
+    
+    def _path(self, key: str) -> Path:
+        """Return the image file of a key."""
+        return self.objects_dir / key[:2] / f"{key}.png"
+    
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its file; the caller must hold the lock."""
+        self._entries.pop(key, None)
+        self._dirty = True
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries over max_bytes; caller holds the lock."""
+        total = sum(int(entry['bytes']) for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= int(entry['bytes'])
+            self._remove(key)
+            self._counters['evictions'] += 1
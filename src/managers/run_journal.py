@@ -0,0 +1,252 @@
+"""Append-only run journal for crash-safe checkpoint and resume."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+from src.models import CampaignBrief, ComplianceResult, GeneratedAsset
+
+
+def compute_run_fingerprint(brief: CampaignBrief, settings: Dict[str, Any]) -> str:
+    """
+    Compute the fingerprint of a run from its brief and output settings.
+    
+    Args:
+        brief: Campaign brief (message, products, audience, region, ...)
+        settings: Everything else that shapes the journaled heroes and
+            outputs (e.g., aspect ratios, render settings, generator)
+    
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    payload = json.dumps({
+        "brief": asdict(brief),
+        "settings": settings
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RunJournal:
+    """
+    Records completed work for one campaign so an interrupted run can resume.
+    
+    The journal is a JSON Lines file. Each record is flushed and fsynced
+    before the call returns, so everything recorded before a crash is
+    still there afterwards. A half-written final line is ignored on load.
+    Generated hero images are checkpointed next to the journal so a resumed
+    run does not pay for the same GenAI call twice. The first record holds
+    the fingerprint of the run's brief and settings; a run with a different
+    fingerprint starts over instead of resuming.
+    """
+    
+    def __init__(self, campaign_dir: str):
+        """
+        Initialize the journal for a campaign output directory.
+        
+        Args:
+            campaign_dir: Output directory of the campaign
+        """
+        self.campaign_dir = Path(campaign_dir)
+        self.journal_path = self.campaign_dir / "journal.jsonl"
+        self.heroes_dir = self.campaign_dir / ".checkpoint" / "heroes"
+        self._heroes: Dict[str, str] = {}
+        self._units: Dict[Tuple[str, str], GeneratedAsset] = {}
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def start(self, resume: bool = False, fingerprint: Optional[str] = None) -> bool:
+        """
+        Open the journal for writing.
+        
+        Args:
+            resume: Load the existing journal and continue it. When False,
+                any previous journal and hero checkpoints are discarded.
+            fingerprint: Fingerprint of this run (see compute_run_fingerprint);
+                a journal recorded with another one is discarded, not resumed
+        
+        Returns:
+            True if an existing journal was loaded to continue
+        """
+        self.campaign_dir.mkdir(parents=True, exist_ok=True)
+        
+        resumed = resume and self._load(fingerprint)
+        if not resumed:
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            if self.heroes_dir.exists():
+                shutil.rmtree(self.heroes_dir)
+        
+        self.heroes_dir.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        if not resumed and fingerprint is not None:
+            self._append({"event": "start", "fingerprint": fingerprint})
+        return resumed
+    
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+    
+    @property
+    def completed_units(self) -> int:
+        """Number of (product, aspect ratio) units recorded so far."""
+        with self._lock:
+            return len(self._units)
+    
+    def get_unit(self, product_id: str, aspect_ratio: str) -> Optional[GeneratedAsset]:
+        """
+        Return the recorded output for a unit, if it completed and still exists.
+        
+        Args:
+            product_id: Product identifier
+            aspect_ratio: Aspect ratio string
+        
+        Returns:
+            GeneratedAsset recorded for the unit, or None
+        """
+        with self._lock:
+            asset = self._units.get((product_id, aspect_ratio))
+        if asset and Path(asset.file_path).exists():
+            return asset
+        return None
+    
+    def has_hero(self, product_id: str) -> bool:
+        """
+        Check whether a usable hero checkpoint exists, without loading it.
+        
+        Args:
+            product_id: Product identifier
+        
+        Returns:
+            True if the checkpointed hero file exists
+        """
+        with self._lock:
+            path = self._heroes.get(product_id)
+        return bool(path) and Path(path).exists()
+    
+    def get_hero(self, product_id: str) -> Optional[Image.Image]:
+        """
+        Load a checkpointed generated hero image.
+        
+        Args:
+            product_id: Product identifier
+        
+        Returns:
+            PIL Image, or None if no usable checkpoint exists
+        """
+        with self._lock:
+            path = self._heroes.get(product_id)
+        if not path or not Path(path).exists():
+            return None
+        try:
+            image = Image.open(path)
+            image.load()
+            return image
+        except Exception:
+            return None
+    
+    def record_hero(self, product_id: str, image: Image.Image) -> None:
+        """
+        Checkpoint a generated hero image.
+        
+        Args:
+            product_id: Product identifier
+            image: Generated hero image
+        """
+        path = self.heroes_dir / f"{product_id}.png"
+        tmp_path = self.heroes_dir / f"{product_id}.tmp"
+        # Fast lossless save; these files are only read back on resume
+        image.save(tmp_path, format='PNG', compress_level=1)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._heroes[product_id] = str(path)
+        self._append({"event": "hero", "product_id": product_id, "path": str(path)})
+    
+    def record_unit(self, asset: GeneratedAsset) -> None:
+        """
+        Record a completed (product, aspect ratio) unit.
+        
+        Args:
+            asset: Output produced for the unit
+        """
+        with self._lock:
+            self._units[(asset.product_id, asset.aspect_ratio)] = asset
+        self._append({
+            "event": "unit",
+            "product_id": asset.product_id,
+            "aspect_ratio": asset.aspect_ratio,
+            "file_path": asset.file_path,
+            "was_generated": asset.was_generated,
+            "up_to_date": asset.up_to_date,
+            "compliance_status": asdict(asset.compliance_status) if asset.compliance_status else None
+        })
+    
+    def _append(self, record: dict) -> None:
+        """Durably append one record."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def _load(self, fingerprint: Optional[str] = None) -> bool:
+        """
+        Replay an existing journal into memory.
+        
+        Args:
+            fingerprint: Expected run fingerprint, or None to accept any journal
+        
+        Returns:
+            True if the journal exists and matches the fingerprint
+        """
+        if not self.journal_path.exists():
+            return False
+        
+        data = self.journal_path.read_bytes()
+        complete_length = data.rfind(b"\n") + 1
+        if complete_length < len(data):
+            # Drop a torn final write so new records start on a fresh line
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(complete_length)
+        
+        recorded = None
+        for line in data[:complete_length].decode('utf-8').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            
+            if record.get("event") == "start":
+                recorded = record.get("fingerprint")
+            elif record.get("event") == "hero":
+                self._heroes[record["product_id"]] = record["path"]
+            elif record.get("event") == "unit":
+                compliance = record.get("compliance_status")
+                asset = GeneratedAsset(
+                    product_id=record["product_id"],
+                    aspect_ratio=record["aspect_ratio"],
+                    file_path=record["file_path"],
+                    was_generated=record["was_generated"],
+                    compliance_status=ComplianceResult(**compliance) if compliance else None,
+                    up_to_date=record.get("up_to_date", False)
+                )
+                self._units[(asset.product_id, asset.aspect_ratio)] = asset
+        
+        if fingerprint is not None and recorded != fingerprint:
+            # Written for another brief or other settings: nothing is reusable
+            self._heroes.clear()
+            self._units.clear()
+            return False
+        return True
@@ -1,7 +1,7 @@
 """Data models for the Creative Automation Pipeline."""
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -79,6 +79,7 @@ class GeneratedAsset:
     file_path: str
     was_generated: bool  # True if GenAI generated, False if reused
     compliance_status: Optional[ComplianceResult] = None
+    up_to_date: bool = False  # True if an unchanged existing output was kept
 
     def validate(self) -> None:
         """Validate required fields are present."""
@@ -90,6 +91,15 @@ class GeneratedAsset:
             raise ValueError("GeneratedAsset file_path is required")
 
 
+@dataclass
+class StageTiming:
+    """Wall-clock duration of one pipeline stage for one unit of work."""
+    stage: str  # lookup, generate, crop, overlay, save or compliance
+    product_id: str
+    aspect_ratio: Optional[str]  # None for per-product stages (lookup, generate)
+    seconds: float
+
+
 @dataclass
 class PipelineResult:
     """Represents the result of a pipeline execution."""
@@ -98,6 +108,8 @@ class PipelineResult:
     execution_time: float
     success: bool
     errors: List[str] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=dict)  # Engine/component metrics for the run
+    timings: List[StageTiming] = field(default_factory=list)  # Per-stage spans for every unit
 
     def validate(self) -> None:
         """Validate required fields are present."""
@@ -1,17 +1,124 @@
 """Pipeline orchestrator for coordinating creative asset generation."""
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, ContextManager
 from pathlib import Path
+from PIL import Image
 
-from src.models import CampaignBrief, PipelineResult, GeneratedAsset
+from src.models import CampaignBrief, PipelineResult, GeneratedAsset, ComplianceResult
 from src.parsers.brief_parser import BriefParser
 from src.managers.asset_manager import AssetManager
-from src.clients.genai_client import GenAIClient
-from src.compositors.image_compositor import ImageCompositor
+from src.managers.build_manifest import BuildManifest, compute_fingerprint, hash_image
+from src.managers.run_journal import RunJournal, compute_run_fingerprint
+from src.clients.genai_client import GenAIClient, ImageRequest, ImageResult, plan_batches
+from src.managers.genai_cache import GenAICache
+from src.compositors.image_compositor import ImageCompositor, COMPOSITOR_VERSION
 from src.utils.logger import PipelineLogger
 from src.utils.reporter import PipelineReporter
+from src.utils.timing import TimingRecorder
+from src.utils.size_planner import DEFAULT_GENERATION_SIZE, GenerationPlan, plan_generation_sizes
+from src.utils.rate_limiter import configure_rate_limiter
+from src.utils.circuit_breaker import CircuitBreakerGroup, configure_circuit_breaker
+from src.utils.retry_budget import RetryBudgetGroup, configure_retry_budget
+
+
+class _HeroBatch:
+    """
+    Missing hero images of one run, generated just ahead of compositing.
+    
+    Products that share a prompt form one group, generated by a single
+    generate_images() call so that their requests can still share provider
+    calls. Groups are submitted in product order to a pool of worker
+    threads, at most `lookahead` products ahead of the product being
+    processed, and each product takes its images as soon as its group's call
+    returns. A group's results are dropped once all its products took them.
+    """
+    
+    def __init__(self, client: GenAIClient, groups: List[Tuple[List[str], List[ImageRequest]]],
+                 positions: Dict[str, int], sizes: int, workers: int):
+        """
+        Args:
+            client: GenAI client that generates the groups
+            groups: (product IDs, requests) per prompt, ordered by first
+                product; requests hold `sizes` entries per product in order
+            positions: Brief order position of every product in the run
+            sizes: Images generated per product
+            workers: Group calls allowed at once; also the lookahead
+        """
+        self.client = client
+        self.positions = positions
+        self.sizes = sizes
+        self.lookahead = workers
+        self._groups = groups
+        self._starts = [min(positions[pid] for pid in pids) for pids, _ in groups]
+        self._group_of = {pid: index for index, (pids, _) in enumerate(groups) for pid in pids}
+        self._offsets = {pid: slot * sizes for pids, _ in groups for slot, pid in enumerate(pids)}
+        self._remaining = [len(pids) for pids, _ in groups]
+        self._futures = {}
+        self._submitted = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generate")
+        self.metrics = {
+            'requests': sum(len(requests) for _, requests in groups),
+            'planned_calls': sum(
+                len(plan_batches(requests, client.max_images_per_call)) for _, requests in groups
+            ),
+            'failed': 0
+        }
+        self._advance(0)
+    
+    def take(self, product_id: str) -> Optional[List[ImageResult]]:
+        """
+        Wait for a product's generated images.
+        
+        Also submits the groups that are now within the lookahead.
+        
+        Args:
+            product_id: Product about to be processed
+        
+        Returns:
+            The product's results in size order, or None if it was not planned
+        """
+        self._advance(self.positions.get(product_id, 0))
+        with self._lock:
+            index = self._group_of.pop(product_id, None)
+            if index is None:
+                return None
+            future = self._futures[index]
+        
+        results = future.result()
+        offset = self._offsets[product_id]
+        product_results = results[offset:offset + self.sizes]
+        with self._lock:
+            self.metrics['failed'] += sum(1 for result in product_results if not result.ok)
+            self._remaining[index] -= 1
+            if not self._remaining[index]:
+                del self._futures[index]
+        return product_results
+    
+    def close(self) -> None:
+        """Cancel groups that have not started and wait for running calls."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _advance(self, position: int) -> None:
+        """Submit the groups whose first product is within the lookahead of position."""
+        with self._lock:
+            while (self._submitted < len(self._groups)
+                   and self._starts[self._submitted] <= position + self.lookahead):
+                _, requests = self._groups[self._submitted]
+                self._futures[self._submitted] = self._executor.submit(self._generate, requests)
+                self._submitted += 1
+    
+    def _generate(self, requests: List[ImageRequest]) -> List[ImageResult]:
+        """Generate one group, failing its requests rather than raising."""
+        try:
+            return self.client.generate_images(requests, max_workers=1)
+        except Exception as e:
+            return [ImageResult(request, error=str(e)) for request in requests]
 
 
 class PipelineOrchestrator:
@@ -24,11 +131,18 @@ class PipelineOrchestrator:
         Args:
             config: Configuration dictionary containing:
                 - storage: input_dir, output_dir
-                - genai: provider, api_key, model
+                - genai: provider, api_key, model, rate_limits,
+                  circuit_breakers, retry_budgets, fallbacks, hedging,
+                  cassette, size_planning (optional)
                 - aspect_ratios: list of aspect ratios to generate
                 - text_overlay: font settings
                 - logging: level, file
                 - compliance: enabled, settings (optional)
+                - preview: enabled, scale, output_dir (optional)
+                - performance: parallel_processing, max_workers,
+                  process_compositing, compositing_workers, incremental,
+                  checkpoint, cache_enabled, cache_dir, cache_max_bytes,
+                  cache_ttl_seconds, coalesce_requests (optional)
         """
         self.config = config
         
@@ -39,31 +153,146 @@ class PipelineOrchestrator:
             level=log_config.get('level', 'INFO')
         )
         
+        # Preview mode: reduced-resolution drafts for creative review, kept
+        # apart from the final assets (see _preview_image)
+        preview_config = config.get('preview') or {}
+        self.preview = bool(preview_config.get('enabled', False))
+        self.preview_scale = min(1.0, max(0.05, float(preview_config.get('scale', 0.25))))
+        
         # Initialize components
         storage_config = config.get('storage', {})
+        output_dir = storage_config.get('output_dir', './output')
+        if self.preview:
+            output_dir = preview_config.get('output_dir') or str(Path(output_dir) / 'preview')
         self.asset_manager = AssetManager(
             input_dir=storage_config.get('input_dir', './input_assets'),
-            output_dir=storage_config.get('output_dir', './output')
+            output_dir=output_dir,
+            output_format='jpeg' if self.preview else 'png'
         )
         
         # Initialize GenAI client
         genai_config = config.get('genai', {})
-        self.genai_client = self._initialize_genai_client(genai_config)
+        for provider, limits in (genai_config.get('rate_limits') or {}).items():
+            configure_rate_limiter(provider, limits)
+        for provider, settings in (genai_config.get('circuit_breakers') or {}).items():
+            configure_circuit_breaker(provider, settings)
+        for provider, settings in (genai_config.get('retry_budgets') or {}).items():
+            configure_retry_budget(provider, settings)
+        cassette_config = genai_config.get('cassette') or {}
+        if cassette_config.get('mode') not in (None, 'record', 'replay'):
+            raise ValueError(f"Unsupported cassette mode: {cassette_config.get('mode')}")
+        if cassette_config.get('mode') == 'replay':
+            self.genai_client = self._initialize_replay(cassette_config)
+        else:
+            self.genai_client = self._initialize_genai_client(genai_config)
+            if self.genai_client and genai_config.get('fallbacks'):
+                self.genai_client = self._initialize_failover(self.genai_client, genai_config)
         
         # Initialize image compositor
         text_config = config.get('text_overlay', {})
-        self.compositor = ImageCompositor(
-            font_family=text_config.get('font_family', 'Arial'),
-            font_size=text_config.get('font_size', 48),
-            text_color=text_config.get('color', '#FFFFFF'),
-            text_position=text_config.get('position', 'bottom'),
-            padding=text_config.get('padding', 20),
-            background_opacity=text_config.get('background_opacity', 0.6)
-        )
+        self.compositor_settings = {
+            'font_family': text_config.get('font_family', 'Arial'),
+            'font_size': text_config.get('font_size', 48),
+            'text_color': text_config.get('color', '#FFFFFF'),
+            'text_position': text_config.get('position', 'bottom'),
+            'padding': text_config.get('padding', 20),
+            'background_opacity': text_config.get('background_opacity', 0.6)
+        }
+        self.compositor = ImageCompositor(**self.compositor_settings)
+        
+        # Everything besides the hero and message that shapes an output file
+        self.render_settings = {
+            **self.compositor_settings,
+            'compositor_version': COMPOSITOR_VERSION,
+            'format': 'png',
+            'optimize': True
+        }
+        if self.preview:
+            self.render_settings.update({'format': 'jpeg', 'optimize': False, 'preview_scale': self.preview_scale})
         
         # Get aspect ratios to generate
         self.aspect_ratios = config.get('aspect_ratios', ['1:1', '9:16', '16:9'])
         
+        # Concurrency settings for product processing
+        perf_config = config.get('performance', {})
+        self.parallel_processing = perf_config.get('parallel_processing', False)
+        self.max_workers = max(1, int(perf_config.get('max_workers', 4)))
+        
+        # Components whose stats() counters are reported per run, by metrics key
+        self._metered: Dict[str, Any] = {}
+        
+        # Caching and request coalescing layered around the provider client
+        self.genai_cache = None
+        if self.genai_client:
+            self.genai_client = self._wrap_genai_client(self.genai_client, perf_config)
+        
+        # Incremental rebuilds: skip outputs whose fingerprint is unchanged
+        self.incremental = perf_config.get('incremental', False)
+        self._manifests: Dict[str, BuildManifest] = {}
+        self._manifest_lock = threading.Lock()
+        
+        # Crash-safe checkpointing: journal completed work so --resume can skip
+        # it (opt-in; resumed runs always keep journaling)
+        self.checkpoint = perf_config.get('checkpoint', False)
+        self._journals: Dict[str, RunJournal] = {}
+        
+        # Stage timing spans of the runs in progress, keyed by campaign
+        self._timings: Dict[str, TimingRecorder] = {}
+        
+        # Missing heroes being batch-generated ahead of product processing,
+        # keyed by campaign
+        self._planned_heroes: Dict[str, _HeroBatch] = {}
+        
+        # Generation sizes that cover the aspect ratios with the most usable
+        # pixels; None generates one default-size hero per product
+        self.generation_plan: Optional[GenerationPlan] = None
+        planning_config = genai_config.get('size_planning') or {}
+        if self.genai_client and planning_config.get('enabled', False):
+            self.generation_plan = plan_generation_sizes(
+                self.aspect_ratios,
+                native_sizes=getattr(self.genai_client, 'native_sizes', None),
+                max_calls=planning_config.get('max_calls_per_product')
+            )
+            self.logger.info(
+                f"Generation sizes: {', '.join(f'{w}x{h}' for w, h in self.generation_plan.sizes)} "
+                f"({self.generation_plan.pixel_efficiency:.0%} pixel efficiency)"
+            )
+        
+        # Previews generate only the plan's cheapest size, which a later full
+        # run finds in the GenAI cache
+        if self.preview:
+            if self.generation_plan is not None:
+                cheapest = min(self.generation_plan.sizes, key=lambda size: size[0] * size[1])
+                self.generation_plan = GenerationPlan.single(self.aspect_ratios, cheapest)
+            if self.genai_client and self.genai_cache is None:
+                self.logger.warning("Preview generations are not cached; enable performance.cache_enabled "
+                                    "so full runs reuse them")
+            self.logger.info(
+                f"Preview mode: drafts at {self.preview_scale:.0%} resolution in {self.asset_manager.output_dir}"
+            )
+        
+        # Heroes generated at the plan's other sizes, by campaign, product
+        # and size, until the product's variants are cropped from them
+        self._extra_heroes: Dict[str, Dict[str, Dict[Tuple[int, int], Image.Image]]] = {}
+        
+        # Products whose heroes were generated in the runs in progress
+        self._generated_heroes: Dict[str, List[str]] = {}
+        
+        # Runs of one campaign share its output directory (journal, manifest,
+        # report) and the per-campaign state above, so they take turns
+        self._campaign_locks: Dict[str, threading.Lock] = {}
+        
+        # Optional process-pool compositing (crop, overlay, encode off the GIL);
+        # previews are cheap to encode and would wait for the pool to start
+        self.process_compositor = None
+        if perf_config.get('process_compositing', False) and not self.preview:
+            from src.compositors.process_compositor import ProcessCompositor
+            self.process_compositor = ProcessCompositor(
+                compositor_settings=self.compositor_settings,
+                max_workers=perf_config.get('compositing_workers')
+            )
+            self.logger.info("Process-pool compositing enabled")
+        
         # Compliance checker (optional)
         self.compliance_checker = None
         if config.get('compliance', {}).get('enabled', False):
@@ -93,6 +322,71 @@ class PipelineOrchestrator:
             except ImportError:
                 self.logger.warning("Compliance module not available")
     
+    def warm_up(self) -> None:
+        """Load fonts and start worker pools before the first brief arrives."""
+        self.compositor._load_font(self.compositor.base_font_size)
+        if self.process_compositor:
+            self.process_compositor.start()
+    
+    def close(self) -> None:
+        """Release worker pools held by the orchestrator."""
+        if self.process_compositor:
+            self.process_compositor.shutdown()
+    
+    def _wrap_genai_client(self, client: GenAIClient, perf_config: Dict[str, Any]) -> GenAIClient:
+        """
+        Layer caching and request coalescing around the provider client.
+        
+        Args:
+            client: Provider client
+            perf_config: Performance configuration
+        
+        Returns:
+            Client to use for generation
+        """
+        # Requests pass the provider's shared rate limiter (report its waits)
+        from src.clients.failover_client import FailoverGenAIClient
+        if isinstance(client, FailoverGenAIClient):
+            self._metered['genai_rate_limit'] = client.clients[0].rate_limiter
+            self._metered['genai_providers'] = client
+            providers = [provider.provider_name for provider in client.clients]
+        else:
+            self._metered['genai_rate_limit'] = client.rate_limiter
+            providers = [client.provider_name]
+        self._metered['genai_circuit_breakers'] = CircuitBreakerGroup(providers)
+        self._metered['genai_retry_budgets'] = RetryBudgetGroup(providers)
+        
+        # Offline replay of recorded responses, or recording of live ones
+        from src.clients.cassette_client import RecordingGenAIClient, ReplayGenAIClient
+        if isinstance(client, ReplayGenAIClient):
+            self._metered['genai_replay'] = client
+        cassette_config = self.config.get('genai', {}).get('cassette') or {}
+        if cassette_config.get('mode') == 'record':
+            from src.managers.cassette import Cassette
+            client = RecordingGenAIClient(client, Cassette(cassette_config.get('dir', './cassettes/default')))
+            self.logger.info(f"Recording GenAI responses to cassette: {client.cassette.cassette_dir}")
+        
+        # Optional on-disk cache of generated images
+        if perf_config.get('cache_enabled', False):
+            from src.clients.caching_client import CachingGenAIClient
+            self.genai_cache = GenAICache(
+                cache_dir=perf_config.get('cache_dir', './.cache/genai'),
+                max_bytes=int(perf_config.get('cache_max_bytes', 1024 ** 3)),
+                ttl_seconds=perf_config.get('cache_ttl_seconds')
+            )
+            client = CachingGenAIClient(client, self.genai_cache)
+            self._metered['genai_cache'] = self.genai_cache
+            self.logger.info(f"GenAI cache enabled: {self.genai_cache.cache_dir}")
+        
+        # Concurrent identical prompts share one call (outside the cache, so
+        # simultaneous misses for the same key also coalesce)
+        if perf_config.get('coalesce_requests', True):
+            from src.clients.coalescing_client import CoalescingGenAIClient
+            client = CoalescingGenAIClient(client)
+            self._metered['genai_coalescing'] = client
+        
+        return client
+    
     def _initialize_genai_client(self, genai_config: Dict[str, Any]) -> Optional[GenAIClient]:
         """
         Initialize the GenAI client based on configuration.
@@ -106,6 +400,25 @@ class PipelineOrchestrator:
         provider = genai_config.get('provider', 'openai').lower()
         api_key = genai_config.get('api_key')
         
+        if provider == 'local':
+            # Offline stand-in for load tests; needs no API key
+            from src.clients.local_client import LocalImageClient
+            image_size = genai_config.get('image_size')
+            return LocalImageClient(
+                latency=genai_config.get('latency_seconds', 0.0),
+                seed=genai_config.get('seed', 0),
+                image_size=tuple(image_size) if image_size else None,
+                response_format=genai_config.get('response_format'),
+                round_trip=genai_config.get('round_trip_seconds', 0.0),
+                latency_distribution=genai_config.get('latency_distribution', 'fixed'),
+                latency_spread=genai_config.get('latency_spread', 0.0),
+                failure_rate=genai_config.get('failure_rate', 0.0),
+                rate_limit_rate=genai_config.get('rate_limit_rate', 0.0),
+                retry_after=genai_config.get('retry_after_seconds'),
+                max_retries=genai_config.get('max_retries', 3),
+                retry_delay=genai_config.get('retry_delay', 1.0)
+            )
+        
         if not api_key:
             self.logger.warning("No GenAI API key configured - generation will fail if assets are missing")
             return None
@@ -113,7 +426,11 @@ class PipelineOrchestrator:
         if provider == 'openai':
             from src.clients.openai_client import OpenAIClient
             model = genai_config.get('model', 'dall-e-3')
-            return OpenAIClient(api_key=api_key, model=model)
+            return OpenAIClient(
+                api_key=api_key,
+                model=model,
+                response_format=genai_config.get('response_format', 'url')
+            )
         elif provider == 'imagen' or provider == 'google':
             from src.clients.gemini_client import ImagenClient
             model = genai_config.get('model', 'imagen-3.0-generate-001')
@@ -128,12 +445,83 @@ class PipelineOrchestrator:
         else:
             raise ValueError(f"Unsupported GenAI provider: {provider}")
     
-    def run(self, brief_path: str) -> PipelineResult:
+    def _initialize_replay(self, cassette_config: Dict[str, Any]) -> GenAIClient:
+        """
+        Initialize a client that replays a recorded cassette instead of calling a provider.
+        
+        Args:
+            cassette_config: Cassette configuration (dir, latency_scale, strict)
+        
+        Returns:
+            ReplayGenAIClient
+        
+        Raises:
+            ValueError: If the cassette has no recordings
+        """
+        from src.clients.cassette_client import ReplayGenAIClient
+        from src.managers.cassette import Cassette
+        
+        client = ReplayGenAIClient(
+            Cassette(cassette_config.get('dir', './cassettes/default')),
+            latency_scale=cassette_config.get('latency_scale', 1.0),
+            strict=cassette_config.get('strict', False)
+        )
+        self.logger.info(
+            f"Replaying GenAI responses from cassette: {client.cassette.cassette_dir} "
+            f"({len(client.cassette)} recorded calls)"
+        )
+        return client
+    
+    def _initialize_failover(self, primary: GenAIClient, genai_config: Dict[str, Any]) -> GenAIClient:
+        """
+        Combine the primary client with the configured fallback providers.
+        
+        Args:
+            primary: Client of the main provider
+            genai_config: GenAI configuration with fallbacks (a list of
+                provider configurations) and optional hedging settings
+        
+        Returns:
+            FailoverGenAIClient, or the primary client if no fallback could
+            be initialized
+        """
+        from src.clients.failover_client import FailoverGenAIClient
+        
+        clients = [primary]
+        for fallback_config in genai_config.get('fallbacks', []):
+            try:
+                client = self._initialize_genai_client(fallback_config)
+            except (ImportError, ValueError) as e:
+                self.logger.warning(f"Skipping fallback provider {fallback_config.get('provider')}: {str(e)}")
+                continue
+            if client:
+                clients.append(client)
+        
+        if len(clients) == 1:
+            return primary
+        
+        hedging = genai_config.get('hedging') or {}
+        failover = FailoverGenAIClient(
+            clients,
+            hedge=hedging.get('enabled', False),
+            hedge_percentile=hedging.get('percentile', 95),
+            hedge_min_delay=hedging.get('min_delay_seconds', 1.0),
+            hedge_initial_delay=hedging.get('initial_delay_seconds', 10.0)
+        )
+        self.logger.info(
+            f"GenAI providers: {' -> '.join(failover.names)}"
+            f"{' (hedged)' if failover.hedge else ''}"
+        )
+        return failover
+    
+    def run(self, brief_path: str, resume: bool = False) -> PipelineResult:
         """
         Execute the pipeline for a given campaign brief.
         
         Args:
             brief_path: Path to campaign brief file (JSON or YAML)
+            resume: Continue an interrupted run from the campaign's journal,
+                skipping heroes and outputs it already recorded
         
         Returns:
             PipelineResult containing execution details
@@ -141,9 +529,11 @@ class PipelineOrchestrator:
         start_time = datetime.now()
         errors = []
         outputs = []
+        metrics = {}
         
         self.logger.info(f"Starting pipeline execution for brief: {brief_path}")
         
+        campaign_lock = None
         try:
             # Parse campaign brief
             self.logger.info("Parsing campaign brief...")
@@ -155,24 +545,41 @@ class PipelineOrchestrator:
             
             self.logger.info(f"Processing campaign: {brief.campaign_id}")
             self.logger.info(f"Products to process: {len(brief.products)}")
+            campaign_lock = self._acquire_campaign(brief.campaign_id)
             
             # Process each product
-            for product in brief.products:
-                try:
-                    self.logger.info(f"Processing product: {product.product_id} ({product.name})")
-                    product_outputs = self._process_product(brief, product)
-                    outputs.extend(product_outputs)
-                    self.logger.log_operation(
-                        f"Product {product.product_id}",
-                        "success",
-                        {"assets_generated": len(product_outputs)}
-                    )
-                except Exception as e:
-                    error_msg = f"Failed to process product {product.product_id}: {str(e)}"
-                    self.logger.error(error_msg)
-                    errors.append(error_msg)
-                    # Continue processing other products
-                    continue
+            if self.incremental:
+                self._open_manifest(brief.campaign_id)
+            journaled = self.checkpoint or resume
+            if journaled:
+                self._open_journal(brief, resume)
+            timings = TimingRecorder()
+            self._timings[brief.campaign_id] = timings
+            self._generated_heroes[brief.campaign_id] = []
+            stats_before = {name: component.stats() for name, component in self._metered.items()}
+            try:
+                product_outputs, product_errors = self._process_products(brief, metrics)
+            finally:
+                plan = self._planned_heroes.pop(brief.campaign_id, None)
+                if plan is not None:
+                    plan.close()
+                self._timings.pop(brief.campaign_id, None)
+                self._extra_heroes.pop(brief.campaign_id, None)
+                generated = self._generated_heroes.pop(brief.campaign_id, [])
+                if generated:
+                    metrics['genai_size_plan'] = self._size_plan_metrics(len(generated))
+                for name, component in self._metered.items():
+                    if hasattr(component, 'flush'):
+                        component.flush()
+                    metrics[name] = self._stats_delta(component, stats_before[name], component.stats())
+                if journaled:
+                    self._close_journal(brief.campaign_id)
+                if self.incremental:
+                    self._close_manifest(brief.campaign_id)
+            outputs.extend(product_outputs)
+            errors.extend(product_errors)
+            if self.preview and outputs:
+                metrics['preview'] = self._write_contact_sheet(brief, outputs)
             
             # Calculate execution time
             end_time = datetime.now()
@@ -185,7 +592,9 @@ class PipelineOrchestrator:
                 outputs=outputs,
                 execution_time=execution_time,
                 success=success,
-                errors=errors
+                errors=errors,
+                metrics=metrics,
+                timings=timings.spans
             )
             
             # Generate report
@@ -219,6 +628,9 @@ class PipelineOrchestrator:
                 success=False,
                 errors=errors
             )
+        finally:
+            if campaign_lock is not None:
+                campaign_lock.release()
     
     def _validate_brief(self, brief: CampaignBrief) -> bool:
         """
@@ -245,6 +657,170 @@ class PipelineOrchestrator:
             self.logger.error(f"Brief validation failed: {str(e)}")
             return False
     
+    def _process_products(self, brief: CampaignBrief,
+                          metrics: Dict[str, Any]) -> Tuple[List[GeneratedAsset], List[str]]:
+        """
+        Process every product in the brief, sequentially or with a worker pool.
+        
+        Missing hero images are batch-generated in the background, just ahead
+        of the products that use them (see _plan_heroes). Each product is isolated: a failure is recorded as an
+        error and the remaining products still run. Outputs are always
+        returned in brief order regardless of the order in which workers
+        finish.
+        
+        Args:
+            brief: CampaignBrief containing the products to process
+            metrics: Run metrics dictionary that engines may populate
+        
+        Returns:
+            Tuple of (outputs, errors)
+        """
+        products = brief.products
+        workers = min(self.max_workers, len(products))
+        parallel = self.parallel_processing and workers > 1
+        self._plan_heroes(brief, metrics, workers if parallel else 1)
+        
+        if parallel:
+            self.logger.info(f"Processing products in parallel with {workers} workers")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="product") as executor:
+                results = list(executor.map(
+                    lambda product: self._run_product(brief, product), products
+                ))
+        else:
+            results = [self._run_product(brief, product) for product in products]
+        
+        outputs = []
+        errors = []
+        for product_outputs, error in results:
+            outputs.extend(product_outputs)
+            if error:
+                errors.append(error)
+        
+        return outputs, errors
+    
+    def _plan_heroes(self, brief: CampaignBrief, metrics: Dict[str, Any], workers: int) -> None:
+        """
+        Start batch-generating the heroes of products that have no source.
+        
+        Products with an input asset or a journaled hero are only probed
+        here, without decoding; they load lazily when processed. The missing
+        heroes are submitted through the client's generate_images(), one
+        call per prompt, on a background _HeroBatch that runs just ahead of
+        product processing so that compositing overlaps generation, and each
+        product takes its images in _acquire_hero_image(). Products already
+        complete in the run journal are skipped. Duck-typed clients without
+        the batch API keep generating one product at a time.
+        
+        Args:
+            brief: CampaignBrief containing the products to process
+            metrics: Run metrics dictionary; receives genai_batch counts
+            workers: Provider calls allowed at once
+        """
+        if not isinstance(self.genai_client, GenAIClient):
+            return
+        
+        missing = [
+            product for product in brief.products
+            if self._journaled_outputs(brief, product) is None
+            and not self._has_hero_source(brief, product)
+        ]
+        if not missing:
+            return
+        
+        # One group per prompt, holding a request per product and planned size
+        sizes = self._generation_sizes()
+        groups: Dict[str, List[str]] = {}
+        for product in missing:
+            prompt = self._build_generation_prompt(brief, product)
+            groups.setdefault(prompt, []).append(product.product_id)
+        plan = _HeroBatch(
+            self.genai_client,
+            [
+                (product_ids, [ImageRequest(prompt, size) for _ in product_ids for size in sizes])
+                for prompt, product_ids in groups.items()
+            ],
+            {product.product_id: index for index, product in enumerate(brief.products)},
+            len(sizes),
+            workers
+        )
+        self._planned_heroes[brief.campaign_id] = plan
+        self.logger.info(
+            f"Generating {plan.metrics['requests']} hero images in "
+            f"{plan.metrics['planned_calls']} provider calls"
+        )
+        metrics['genai_batch'] = plan.metrics
+    
+    def _has_hero_source(self, brief: CampaignBrief, product) -> bool:
+        """Whether a product's hero can be loaded rather than generated; nothing is decoded."""
+        journal = self._journals.get(brief.campaign_id)
+        if journal is not None:
+            keys = [product.product_id] + [
+                self._extra_hero_key(product.product_id, size)
+                for size in self._generation_sizes()[1:]
+            ]
+            if all(journal.has_hero(key) for key in keys):
+                return True
+        return self.asset_manager.has_asset(product.product_id)
+    
+    def _take_planned_hero(self, brief: CampaignBrief, product,
+                           plan: _HeroBatch) -> Optional[Image.Image]:
+        """
+        Wait for a product's batch-generated heroes and keep them.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product about to be processed
+            plan: The run's hero batch
+        
+        Returns:
+            Hero image, or None if the product was not in the batch
+        
+        Raises:
+            Exception: If the product's generation failed
+        """
+        results = plan.take(product.product_id)
+        if results is None:
+            return None
+        timings = self._timings.get(brief.campaign_id)
+        if timings is not None:
+            timings.record('generate', product.product_id, None,
+                           sum(result.seconds for result in results))
+        failed = next((result for result in results if not result.ok), None)
+        if failed is not None:
+            raise Exception(failed.error)
+        
+        hero_image = results[0].image
+        self._keep_extra_heroes(brief, product, {
+            result.request.size: result.image for result in results[1:]
+        })
+        self._on_hero_generated(brief, product, hero_image)
+        return hero_image
+    
+    def _run_product(self, brief: CampaignBrief, product) -> Tuple[List[GeneratedAsset], Optional[str]]:
+        """
+        Process one product, converting any failure into an error message.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to process
+        
+        Returns:
+            Tuple of (outputs, error message or None)
+        """
+        try:
+            self.logger.info(f"Processing product: {product.product_id} ({product.name})")
+            product_outputs = self._process_product(brief, product)
+            self.logger.log_operation(
+                f"Product {product.product_id}",
+                "success",
+                {"assets_generated": len(product_outputs)}
+            )
+            return product_outputs, None
+        except Exception as e:
+            error_msg = f"Failed to process product {product.product_id}: {str(e)}"
+            self.logger.error(error_msg)
+            return [], error_msg
+    
     def _process_product(self, brief: CampaignBrief, product) -> list:
         """
         Process a single product through the pipeline.
@@ -259,12 +835,158 @@ class PipelineOrchestrator:
         Raises:
             Exception: If processing fails
         """
-        outputs = []
+        resumed = self._resumed_outputs(brief, product)
+        if resumed is not None:
+            return resumed
+        
+        hero_image, was_generated = self._acquire_hero_image(brief, product)
+        return self._composite_product(brief, product, hero_image, was_generated)
+    
+    def _acquire_hero_image(self, brief: CampaignBrief, product) -> Tuple[Image.Image, bool]:
+        """
+        Load the product's existing asset or generate a new one.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to look up
+        
+        Returns:
+            Tuple of (hero image, was_generated)
+        
+        Raises:
+            Exception: If no asset exists and generation is unavailable or fails
+        """
+        plan = self._planned_heroes.get(brief.campaign_id)
+        if plan is not None:
+            hero_image = self._take_planned_hero(brief, product, plan)
+            if hero_image is not None:
+                return hero_image, True
+        
+        hero_image, was_generated = self._lookup_hero_image(brief, product)
+        if hero_image:
+            return hero_image, was_generated
+        
+        # Generate new asset using GenAI
+        prompt = self._build_generation_prompt(brief, product)
+        with self._timed(brief, 'generate', product.product_id):
+            hero_image = self._generate_hero(brief, product, prompt)
+        self._on_hero_generated(brief, product, hero_image)
+        return hero_image, True
+    
+    def _generation_sizes(self) -> List[Tuple[int, int]]:
+        """Sizes generated per product; the first is the hero image's."""
+        if self.generation_plan is None:
+            return [DEFAULT_GENERATION_SIZE]
+        return self.generation_plan.sizes
+    
+    def _generate_hero(self, brief: CampaignBrief, product, prompt: str) -> Image.Image:
+        """
+        Generate a product's hero image at every planned size.
+        
+        Without size planning this is one default-size generate_image()
+        call. With it, the image of the plan's first size is returned and
+        the others are kept for _variant_sources().
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to generate for
+            prompt: Generation prompt
+        
+        Returns:
+            Hero image
+        """
+        if self.generation_plan is None:
+            return self.genai_client.generate_image(prompt)
+        
+        sizes = self.generation_plan.sizes
+        images = [self.genai_client.generate_image(prompt, size) for size in sizes]
+        self._keep_extra_heroes(brief, product, dict(zip(sizes[1:], images[1:])))
+        return images[0]
+    
+    def _keep_extra_heroes(self, brief: CampaignBrief, product,
+                           extras: Dict[Tuple[int, int], Image.Image]) -> None:
+        """Hold a product's heroes of the plan's other sizes until its variants are cropped."""
+        if extras:
+            self._extra_heroes.setdefault(brief.campaign_id, {})[product.product_id] = extras
+    
+    def _variant_sources(self, brief: CampaignBrief, product,
+                         hero_image: Image.Image) -> Dict[str, Image.Image]:
+        """
+        Return the image each aspect ratio variant is cropped from.
+        
+        Variants whose planned size was generated separately use that
+        image; all others (and every variant of a product whose hero was
+        not generated) use the hero image. The product's extra heroes are
+        released.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product being processed
+            hero_image: The product's hero image
+        
+        Returns:
+            Source image per aspect ratio
+        """
+        extras = self._extra_heroes.get(brief.campaign_id, {}).pop(product.product_id, {})
+        return {
+            aspect_ratio: extras.get(self.generation_plan.sources.get(aspect_ratio), hero_image)
+            if extras else hero_image
+            for aspect_ratio in self.aspect_ratios
+        }
+    
+    @staticmethod
+    def _extra_hero_key(product_id: str, size: Tuple[int, int]) -> str:
+        """Run journal key of a hero generated at one of the plan's other sizes."""
+        return f"{product_id}@{size[0]}x{size[1]}"
+    
+    def _restore_extra_heroes(self, brief: CampaignBrief, journal: RunJournal, product) -> bool:
+        """
+        Load a product's journaled extra heroes.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            journal: The campaign's run journal
+            product: Product whose hero was journaled
+        
+        Returns:
+            True if every planned size was restored (always, without extra
+            sizes); False if any is missing and the hero must be regenerated
+        """
+        extras = {}
+        for size in self._generation_sizes()[1:]:
+            image = journal.get_hero(self._extra_hero_key(product.product_id, size))
+            if image is None:
+                return False
+            extras[size] = image
+        self._keep_extra_heroes(brief, product, extras)
+        return True
+    
+    def _lookup_hero_image(self, brief: CampaignBrief, product) -> Tuple[Optional[Image.Image], bool]:
+        """
+        Check the run journal and input assets for an existing hero image.
         
-        # Step 1: Check for existing asset or generate new one
-        self.logger.info(f"Checking for existing asset: {product.product_id}")
-        hero_image = self.asset_manager.get_asset(product.product_id)
-        was_generated = False
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to look up
+        
+        Returns:
+            Tuple of (PIL Image or None if nothing exists, was_generated);
+            was_generated is True for a hero generated by an earlier attempt
+            of this run
+        """
+        with self._timed(brief, 'lookup', product.product_id):
+            journal = self._journals.get(brief.campaign_id)
+            hero_image = journal.get_hero(product.product_id) if journal else None
+            if hero_image and self._restore_extra_heroes(brief, journal, product):
+                self.logger.log_operation(
+                    f"Asset for {product.product_id}",
+                    "reused",
+                    {"source": "checkpoint"}
+                )
+                return hero_image, True
+            
+            self.logger.info(f"Checking for existing asset: {product.product_id}")
+            hero_image = self.asset_manager.get_asset(product.product_id)
         
         if hero_image:
             self.logger.log_operation(
@@ -272,74 +994,163 @@ class PipelineOrchestrator:
                 "reused",
                 {"source": "input_assets"}
             )
-        else:
-            # Generate new asset using GenAI
-            self.logger.info(f"No existing asset found, generating with GenAI...")
-            
-            if not self.genai_client:
-                raise Exception("GenAI client not configured - cannot generate missing asset")
-            
-            # Build prompt
-            prompt = self.genai_client._build_prompt(
-                product_name=product.name,
-                audience=brief.target_audience,
-                region=brief.target_region
-            )
-            
-            self.logger.debug(f"Generation prompt: {prompt}")
-            
-            # Generate image
-            hero_image = self.genai_client.generate_image(prompt)
-            was_generated = True
-            
-            self.logger.log_operation(
-                f"Asset for {product.product_id}",
-                "generated",
-                {"provider": self.config.get('genai', {}).get('provider', 'openai')}
-            )
+        return hero_image, False
+    
+    def _build_generation_prompt(self, brief: CampaignBrief, product) -> str:
+        """
+        Build the GenAI prompt for a product without an input asset.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product to generate an image for
+        
+        Returns:
+            Generation prompt
+        
+        Raises:
+            Exception: If no GenAI client is configured
+        """
+        self.logger.info(f"No existing asset found, generating with GenAI...")
+        
+        if not self.genai_client:
+            raise Exception("GenAI client not configured - cannot generate missing asset")
+        
+        # Build prompt
+        prompt = self.genai_client._build_prompt(
+            product_name=product.name,
+            audience=brief.target_audience,
+            region=brief.target_region
+        )
+        
+        self.logger.debug(f"Generation prompt: {prompt}")
+        return prompt
+    
+    def _on_hero_generated(self, brief: CampaignBrief, product, hero_image: Image.Image) -> None:
+        """Log a generated hero image and checkpoint it in the run journal."""
+        self.logger.log_operation(
+            f"Asset for {product.product_id}",
+            "generated",
+            {"provider": self.config.get('genai', {}).get('provider', 'openai')}
+        )
+        
+        generated = self._generated_heroes.get(brief.campaign_id)
+        if generated is not None:
+            generated.append(product.product_id)
+        
+        journal = self._journals.get(brief.campaign_id)
+        if journal:
+            # Extra sizes first: a hero journaled without them is regenerated
+            extras = self._extra_heroes.get(brief.campaign_id, {}).get(product.product_id, {})
+            for size, image in extras.items():
+                journal.record_hero(self._extra_hero_key(product.product_id, size), image)
+            journal.record_hero(product.product_id, hero_image)
+    
+    def _resumed_outputs(self, brief: CampaignBrief, product) -> Optional[List[GeneratedAsset]]:
+        """
+        Return a product's outputs if the run journal already has all of them.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product being processed
+        
+        Returns:
+            List of GeneratedAsset objects in aspect ratio order, or None if
+            any output still has to be produced
+        """
+        outputs = self._journaled_outputs(brief, product)
+        if outputs is not None:
+            self.logger.info(f"Resumed from checkpoint: {product.product_id}")
+        return outputs
+    
+    def _journaled_outputs(self, brief: CampaignBrief, product) -> Optional[List[GeneratedAsset]]:
+        """Return a product's journaled outputs if all of them exist (see _resumed_outputs)."""
+        journal = self._journals.get(brief.campaign_id)
+        if journal is None:
+            return None
+        
+        outputs = []
+        for aspect_ratio in self.aspect_ratios:
+            asset = journal.get_unit(product.product_id, aspect_ratio)
+            if asset is None:
+                return None
+            outputs.append(asset)
+        return outputs
+    
+    def _record_unit(self, brief: CampaignBrief, asset: GeneratedAsset) -> None:
+        """Record a finished output in the campaign's run journal."""
+        journal = self._journals.get(brief.campaign_id)
+        if journal:
+            journal.record_unit(asset)
+    
+    def _composite_product(self, brief: CampaignBrief, product, hero_image: Image.Image,
+                           was_generated: bool) -> list:
+        """
+        Create, check and save every aspect ratio variant for a product.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product being processed
+            hero_image: Source image for all variants
+            was_generated: Whether the hero image came from GenAI
+        
+        Returns:
+            List of GeneratedAsset objects
+        """
+        outputs = []
         
         # Step 2: Create aspect ratio variants
         self.logger.info(f"Creating aspect ratio variants: {', '.join(self.aspect_ratios)}")
-        variants = self.compositor.create_variants(hero_image, self.aspect_ratios)
         
         # Step 3: Apply text overlay to each variant
-        campaign_message = brief.campaign_message
-        if brief.localization and brief.localization.region_specific_message:
-            campaign_message = brief.localization.region_specific_message
+        campaign_message = self._campaign_message(brief)
         
         self.logger.info(f"Applying text overlay: '{campaign_message}'")
         
-        for aspect_ratio, variant_image in variants.items():
-            # Add text overlay
-            final_image = self.compositor.add_text_overlay(variant_image, campaign_message)
+        journal = self._journals.get(brief.campaign_id)
+        resumed = {}
+        if journal:
+            for aspect_ratio in self.aspect_ratios:
+                asset = journal.get_unit(product.product_id, aspect_ratio)
+                if asset:
+                    resumed[aspect_ratio] = asset
+        
+        sources = self._variant_sources(brief, product, hero_image)
+        fingerprints, up_to_date = self._find_up_to_date(brief, product, sources, campaign_message)
+        stale_ratios = [
+            ratio for ratio in self.aspect_ratios
+            if ratio not in up_to_date and ratio not in resumed
+        ]
+        
+        rendered = {}
+        if stale_ratios:
+            for aspect_ratio, file_path, final_image in self._render_variants(
+                brief, product, sources, campaign_message, stale_ratios
+            ):
+                rendered[aspect_ratio] = (file_path, final_image)
+                if aspect_ratio in fingerprints:
+                    self._record_build(brief, product, aspect_ratio, fingerprints[aspect_ratio], file_path)
+        
+        for aspect_ratio in self.aspect_ratios:
+            if aspect_ratio in resumed:
+                outputs.append(resumed[aspect_ratio])
+                self.logger.info(f"Resumed from checkpoint: {resumed[aspect_ratio].file_path}")
+                continue
             
-            # Step 4: Save output
-            file_path = self.asset_manager.save_asset(
-                campaign_id=brief.campaign_id,
-                product_id=product.product_id,
-                aspect_ratio=aspect_ratio.replace(':', 'x'),
-                image=final_image
-            )
+            is_up_to_date = aspect_ratio in up_to_date
+            if is_up_to_date:
+                file_path, final_image = up_to_date[aspect_ratio], None
+            else:
+                file_path, final_image = rendered[aspect_ratio]
             
             # Step 5: Optional compliance check
             compliance_status = None
             if self.compliance_checker:
-                try:
-                    compliance_status = self.compliance_checker.check_brand_compliance(final_image)
-                    legal_status = self.compliance_checker.check_legal_compliance(campaign_message)
-                    
-                    # Combine results
-                    if not legal_status.passed:
-                        compliance_status.passed = False
-                        compliance_status.violations.extend(legal_status.violations)
-                    
-                    self.logger.log_operation(
-                        f"Compliance check for {product.product_id} ({aspect_ratio})",
-                        "passed" if compliance_status.passed else "failed",
-                        {"violations": len(compliance_status.violations)}
+                with self._timed(brief, 'compliance', product.product_id, aspect_ratio):
+                    if final_image is None:
+                        final_image = Image.open(file_path)
+                    compliance_status = self._check_compliance(
+                        product, aspect_ratio, final_image, campaign_message
                     )
-                except Exception as e:
-                    self.logger.warning(f"Compliance check failed: {str(e)}")
             
             # Create GeneratedAsset record
             asset = GeneratedAsset(
@@ -347,10 +1158,379 @@ class PipelineOrchestrator:
                 aspect_ratio=aspect_ratio,
                 file_path=file_path,
                 was_generated=was_generated,
-                compliance_status=compliance_status
+                compliance_status=compliance_status,
+                up_to_date=is_up_to_date
             )
             outputs.append(asset)
+            self._record_unit(brief, asset)
             
-            self.logger.info(f"Saved: {file_path}")
+            if is_up_to_date:
+                self.logger.info(f"Up-to-date: {file_path}")
+            else:
+                self.logger.info(f"Saved: {file_path}")
         
         return outputs
+    
+    def _acquire_campaign(self, campaign_id: str) -> threading.Lock:
+        """
+        Wait until no other run of the campaign is in progress.
+        
+        Args:
+            campaign_id: Campaign about to run
+        
+        Returns:
+            The campaign's lock, held by the caller until the run ends
+        """
+        with self._manifest_lock:
+            lock = self._campaign_locks.setdefault(campaign_id, threading.Lock())
+        if not lock.acquire(blocking=False):
+            self.logger.info(f"Waiting for another run of campaign {campaign_id} to finish")
+            lock.acquire()
+        return lock
+    
+    def _open_manifest(self, campaign_id: str) -> BuildManifest:
+        """Load the campaign's build manifest for the current run."""
+        manifest = BuildManifest(str(Path(self.asset_manager.output_dir) / campaign_id / "manifest.json"))
+        with self._manifest_lock:
+            self._manifests[campaign_id] = manifest
+        return manifest
+    
+    def _close_manifest(self, campaign_id: str) -> None:
+        """Persist and release the campaign's build manifest."""
+        with self._manifest_lock:
+            manifest = self._manifests.pop(campaign_id, None)
+        if manifest:
+            manifest.save()
+    
+    def _preview_image(self, image: Image.Image) -> Image.Image:
+        """
+        Scale a finished variant down to preview resolution (as is outside preview mode).
+        
+        Variants are composited at full size first, so the message wraps
+        and sizes exactly as it will in the final asset.
+        
+        Args:
+            image: Composited variant
+        
+        Returns:
+            Image to save
+        """
+        if not self.preview:
+            return image
+        width, height = image.size
+        size = (max(1, round(width * self.preview_scale)), max(1, round(height * self.preview_scale)))
+        return image.resize(size, Image.Resampling.BILINEAR)
+    
+    def _write_contact_sheet(self, brief: CampaignBrief, outputs: List[GeneratedAsset]) -> Dict[str, Any]:
+        """
+        Lay out a preview run's variants on one sheet per campaign.
+        
+        Args:
+            brief: CampaignBrief of the run
+            outputs: Preview outputs, in brief and aspect ratio order
+        
+        Returns:
+            Metrics dictionary: contact_sheet path, preview scale and the
+            number of variants shown
+        """
+        rows: Dict[str, List[Tuple[str, Image.Image]]] = {}
+        for asset in outputs:
+            with Image.open(asset.file_path) as image:
+                rows.setdefault(asset.product_id, []).append((asset.aspect_ratio, image.copy()))
+        
+        names = {product.product_id: product.name for product in brief.products}
+        sheet = self.compositor.create_contact_sheet(
+            [(f"{names.get(product_id, product_id)} ({product_id})", cells) for product_id, cells in rows.items()],
+            title=f"{brief.campaign_id}: {self._campaign_message(brief)}"
+        )
+        path = Path(self.asset_manager.output_dir) / brief.campaign_id / "contact_sheet.jpg"
+        sheet.save(path, format='JPEG', quality=85)
+        self.logger.info(f"Contact sheet: {path}")
+        return {
+            "contact_sheet": str(path),
+            "scale": self.preview_scale,
+            "variants": len(outputs)
+        }
+    
+    def _size_plan_metrics(self, products: int) -> Dict[str, Any]:
+        """
+        Describe the generation sizes used this run and their pixel efficiency.
+        
+        Args:
+            products: Products whose heroes were generated
+        
+        Returns:
+            Metrics dictionary: the plan (see GenerationPlan.as_dict), whether
+            size planning was enabled, and the products and images generated
+        """
+        plan = self.generation_plan or GenerationPlan.single(self.aspect_ratios)
+        return {
+            "enabled": self.generation_plan is not None,
+            **plan.as_dict(),
+            "products": products,
+            "images": products * plan.calls
+        }
+    
+    @staticmethod
+    def _stats_delta(component: Any, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarise a component's activity during one run.
+        
+        Counters are reported as the change over the run; names listed in
+        the component's STATS_GAUGES (and non-numeric values) are reported
+        as they are at the end of the run. Lists (e.g., event histories)
+        keep only the items added during the run. Nested dictionaries are
+        summarised the same way. The components are shared by every run
+        in the process, so the change includes the activity of briefs
+        running at the same time.
+        
+        Args:
+            component: Component that produced the stats
+            before: Stats at the start of the run
+            after: Stats at the end of the run
+        
+        Returns:
+            Per-run metrics dictionary
+        """
+        gauges = getattr(component, 'STATS_GAUGES', ())
+        metrics = {}
+        for name, value in after.items():
+            if isinstance(value, dict):
+                # Nested groups (e.g., per provider) follow the same rules
+                metrics[name] = PipelineOrchestrator._stats_delta(component, before.get(name) or {}, value)
+            elif isinstance(value, list):
+                earlier = before.get(name) or []
+                metrics[name] = [item for item in value if item not in earlier]
+            elif name in gauges or isinstance(value, bool) or not isinstance(value, (int, float)):
+                metrics[name] = value
+            else:
+                metrics[name] = value - before.get(name, 0)
+        
+        if 'hits' in metrics and 'misses' in metrics:
+            lookups = metrics['hits'] + metrics['misses']
+            metrics['hit_rate'] = round(metrics['hits'] / lookups, 4) if lookups else None
+        return metrics
+    
+    def _timed(self, brief: CampaignBrief, stage: str, product_id: str,
+               aspect_ratio: Optional[str] = None) -> ContextManager:
+        """
+        Time a block of work as one span of the current run.
+        
+        Args:
+            brief: CampaignBrief of the run
+            stage: Stage name
+            product_id: Product the work belongs to
+            aspect_ratio: Aspect ratio, or None for per-product stages
+        
+        Returns:
+            Context manager recording the span (a no-op outside run())
+        """
+        timings = self._timings.get(brief.campaign_id)
+        if timings is None:
+            return nullcontext()
+        return timings.span(stage, product_id, aspect_ratio)
+    
+    def _open_journal(self, brief: CampaignBrief, resume: bool) -> RunJournal:
+        """Open the campaign's run journal, continuing it when resuming the same brief and settings."""
+        journal = RunJournal(str(Path(self.asset_manager.output_dir) / brief.campaign_id))
+        if journal.start(resume=resume, fingerprint=self._run_fingerprint(brief)):
+            self.logger.info(f"Resuming run: {journal.completed_units} outputs already completed")
+        elif resume:
+            self.logger.warning("No checkpoint journal for this brief and configuration; starting a fresh run")
+        with self._manifest_lock:
+            self._journals[brief.campaign_id] = journal
+        return journal
+    
+    def _run_fingerprint(self, brief: CampaignBrief) -> str:
+        """Fingerprint the brief and the settings that shape journaled heroes and outputs."""
+        return compute_run_fingerprint(brief, {
+            'aspect_ratios': self.aspect_ratios,
+            'render': self.render_settings,
+            'generator': [getattr(self.genai_client, 'provider_name', None),
+                          getattr(self.genai_client, 'model_id', None)],
+            'generation_sizes': self._generation_sizes()
+        })
+    
+    def _close_journal(self, campaign_id: str) -> None:
+        """Close and release the campaign's run journal."""
+        with self._manifest_lock:
+            journal = self._journals.pop(campaign_id, None)
+        if journal:
+            journal.close()
+    
+    def _find_up_to_date(self, brief: CampaignBrief, product, sources: Dict[str, Image.Image],
+                         campaign_message: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Fingerprint a product's outputs and find those that need no rebuild.
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product being processed
+            sources: Source image per aspect ratio (see _variant_sources)
+            campaign_message: Text to overlay
+        
+        Returns:
+            Tuple of (fingerprint per aspect ratio, existing file path per
+            up-to-date aspect ratio); both empty when incremental builds are off
+        """
+        manifest = self._manifests.get(brief.campaign_id) if self.incremental else None
+        if manifest is None:
+            return {}, {}
+        
+        # Variants usually share a source; hash each image once
+        source_hashes = {}
+        fingerprints = {}
+        up_to_date = {}
+        for aspect_ratio in self.aspect_ratios:
+            source = sources[aspect_ratio]
+            if id(source) not in source_hashes:
+                source_hashes[id(source)] = hash_image(source)
+            fingerprint = compute_fingerprint(
+                source_hashes[id(source)], aspect_ratio, campaign_message, self.render_settings
+            )
+            fingerprints[aspect_ratio] = fingerprint
+            existing = manifest.is_up_to_date(BuildManifest.key(product.product_id, aspect_ratio), fingerprint)
+            if existing:
+                up_to_date[aspect_ratio] = existing
+        
+        return fingerprints, up_to_date
+    
+    def _record_build(self, brief: CampaignBrief, product, aspect_ratio: str,
+                      fingerprint: str, file_path: str) -> None:
+        """Record a freshly built output in the campaign's manifest."""
+        manifest = self._manifests.get(brief.campaign_id)
+        if manifest:
+            manifest.record(BuildManifest.key(product.product_id, aspect_ratio), fingerprint, file_path)
+    
+    def _campaign_message(self, brief: CampaignBrief) -> str:
+        """Return the overlay message, preferring the localized variant."""
+        if brief.localization and brief.localization.region_specific_message:
+            return brief.localization.region_specific_message
+        return brief.campaign_message
+    
+    def _check_compliance(self, product, aspect_ratio: str, final_image: Image.Image,
+                          campaign_message: str) -> Optional[ComplianceResult]:
+        """
+        Run brand and legal compliance checks for one output.
+        
+        Args:
+            product: Product the output belongs to
+            aspect_ratio: Aspect ratio of the output
+            final_image: Composited image to check
+            campaign_message: Overlay text to check
+        
+        Returns:
+            Combined ComplianceResult, or None if the check itself failed
+        """
+        try:
+            compliance_status = self.compliance_checker.check_brand_compliance(final_image)
+            legal_status = self.compliance_checker.check_legal_compliance(campaign_message)
+            
+            # Combine results
+            if not legal_status.passed:
+                compliance_status.passed = False
+                compliance_status.violations.extend(legal_status.violations)
+            
+            self.logger.log_operation(
+                f"Compliance check for {product.product_id} ({aspect_ratio})",
+                "passed" if compliance_status.passed else "failed",
+                {"violations": len(compliance_status.violations)}
+            )
+            return compliance_status
+        except Exception as e:
+            self.logger.warning(f"Compliance check failed: {str(e)}")
+            return None
+    
+    def _render_variants(self, brief: CampaignBrief, product, sources: Dict[str, Image.Image],
+                         campaign_message: str,
+                         aspect_ratios: List[str]) -> List[Tuple[str, str, Optional[Image.Image]]]:
+        """
+        Crop, overlay and save aspect ratio variants of a product's hero images.
+        
+        With process compositing enabled the work runs in worker processes
+        and the final images are not returned (only their file paths).
+        
+        Args:
+            brief: CampaignBrief containing campaign details
+            product: Product being processed
+            sources: Source image per aspect ratio (see _variant_sources)
+            campaign_message: Text to overlay
+            aspect_ratios: Aspect ratios to render
+        
+        Returns:
+            List of (aspect_ratio, file_path, final_image or None) tuples
+        """
+        if self.process_compositor:
+            output_paths = {
+                aspect_ratio: str(self.asset_manager.get_output_path(
+                    brief.campaign_id, product.product_id, aspect_ratio.replace(':', 'x')
+                ))
+                for aspect_ratio in aspect_ratios
+            }
+            # One worker submission per source image
+            groups: Dict[int, List[str]] = {}
+            for aspect_ratio in aspect_ratios:
+                groups.setdefault(id(sources[aspect_ratio]), []).append(aspect_ratio)
+            stage_seconds = {}
+            saved = {}
+            for group in groups.values():
+                saved.update(self.process_compositor.render_variants(
+                    sources[group[0]], group, campaign_message, output_paths, timings=stage_seconds
+                ))
+            timings = self._timings.get(brief.campaign_id)
+            if timings:
+                for aspect_ratio, seconds_by_stage in stage_seconds.items():
+                    for stage, seconds in seconds_by_stage.items():
+                        timings.record(stage, product.product_id, aspect_ratio, seconds)
+            return [(aspect_ratio, file_path, None) for aspect_ratio, file_path in saved.items()]
+        
+        rendered = []
+        for aspect_ratio in aspect_ratios:
+            # Crop each ratio separately so every unit gets its own span
+            with self._timed(brief, 'crop', product.product_id, aspect_ratio):
+                variant_image = self.compositor.create_variants(sources[aspect_ratio], [aspect_ratio])[aspect_ratio]
+            
+            # Add text overlay
+            with self._timed(brief, 'overlay', product.product_id, aspect_ratio):
+                final_image = self.compositor.add_text_overlay(variant_image, campaign_message)
+            
+            # Step 4: Save output
+            with self._timed(brief, 'save', product.product_id, aspect_ratio):
+                final_image = self._preview_image(final_image)
+                file_path = self.asset_manager.save_asset(
+                    campaign_id=brief.campaign_id,
+                    product_id=product.product_id,
+                    aspect_ratio=aspect_ratio.replace(':', 'x'),
+                    image=final_image
+                )
+            rendered.append((aspect_ratio, file_path, final_image))
+        
+        return rendered
+
+
+def create_orchestrator(config: Dict[str, Any]) -> PipelineOrchestrator:
+    """
+    Build the orchestrator selected by performance.engine.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        PipelineOrchestrator (engine "sync"), AsyncPipelineOrchestrator
+        (engine "async") or StreamingPipelineOrchestrator (engine "streaming")
+    
+    Raises:
+        ValueError: If the engine name is not recognised
+    """
+    engine = str(config.get('performance', {}).get('engine', 'sync')).lower()
+    
+    if engine == 'sync':
+        return PipelineOrchestrator(config)
+    elif engine == 'async':
+        from src.async_orchestrator import AsyncPipelineOrchestrator
+        return AsyncPipelineOrchestrator(config)
+    elif engine == 'streaming':
+        from src.streaming_orchestrator import StreamingPipelineOrchestrator
+        return StreamingPipelineOrchestrator(config)
+    else:
+        raise ValueError(f"Unsupported pipeline engine: {engine}")
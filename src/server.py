@@ -0,0 +1,428 @@
+"""Long-running pipeline server with a local HTTP submission API."""
+
+import json
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models import PipelineResult
+from src.orchestrator import PipelineOrchestrator
+
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+TERMINAL_STATUSES = {JOB_SUCCEEDED, JOB_FAILED}
+
+# Finished jobs kept for status queries before the oldest are forgotten
+MAX_JOB_HISTORY = 1000
+
+# Tells a worker thread to exit
+_STOP = object()
+
+
+class ServerUnavailableError(Exception):
+    """Raised when a job cannot be accepted (queue full or server draining)."""
+
+
+@dataclass
+class Job:
+    """A brief submitted to the server and its progress."""
+    job_id: str
+    brief_path: str
+    resume: bool = False
+    staged: bool = False  # brief_path was written by the server and is deleted when the job ends
+    status: str = JOB_QUEUED
+    submitted_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise the job for API responses."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "brief_path": self.brief_path,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result
+        }
+
+
+class PipelineServer:
+    """
+    Daemon that keeps one orchestrator warm and runs briefs from a job queue.
+    
+    Briefs are submitted over HTTP and queued; a fixed number of worker
+    threads run them on the shared orchestrator, so GenAI clients, fonts,
+    compliance templates and compositing processes are set up once.
+    Submissions beyond the queue capacity are rejected with 503 rather
+    than buffered without limit. shutdown(drain=True) stops accepting new
+    jobs and finishes every queued and running one before returning.
+    
+    Endpoints:
+        POST /jobs              Submit a brief ({"brief": {...}} or
+                                {"brief_path": "..."}, optional "resume")
+        GET  /jobs              List known jobs
+        GET  /jobs/<id>         Job status and result
+        GET  /jobs/<id>/events  Stream status changes (not per-product
+                                progress) as JSON lines until the job
+                                finishes
+        GET  /health            Queue depth, running jobs and drain state
+    """
+    
+    def __init__(self, orchestrator: PipelineOrchestrator, host: str = '127.0.0.1',
+                 port: int = 8080, max_concurrent_jobs: int = 1, max_queued_jobs: int = 64):
+        """
+        Initialize the server.
+        
+        Args:
+            orchestrator: Orchestrator shared by every job
+            host: Interface to bind; keep the default to stay local-only
+            port: Port to bind (0 picks a free port)
+            max_concurrent_jobs: Briefs run at the same time
+            max_queued_jobs: Briefs waiting to run before submissions are rejected
+        """
+        self.orchestrator = orchestrator
+        self.logger = orchestrator.logger
+        self.host = host
+        self.port = port
+        self.max_concurrent_jobs = max(1, int(max_concurrent_jobs))
+        self.max_queued_jobs = max(1, int(max_queued_jobs))
+        self.staging_dir = Path(orchestrator.asset_manager.output_dir) / '.server_briefs'
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queued_jobs)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._changed = threading.Condition()
+        self._draining = False
+        self._workers: List[threading.Thread] = []
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._http_thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Warm up the orchestrator, start the workers and begin serving HTTP."""
+        self.orchestrator.warm_up()
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        
+        for i in range(self.max_concurrent_jobs):
+            worker = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.pipeline_server = self
+        self.port = self._httpd.server_address[1]
+        self._http_thread = threading.Thread(target=self._httpd.serve_forever,
+                                             name="http-server", daemon=True)
+        self._http_thread.start()
+        
+        self.logger.info(
+            f"Pipeline server listening on http://{self.host}:{self.port} "
+            f"({self.max_concurrent_jobs} concurrent jobs, queue of {self.max_queued_jobs})"
+        )
+    
+    def shutdown(self, drain: bool = True) -> None:
+        """
+        Stop the server.
+        
+        Args:
+            drain: Finish queued and running jobs first. When False, queued
+                jobs are failed immediately and only running jobs complete.
+        """
+        with self._changed:
+            if self._draining:
+                return
+            self._draining = True
+        self.logger.info("Pipeline server draining" if drain else "Pipeline server stopping")
+        
+        if not drain:
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._finish(job, JOB_FAILED, {"errors": ["Server shut down before the job started"]})
+        
+        # Stop markers queue up behind any remaining jobs
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        self.logger.info("Pipeline server stopped")
+    
+    @property
+    def draining(self) -> bool:
+        """Whether the server has stopped accepting jobs."""
+        return self._draining
+    
+    def submit(self, brief: Optional[Dict[str, Any]] = None, brief_path: Optional[str] = None,
+               resume: bool = False) -> Job:
+        """
+        Queue a brief for processing.
+        
+        Args:
+            brief: Brief contents; written to the staging directory
+            brief_path: Path to an existing brief file (used if brief is None)
+            resume: Resume the campaign from its checkpoint journal
+        
+        Returns:
+            The queued Job
+        
+        Raises:
+            ValueError: If neither a brief nor an existing brief path is given
+            ServerUnavailableError: If the server is draining or the queue is full
+        """
+        if self._draining:
+            raise ServerUnavailableError("Server is shutting down")
+        
+        job_id = uuid.uuid4().hex
+        if brief is not None:
+            if not isinstance(brief, dict):
+                raise ValueError("Brief must be a JSON object")
+            brief_path = str(self.staging_dir / f"{job_id}.json")
+            with open(brief_path, 'w', encoding='utf-8') as f:
+                json.dump(brief, f)
+        elif not brief_path or not Path(brief_path).is_file():
+            raise ValueError(f"Campaign brief file not found: {brief_path}")
+        
+        job = Job(job_id=job_id, brief_path=brief_path, resume=resume, staged=brief is not None)
+        with self._changed:
+            # Checked under the lock so no job slips in behind the stop markers
+            rejection = None
+            if self._draining:
+                rejection = "Server is shutting down"
+            else:
+                try:
+                    self._queue.put_nowait(job)
+                except queue.Full:
+                    rejection = f"Job queue is full ({self.max_queued_jobs} jobs waiting)"
+            
+            if rejection is None:
+                self._jobs[job_id] = job
+                self._add_event(job)
+                self._forget_old_jobs()
+        
+        if rejection is not None:
+            if brief is not None:
+                Path(brief_path).unlink(missing_ok=True)
+            raise ServerUnavailableError(rejection)
+        
+        self.logger.info(f"Queued job {job_id}: {brief_path}")
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if unknown."""
+        with self._changed:
+            return self._jobs.get(job_id)
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Return every known job, oldest first."""
+        with self._changed:
+            return [job.to_dict() for job in self._jobs.values()]
+    
+    def health(self) -> Dict[str, Any]:
+        """Return the server's load and state."""
+        with self._changed:
+            running = sum(1 for job in self._jobs.values() if job.status == JOB_RUNNING)
+        return {
+            "status": "draining" if self._draining else "ok",
+            "queued": self._queue.qsize(),
+            "running": running,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "max_queued_jobs": self.max_queued_jobs
+        }
+    
+    def wait_for_events(self, job: Job, cursor: int,
+                        timeout: Optional[float] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Block until a job has events past a cursor.
+        
+        Args:
+            job: Job to watch
+            cursor: Number of events the caller has already seen
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            Tuple of (new events, whether the job has finished)
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: len(job.events) > cursor or job.status in TERMINAL_STATUSES, timeout
+            )
+            return list(job.events[cursor:]), job.status in TERMINAL_STATUSES
+    
+    def _work(self) -> None:
+        """Worker loop: run queued jobs until a stop marker arrives."""
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            
+            with self._changed:
+                job.status = JOB_RUNNING
+                job.started_at = datetime.now()
+                self._add_event(job)
+            
+            try:
+                result = self.orchestrator.run(job.brief_path, resume=job.resume)
+                status = JOB_SUCCEEDED if result.success else JOB_FAILED
+                self._finish(job, status, self._summarize_result(result))
+            except Exception as e:
+                self.logger.error(f"Job {job.job_id} failed: {str(e)}")
+                self._finish(job, JOB_FAILED, {"errors": [str(e)]})
+    
+    def _finish(self, job: Job, status: str, result: Dict[str, Any]) -> None:
+        """Record a job's final status, delete its staged brief and wake any event streams."""
+        if job.staged:
+            Path(job.brief_path).unlink(missing_ok=True)
+        with self._changed:
+            job.status = status
+            job.finished_at = datetime.now()
+            job.result = result
+            self._add_event(job)
+        self.logger.info(f"Job {job.job_id} {status}")
+    
+    def _add_event(self, job: Job) -> None:
+        """Append a status event; the caller must hold the condition."""
+        event = {
+            "job_id": job.job_id,
+            "status": job.status,
+            "timestamp": datetime.now().isoformat()
+        }
+        if job.status in TERMINAL_STATUSES:
+            event["result"] = job.result
+        job.events.append(event)
+        self._changed.notify_all()
+    
+    def _forget_old_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond MAX_JOB_HISTORY."""
+        excess = len(self._jobs) - MAX_JOB_HISTORY
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.status in TERMINAL_STATUSES][:excess]:
+            del self._jobs[job_id]
+    
+    def _summarize_result(self, result: PipelineResult) -> Dict[str, Any]:
+        """Convert a PipelineResult into the job result payload."""
+        report_path = Path(self.orchestrator.asset_manager.output_dir) / result.campaign_id / "report.json"
+        return {
+            "campaign_id": result.campaign_id,
+            "success": result.success,
+            "execution_time": result.execution_time,
+            "errors": result.errors,
+            "outputs": [
+                {
+                    "product_id": asset.product_id,
+                    "aspect_ratio": asset.aspect_ratio,
+                    "file_path": asset.file_path,
+                    "was_generated": asset.was_generated,
+                    "up_to_date": asset.up_to_date
+                }
+                for asset in result.outputs
+            ],
+            "report_path": str(report_path) if report_path.exists() else None
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the owning PipelineServer."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    @property
+    def pipeline(self) -> PipelineServer:
+        return self.server.pipeline_server
+    
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        
+        if parts == ['health']:
+            self._send_json(200, self.pipeline.health())
+        elif parts == ['jobs']:
+            self._send_json(200, {"jobs": self.pipeline.list_jobs()})
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.pipeline.get_job(parts[1])
+            if job is None:
+                self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            elif parts[2] == 'events':
+                self._stream_events(job)
+            else:
+                self._send_json(404, {"error": "Not found"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+    
+    def do_POST(self) -> None:
+        if self.path.split('?')[0].rstrip('/') != '/jobs':
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object")
+            
+            resume = bool(body.get('resume', False))
+            if 'brief_path' in body:
+                job = self.pipeline.submit(brief_path=body['brief_path'], resume=resume)
+            else:
+                # Accept {"brief": {...}} or a bare brief object
+                job = self.pipeline.submit(brief=body.get('brief', body), resume=resume)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except ServerUnavailableError as e:
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": "5"})
+            return
+        
+        self._send_json(202, job.to_dict(), headers={"Location": f"/jobs/{job.job_id}"})
+    
+    def _stream_events(self, job: Job) -> None:
+        """Write job events as JSON lines until the job finishes."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        cursor = 0
+        finished = False
+        while not finished:
+            events, finished = self.pipeline.wait_for_events(job, cursor, timeout=15)
+            cursor += len(events)
+            for event in events:
+                self.wfile.write(json.dumps(event).encode('utf-8') + b"\n")
+            self.wfile.flush()
+    
+    def _send_json(self, status: int, payload: Dict[str, Any],
+                   headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        self.pipeline.logger.debug(f"HTTP {self.address_string()} {format % args}")
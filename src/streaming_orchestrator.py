@@ -0,0 +1,396 @@
+"""Streaming stage pipeline connected by bounded queues."""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.models import CampaignBrief, ComplianceResult, GeneratedAsset
+from src.orchestrator import PipelineOrchestrator
+
+
+# Stage order; each stage feeds the next through a bounded queue
+STAGES = ['lookup', 'generate', 'crop', 'overlay', 'save', 'compliance', 'report']
+
+DEFAULT_STAGE_WORKERS = {
+    'lookup': 1,
+    'generate': 4,
+    'crop': 1,
+    'overlay': 2,
+    'save': 2,
+    'compliance': 1,
+    'report': 1
+}
+
+# Marks the end of a stage's input
+_END = object()
+
+
+@dataclass
+class WorkItem:
+    """A unit of work flowing through the stage pipeline."""
+    index: int  # Position of the product in the brief
+    product: Any
+    image: Optional[Image.Image] = None
+    was_generated: bool = False
+    aspect_ratio: Optional[str] = None
+    file_path: Optional[str] = None
+    compliance_status: Optional[ComplianceResult] = None
+    fingerprint: Optional[str] = None  # Set when incremental builds are enabled
+    up_to_date: bool = False
+    resumed: Optional[GeneratedAsset] = None  # Output recorded by an earlier attempt
+
+
+class StageStats:
+    """Thread-safe counters for one stage and its input queue."""
+    
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0  # Time spent waiting on a full downstream queue
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._lock = threading.Lock()
+    
+    def record_depth(self, depth: int) -> None:
+        """Sample the depth of the stage's input queue."""
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+            self._depth_total += depth
+            self._depth_samples += 1
+    
+    def record_item(self, busy: float, blocked: float, failed: bool) -> None:
+        """Record one processed item."""
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += busy
+            self.blocked_seconds += blocked
+            if failed:
+                self.failures += 1
+    
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        """Summarise the stage for the run report."""
+        capacity = self.workers * wall_seconds
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "failures": self.failures,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "blocked_seconds": round(self.blocked_seconds, 4),
+            "utilization": round(self.busy_seconds / capacity, 4) if capacity > 0 else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": round(self._depth_total / self._depth_samples, 2) if self._depth_samples else 0.0
+        }
+
+
+class StreamingPipelineOrchestrator(PipelineOrchestrator):
+    """
+    Pipeline orchestrator built from explicit stages and bounded queues.
+    
+    Work flows lookup -> generate -> crop -> overlay -> save -> compliance
+    -> report. Every stage has its own worker threads and reads from a
+    queue of at most performance.queue_size items, so a slow stage applies
+    backpressure upstream and the number of decoded images held in memory
+    stays bounded. Per-stage utilisation and queue depths are returned in
+    PipelineResult.metrics["stages"] to locate the bottleneck.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the streaming orchestrator.
+        
+        Args:
+            config: Configuration dictionary (see PipelineOrchestrator). Reads
+                performance.queue_size (default: 8) and performance.stage_workers,
+                a mapping of stage name to worker count.
+        """
+        super().__init__(config)
+        
+        perf_config = config.get('performance', {})
+        self.queue_size = max(1, int(perf_config.get('queue_size', 8)))
+        
+        self.stage_workers = dict(DEFAULT_STAGE_WORKERS)
+        for stage, workers in (perf_config.get('stage_workers') or {}).items():
+            if stage not in self.stage_workers:
+                raise ValueError(f"Unknown pipeline stage: {stage}")
+            self.stage_workers[stage] = max(1, int(workers))
+        # Results are collected in order by a single reporter
+        self.stage_workers['report'] = 1
+    
+    def _process_products(self, brief: CampaignBrief,
+                          metrics: Dict[str, Any]) -> Tuple[List[GeneratedAsset], List[str]]:
+        """
+        Stream every product through the stage pipeline.
+        
+        Args:
+            brief: CampaignBrief containing the products to process
+            metrics: Run metrics dictionary; receives "stages" and "queue_size"
+        
+        Returns:
+            Tuple of (outputs, errors) in brief order
+        """
+        campaign_message = self._campaign_message(brief)
+        expected = len(self.aspect_ratios)
+        
+        # Per-product results assembled by the report stage
+        collected: Dict[int, List[GeneratedAsset]] = {}
+        failures: Dict[int, str] = {}
+        failure_lock = threading.Lock()
+        
+        def fail(item: WorkItem, error: Exception) -> None:
+            error_msg = f"Failed to process product {item.product.product_id}: {str(error)}"
+            with failure_lock:
+                if item.index not in failures:
+                    failures[item.index] = error_msg
+                    self.logger.error(error_msg)
+        
+        def lookup(item: WorkItem) -> List[WorkItem]:
+            self.logger.info(f"Processing product: {item.product.product_id} ({item.product.name})")
+            resumed = self._resumed_outputs(brief, item.product)
+            if resumed is not None:
+                # Every output is journaled; skip straight to the reporter
+                return [
+                    WorkItem(index=item.index, product=item.product,
+                             aspect_ratio=asset.aspect_ratio, resumed=asset)
+                    for asset in resumed
+                ]
+            item.image, item.was_generated = self._lookup_hero_image(brief, item.product)
+            return [item]
+        
+        def generate(item: WorkItem) -> List[WorkItem]:
+            if item.resumed is None and item.image is None:
+                prompt = self._build_generation_prompt(brief, item.product)
+                with self._timed(brief, 'generate', item.product.product_id):
+                    item.image = self._generate_hero(brief, item.product, prompt)
+                item.was_generated = True
+                self._on_hero_generated(brief, item.product, item.image)
+            return [item]
+        
+        def crop(item: WorkItem) -> List[WorkItem]:
+            if item.resumed is not None:
+                return [item]
+            
+            journal = self._journals.get(brief.campaign_id)
+            resumed = {}
+            if journal:
+                for aspect_ratio in self.aspect_ratios:
+                    asset = journal.get_unit(item.product.product_id, aspect_ratio)
+                    if asset:
+                        resumed[aspect_ratio] = asset
+            
+            sources = self._variant_sources(brief, item.product, item.image)
+            fingerprints, up_to_date = self._find_up_to_date(
+                brief, item.product, sources, campaign_message
+            )
+            stale_ratios = [
+                ratio for ratio in self.aspect_ratios
+                if ratio not in up_to_date and ratio not in resumed
+            ]
+            variants = {}
+            for aspect_ratio in stale_ratios:
+                with self._timed(brief, 'crop', item.product.product_id, aspect_ratio):
+                    variants[aspect_ratio] = self.compositor.create_variants(
+                        sources[aspect_ratio], [aspect_ratio]
+                    )[aspect_ratio]
+            
+            children = []
+            for aspect_ratio in self.aspect_ratios:
+                child = WorkItem(index=item.index, product=item.product,
+                                 was_generated=item.was_generated, aspect_ratio=aspect_ratio,
+                                 fingerprint=fingerprints.get(aspect_ratio))
+                if aspect_ratio in resumed:
+                    child.resumed = resumed[aspect_ratio]
+                elif aspect_ratio in up_to_date:
+                    child.file_path = up_to_date[aspect_ratio]
+                    child.up_to_date = True
+                else:
+                    child.image = variants[aspect_ratio]
+                children.append(child)
+            return children
+        
+        def overlay(item: WorkItem) -> List[WorkItem]:
+            if item.resumed is None and not item.up_to_date:
+                with self._timed(brief, 'overlay', item.product.product_id, item.aspect_ratio):
+                    item.image = self.compositor.add_text_overlay(item.image, campaign_message)
+            return [item]
+        
+        def save(item: WorkItem) -> List[WorkItem]:
+            if item.resumed is not None:
+                self.logger.info(f"Resumed from checkpoint: {item.resumed.file_path}")
+                return [item]
+            if item.up_to_date:
+                self.logger.info(f"Up-to-date: {item.file_path}")
+                return [item]
+            
+            with self._timed(brief, 'save', item.product.product_id, item.aspect_ratio):
+                item.image = self._preview_image(item.image)
+                item.file_path = self.asset_manager.save_asset(
+                    campaign_id=brief.campaign_id,
+                    product_id=item.product.product_id,
+                    aspect_ratio=item.aspect_ratio.replace(':', 'x'),
+                    image=item.image
+                )
+            if item.fingerprint:
+                self._record_build(brief, item.product, item.aspect_ratio, item.fingerprint, item.file_path)
+            self.logger.info(f"Saved: {item.file_path}")
+            return [item]
+        
+        def compliance(item: WorkItem) -> List[WorkItem]:
+            if self.compliance_checker and item.resumed is None:
+                with self._timed(brief, 'compliance', item.product.product_id, item.aspect_ratio):
+                    image = item.image if item.image is not None else Image.open(item.file_path)
+                    item.compliance_status = self._check_compliance(
+                        item.product, item.aspect_ratio, image, campaign_message
+                    )
+            # Release the decoded pixels; only the record travels further
+            item.image = None
+            return [item]
+        
+        def report(item: WorkItem) -> List[WorkItem]:
+            assets = collected.setdefault(item.index, [])
+            if item.resumed is not None:
+                assets.append(item.resumed)
+            else:
+                asset = GeneratedAsset(
+                    product_id=item.product.product_id,
+                    aspect_ratio=item.aspect_ratio,
+                    file_path=item.file_path,
+                    was_generated=item.was_generated,
+                    compliance_status=item.compliance_status,
+                    up_to_date=item.up_to_date
+                )
+                assets.append(asset)
+                self._record_unit(brief, asset)
+            if len(assets) == expected:
+                self.logger.log_operation(
+                    f"Product {item.product.product_id}",
+                    "success",
+                    {"assets_generated": len(assets)}
+                )
+            return []
+        
+        handlers = {
+            'lookup': lookup,
+            'generate': generate,
+            'crop': crop,
+            'overlay': overlay,
+            'save': save,
+            'compliance': compliance,
+            'report': report
+        }
+        
+        self.logger.info(
+            "Streaming products through stages: " +
+            ", ".join(f"{stage}x{self.stage_workers[stage]}" for stage in STAGES)
+        )
+        
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in STAGES]
+        stats = [StageStats(stage, self.stage_workers[stage]) for stage in STAGES]
+        
+        start = time.perf_counter()
+        threads = []
+        for position, stage in enumerate(STAGES):
+            threads.extend(self._start_stage(position, handlers[stage], queues, stats, fail))
+        
+        # Feed the first stage; put() blocks when lookup falls behind
+        for index, product in enumerate(brief.products):
+            self._put(queues[0], stats[0], WorkItem(index=index, product=product))
+        for _ in range(stats[0].workers):
+            queues[0].put(_END)
+        
+        for thread in threads:
+            thread.join()
+        wall_seconds = time.perf_counter() - start
+        
+        metrics['queue_size'] = self.queue_size
+        metrics['stages'] = {
+            stage_stats.name: stage_stats.to_dict(wall_seconds) for stage_stats in stats
+        }
+        
+        outputs = []
+        errors = []
+        for index in range(len(brief.products)):
+            if index in failures:
+                errors.append(failures[index])
+            else:
+                outputs.extend(sorted(
+                    collected.get(index, []),
+                    key=lambda asset: self.aspect_ratios.index(asset.aspect_ratio)
+                ))
+        
+        return outputs, errors
+    
+    def _start_stage(self, position: int, handler: Callable[[WorkItem], List[WorkItem]],
+                     queues: List[queue.Queue], stats: List[StageStats],
+                     fail: Callable[[WorkItem, Exception], None]) -> List[threading.Thread]:
+        """
+        Start the worker threads for one stage.
+        
+        The last worker of a stage to see the end marker forwards one end
+        marker per downstream worker.
+        
+        Args:
+            position: Index of the stage in STAGES
+            handler: Function turning one input item into zero or more outputs
+            queues: Input queue of every stage
+            stats: Stats of every stage
+            fail: Callback recording a product failure
+        
+        Returns:
+            Started threads
+        """
+        inbox = queues[position]
+        stage_stats = stats[position]
+        is_last = position == len(STAGES) - 1
+        remaining = [stage_stats.workers]
+        remaining_lock = threading.Lock()
+        
+        def work() -> None:
+            while True:
+                item = inbox.get()
+                if item is _END:
+                    with remaining_lock:
+                        remaining[0] -= 1
+                        done = remaining[0] == 0
+                    if done and not is_last:
+                        for _ in range(stats[position + 1].workers):
+                            queues[position + 1].put(_END)
+                    return
+                
+                started = time.perf_counter()
+                failed = False
+                try:
+                    results = handler(item)
+                except Exception as e:
+                    fail(item, e)
+                    results = []
+                    failed = True
+                busy = time.perf_counter() - started
+                
+                blocked_start = time.perf_counter()
+                for result in results:
+                    self._put(queues[position + 1], stats[position + 1], result)
+                blocked = time.perf_counter() - blocked_start
+                
+                stage_stats.record_item(busy, blocked, failed)
+        
+        threads = [
+            threading.Thread(target=work, name=f"stage-{STAGES[position]}-{i}", daemon=True)
+            for i in range(stage_stats.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+    
+    @staticmethod
+    def _put(target: queue.Queue, target_stats: StageStats, item: WorkItem) -> None:
+        """Enqueue an item, blocking while the queue is full, and sample its depth."""
+        target.put(item)
+        target_stats.record_depth(target.qsize())
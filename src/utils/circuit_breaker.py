@@ -0,0 +1,259 @@
+"""Process-wide circuit breakers that stop calling GenAI providers that are down."""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Type
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# State changes kept per breaker for reports
+TRANSITION_HISTORY = 50
+
+# Child of the pipeline logger, so state changes reach its console and file handlers
+logger = logging.getLogger("CreativeAutomationPipeline.genai")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker shared by every call to one provider.
+    
+    While closed, calls go through and consecutive provider failures are
+    counted; failure_threshold of them open the circuit. While open, calls
+    fail immediately with CircuitOpenError (so a failover client moves on
+    to the next provider) until reset_timeout seconds have passed. The
+    circuit then turns half-open and lets up to half_open_max_calls probe
+    requests through: a success closes it, a failure opens it again.
+    Every admitted call must end in record_success(), record_failure() or
+    release().
+    """
+    
+    def __init__(self, provider: str, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Initialize the breaker.
+        
+        Args:
+            provider: Provider name, used in errors and log messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probe requests while half-open
+        """
+        self.provider = provider
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._counters = {
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0
+        }
+        self._transitions = deque(maxlen=TRANSITION_HISTORY)
+        self.configure(failure_threshold, reset_timeout, half_open_max_calls)
+    
+    def configure(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                  half_open_max_calls: int = 1) -> None:
+        """
+        Replace the thresholds (see __init__); state and counters are kept.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probe requests while half-open
+        """
+        with self._lock:
+            self.failure_threshold = max(1, int(failure_threshold))
+            self.reset_timeout = max(0.0, float(reset_timeout))
+            self.half_open_max_calls = max(1, int(half_open_max_calls))
+    
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state
+    
+    def before_call(self) -> None:
+        """
+        Admit a call to the provider.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                probe slots taken
+        """
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self._counters['rejected'] += 1
+                    raise CircuitOpenError(
+                        f"{self.provider} circuit is open after repeated failures; "
+                        f"next probe in {remaining:.0f}s"
+                    )
+                self._transition(HALF_OPEN, "reset timeout elapsed, probing")
+            
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    self._counters['rejected'] += 1
+                    raise CircuitOpenError(f"{self.provider} circuit is half-open; probe in progress")
+                self._probes += 1
+    
+    @contextmanager
+    def guard(self, failures: Tuple[Type[BaseException], ...] = (Exception,),
+              ignored: Tuple[Type[BaseException], ...] = ()) -> Iterator[None]:
+        """
+        Admit the enclosed provider call and record its outcome.
+        
+        Args:
+            failures: Exception types that count as provider failures
+            ignored: Subtypes of those that do not (e.g., rate limits)
+        
+        Raises:
+            CircuitOpenError: If the call is not admitted
+        """
+        self.before_call()
+        try:
+            yield
+        except BaseException as e:
+            if isinstance(e, failures) and not isinstance(e, ignored):
+                self.record_failure(e)
+            else:
+                self.release()
+            raise
+        self.record_success()
+    
+    def record_success(self) -> None:
+        """Record a successful call; closes a half-open circuit."""
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                self._transition(CLOSED, "probe succeeded")
+    
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        """
+        Record a provider failure; may open the circuit.
+        
+        Args:
+            error: The failure, quoted in the transition reason
+        """
+        with self._lock:
+            self._counters['failures'] += 1
+            self._consecutive_failures += 1
+            detail = f": {error}" if error is not None else ""
+            
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                self._open(f"probe failed{detail}")
+            elif self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open(f"{self._consecutive_failures} consecutive failures{detail}")
+    
+    def release(self) -> None:
+        """End an admitted call whose outcome says nothing about provider health (e.g., a rate limit)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the current state, cumulative counters and recent state changes."""
+        with self._lock:
+            return {
+                "state": self._state,
+                **self._counters,
+                "transitions": list(self._transitions)
+            }
+    
+    def _open(self, reason: str) -> None:
+        """Open the circuit; caller holds the lock."""
+        self._opened_at = time.monotonic()
+        self._counters['opened'] += 1
+        self._transition(OPEN, reason)
+    
+    def _transition(self, state: str, reason: str) -> None:
+        """Change state, recording and logging it; caller holds the lock."""
+        previous, self._state = self._state, state
+        if state != HALF_OPEN:
+            self._probes = 0
+        self._transitions.append({
+            "from": previous,
+            "to": state,
+            "at": datetime.now().isoformat(timespec='seconds'),
+            "reason": reason
+        })
+        message = f"GenAI circuit for {self.provider}: {previous} -> {state} ({reason})"
+        if state == OPEN:
+            logger.warning(message)
+        else:
+            logger.info(message)
+
+
+class CircuitBreakerGroup:
+    """Reports the breakers of several providers together."""
+    
+    # stats() values that describe current state rather than counting events
+    STATS_GAUGES = ('state',)
+    
+    def __init__(self, providers: Iterable[str]):
+        """
+        Initialize the group.
+        
+        Args:
+            providers: Provider names (duplicates are ignored)
+        """
+        self.providers = list(dict.fromkeys(providers))
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return each provider's breaker stats, by provider."""
+        return {provider: get_circuit_breaker(provider).stats() for provider in self.providers}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """
+    Return the process-wide breaker of a provider, creating one with default thresholds.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+    
+    Returns:
+        CircuitBreaker shared by every client of the provider
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker(provider)
+        return breaker
+
+
+def configure_circuit_breaker(provider: str, settings: Dict[str, Any]) -> CircuitBreaker:
+    """
+    Apply thresholds to a provider's shared breaker.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+        settings: failure_threshold, reset_timeout_seconds, half_open_max_calls
+    
+    Returns:
+        The configured breaker
+    """
+    breaker = get_circuit_breaker(provider)
+    breaker.configure(
+        failure_threshold=settings.get('failure_threshold', 5),
+        reset_timeout=settings.get('reset_timeout_seconds', 30.0),
+        half_open_max_calls=settings.get('half_open_max_calls', 1)
+    )
+    return breaker
@@ -0,0 +1,347 @@
+"""Process-wide rate limiting of GenAI provider requests."""
+
+import asyncio
+import math
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket plus concurrency cap shared by every client of one provider.
+    
+    Callers take a token before each API request, so parallel workers are
+    spaced out at requests_per_minute instead of bursting into rate-limit
+    errors together. When the provider still reports a rate limit, the
+    rate is halved and every caller pauses for the provider's Retry-After
+    (or cooldown_seconds); successful requests then restore the configured
+    rate step by step. An unconfigured limiter admits everything and only
+    honours Retry-After.
+    
+    With adaptive concurrency the number of requests in flight is found
+    rather than fixed (additive increase, multiplicative decrease): the
+    limit starts at min_concurrent and grows by one request per round of
+    successful requests that used it fully, up to max_concurrent. It is
+    cut when the provider reports a rate limit, or when the median latency
+    of the last few requests exceeds latency_tolerance times the baseline:
+    the lowest such median among recent batches of requests, so slow
+    growth in latency under load is not mistaken for the normal level.
+    """
+    
+    # stats() values that describe current state rather than counting events
+    STATS_GAUGES = ('requests_per_minute', 'max_wait_seconds', 'concurrency_limit')
+    
+    # Fraction of the configured rate regained per successful request
+    RECOVERY_STEP = 0.05
+    
+    # Adaptive concurrency: ceiling without max_concurrent, requests per
+    # latency batch, batch medians the baseline is taken from, and the
+    # factors the limit is multiplied by after a rate limit or a latency rise
+    MAX_ADAPTIVE_CONCURRENT = 64
+    LATENCY_BATCH = 5
+    BASELINE_BATCHES = 10
+    RATE_LIMIT_BACKOFF = 0.5
+    LATENCY_BACKOFF = 0.75
+    
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 max_concurrent: Optional[int] = None, burst: Optional[int] = None,
+                 cooldown_seconds: float = 0.0, adaptive_concurrency: bool = False,
+                 min_concurrent: int = 1, latency_tolerance: float = 2.0):
+        """
+        Initialize the limiter.
+        
+        Args:
+            requests_per_minute: Sustained request rate; None means unlimited
+            max_concurrent: Requests allowed in flight at once; None means
+                unlimited (MAX_ADAPTIVE_CONCURRENT with adaptive concurrency)
+            burst: Requests that may start back to back after an idle period
+                (default: max_concurrent, or 1)
+            cooldown_seconds: Pause after a rate-limit error without Retry-After
+            adaptive_concurrency: Adjust the in-flight limit to observed
+                latency and rate limits
+            min_concurrent: Starting and lowest adaptive limit
+            latency_tolerance: Latency rise (as a multiple of the baseline)
+                that cuts the adaptive limit
+        """
+        self._cond = threading.Condition()
+        self._active = 0
+        self._blocked_until = 0.0
+        self._counters = {
+            "requests": 0,
+            "waited": 0,
+            "wait_seconds": 0.0,
+            "rate_limited": 0,
+            "concurrency_increases": 0,
+            "concurrency_decreases": 0
+        }
+        self._max_wait = 0.0
+        self.configure(requests_per_minute, max_concurrent, burst, cooldown_seconds,
+                       adaptive_concurrency, min_concurrent, latency_tolerance)
+    
+    def configure(self, requests_per_minute: Optional[float] = None,
+                  max_concurrent: Optional[int] = None, burst: Optional[int] = None,
+                  cooldown_seconds: float = 0.0, adaptive_concurrency: bool = False,
+                  min_concurrent: int = 1, latency_tolerance: float = 2.0) -> None:
+        """
+        Replace the limits (see __init__); counters are kept.
+        
+        Args:
+            requests_per_minute: Sustained request rate; None means unlimited
+            max_concurrent: Requests allowed in flight at once; None means unlimited
+            burst: Bucket capacity
+            cooldown_seconds: Pause after a rate-limit error without Retry-After
+            adaptive_concurrency: Adjust the in-flight limit to observed latency
+            min_concurrent: Starting and lowest adaptive limit
+            latency_tolerance: Latency rise that cuts the adaptive limit
+        """
+        with self._cond:
+            self.requests_per_minute = float(requests_per_minute) if requests_per_minute else None
+            self.max_concurrent = max(1, int(max_concurrent)) if max_concurrent else None
+            self.burst = max(1, int(burst or self.max_concurrent or 1))
+            self.cooldown_seconds = cooldown_seconds
+            self._rate = self.requests_per_minute
+            self._tokens = float(self.burst)
+            self._refilled = time.monotonic()
+            self.adaptive_concurrency = adaptive_concurrency
+            self.min_concurrent = max(1, int(min_concurrent))
+            self.latency_tolerance = max(1.0, float(latency_tolerance))
+            self._limit = float(self.min_concurrent)
+            self._batch_medians = deque(maxlen=self.BASELINE_BATCHES)
+            self._recent = []
+            self._cond.notify_all()
+    
+    # Polling interval of async waiters blocked on max_concurrent
+    ASYNC_POLL_SECONDS = 0.05
+    
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """Block until a request may start; the slot is released on exit."""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_acquire(start)
+                if wait <= 0:
+                    break
+                self._cond.wait(None if math.isinf(wait) else wait)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self._release()
+            raise
+        self._release(time.monotonic() - started)
+    
+    @asynccontextmanager
+    async def acquire_async(self) -> AsyncIterator[None]:
+        """Like acquire(), but waits without blocking the event loop."""
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._try_acquire(start)
+            if wait <= 0:
+                break
+            await asyncio.sleep(min(wait, self.ASYNC_POLL_SECONDS) if math.isinf(wait) else wait)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self._release()
+            raise
+        self._release(time.monotonic() - started)
+    
+    def on_success(self) -> None:
+        """Step the rate back towards the configured one after a rate limit."""
+        with self._cond:
+            if self.requests_per_minute and self._rate < self.requests_per_minute:
+                self._refill(time.monotonic())
+                self._rate = min(self.requests_per_minute,
+                                 self._rate + self.requests_per_minute * self.RECOVERY_STEP)
+    
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after the provider rejected a request for exceeding its limit.
+        
+        Args:
+            retry_after: Seconds the provider asked clients to wait, if known
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            self._counters['rate_limited'] += 1
+            pause = retry_after if retry_after is not None else self.cooldown_seconds
+            self._blocked_until = max(self._blocked_until, now + max(0.0, pause))
+            if self._rate:
+                # Halve the rate, but never below 1/16 of the configured one
+                self._rate = max(self.requests_per_minute / 16, self._rate / 2)
+                self._tokens = min(self._tokens, 0.0)
+            if self.adaptive_concurrency:
+                self._decrease_limit(self.RATE_LIMIT_BACKOFF)
+    
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        """Requests currently allowed in flight at once; None means unlimited."""
+        with self._cond:
+            return self._concurrency_limit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cumulative counters plus the current rate, concurrency limit and longest wait."""
+        with self._cond:
+            return {
+                **self._counters,
+                "wait_seconds": round(self._counters['wait_seconds'], 4),
+                "max_wait_seconds": round(self._max_wait, 4),
+                "requests_per_minute": round(self._rate, 2) if self._rate else None,
+                "concurrency_limit": self._concurrency_limit() if self.adaptive_concurrency else None
+            }
+    
+    def _try_acquire(self, start: float) -> float:
+        """
+        Take a slot and a token if available; caller holds the lock.
+        
+        Args:
+            start: When the caller started waiting (monotonic)
+        
+        Returns:
+            0 once acquired, otherwise seconds to wait before trying again
+        """
+        now = time.monotonic()
+        self._refill(now)
+        wait = self._wait_time(now)
+        if wait > 0:
+            return wait
+        
+        if self._rate:
+            self._tokens -= 1
+        self._active += 1
+        
+        waited = now - start
+        self._counters['requests'] += 1
+        if waited > 0.001:
+            self._counters['waited'] += 1
+            self._counters['wait_seconds'] += waited
+            self._max_wait = max(self._max_wait, waited)
+        return 0.0
+    
+    def _release(self, seconds: Optional[float] = None) -> None:
+        """
+        Free the slot of a finished request.
+        
+        Args:
+            seconds: How long the request took, or None if it failed
+        """
+        with self._cond:
+            if self.adaptive_concurrency and seconds is not None:
+                self._adapt(seconds)
+            self._active -= 1
+            self._cond.notify_all()
+    
+    def _concurrency_limit(self) -> Optional[int]:
+        """Current in-flight limit; caller holds the lock."""
+        if self.adaptive_concurrency:
+            return int(self._limit)
+        return self.max_concurrent
+    
+    def _adapt(self, seconds: float) -> None:
+        """
+        Move the adaptive limit after a successful request; caller holds the lock.
+        
+        Args:
+            seconds: How long the request took
+        """
+        self._recent.append(seconds)
+        if len(self._recent) >= self.LATENCY_BATCH:
+            median = statistics.median(self._recent)
+            self._recent = []
+            rising = bool(self._batch_medians) and median > self.latency_tolerance * min(self._batch_medians)
+            # A lasting shift becomes the baseline once older batches age out
+            self._batch_medians.append(median)
+            if rising:
+                self._decrease_limit(self.LATENCY_BACKOFF)
+                return
+        
+        # Grow only while the limit is what holds requests back: one more
+        # request per round of int(limit) successes
+        limit = int(self._limit)
+        ceiling = max(self.min_concurrent, self.max_concurrent or self.MAX_ADAPTIVE_CONCURRENT)
+        if self._active >= limit and limit < ceiling:
+            self._limit = min(float(ceiling), self._limit + 1 / limit)
+            if int(self._limit) > limit:
+                self._counters['concurrency_increases'] += 1
+    
+    def _decrease_limit(self, factor: float) -> None:
+        """Cut the adaptive limit; caller holds the lock."""
+        limit = max(float(self.min_concurrent), self._limit * factor)
+        if int(limit) < int(self._limit):
+            self._counters['concurrency_decreases'] += 1
+        self._limit = limit
+        # Latencies of requests started under the old limit say nothing new
+        self._recent = []
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill; caller holds the lock."""
+        if self._rate:
+            self._tokens = min(float(self.burst),
+                               self._tokens + (now - self._refilled) * self._rate / 60.0)
+        self._refilled = now
+    
+    def _wait_time(self, now: float) -> float:
+        """Seconds until a request may start (inf: until a slot frees); caller holds the lock."""
+        limit = self._concurrency_limit()
+        if limit is not None and self._active >= limit:
+            return math.inf
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._rate and self._tokens < 1:
+            return (1 - self._tokens) * 60.0 / self._rate
+        return 0.0
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Return the process-wide limiter of a provider, creating an unlimited one.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+    
+    Returns:
+        RateLimiter shared by every client of the provider
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = RateLimiter()
+        return limiter
+
+
+def configure_rate_limiter(provider: str, settings: Dict[str, Any]) -> RateLimiter:
+    """
+    Apply rate limit settings to a provider's shared limiter.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+        settings: requests_per_minute, max_concurrent, burst,
+            cooldown_seconds (default 1), adaptive_concurrency,
+            min_concurrent (default 1) and latency_tolerance (default 2)
+    
+    Returns:
+        The configured limiter
+    """
+    limiter = get_rate_limiter(provider)
+    limiter.configure(
+        requests_per_minute=settings.get('requests_per_minute'),
+        max_concurrent=settings.get('max_concurrent'),
+        burst=settings.get('burst'),
+        cooldown_seconds=float(settings.get('cooldown_seconds', 1.0)),
+        adaptive_concurrency=bool(settings.get('adaptive_concurrency', False)),
+        min_concurrent=int(settings.get('min_concurrent', 1)),
+        latency_tolerance=float(settings.get('latency_tolerance', 2.0))
+    )
+    return limiter
@@ -4,7 +4,12 @@ import json
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
-from ..models import PipelineResult, GeneratedAsset
+from ..models import PipelineResult, GeneratedAsset, StageTiming
+from .timing import percentile
+
+
+# Number of slowest spans listed in reports
+TOP_OFFENDERS = 5
 
 
 class PipelineReporter:
@@ -33,6 +38,7 @@ class PipelineReporter:
         total_assets = len(result.outputs)
         assets_generated = sum(1 for asset in result.outputs if asset.was_generated)
         assets_reused = total_assets - assets_generated
+        assets_up_to_date = sum(1 for asset in result.outputs if asset.up_to_date)
         
         # Get unique products processed
         products_processed = list(set(asset.product_id for asset in result.outputs))
@@ -60,19 +66,23 @@ class PipelineReporter:
                 "product_ids": products_processed,
                 "total_assets": total_assets,
                 "assets_generated": assets_generated,
-                "assets_reused": assets_reused
+                "assets_reused": assets_reused,
+                "assets_up_to_date": assets_up_to_date
             },
             "outputs": [
                 {
                     "product_id": asset.product_id,
                     "aspect_ratio": asset.aspect_ratio,
                     "file_path": asset.file_path,
-                    "was_generated": asset.was_generated
+                    "was_generated": asset.was_generated,
+                    "status": "up-to-date" if asset.up_to_date else "built"
                 }
                 for asset in result.outputs
             ],
             "errors": result.errors,
-            "compliance_results": compliance_results if compliance_results else None
+            "compliance_results": compliance_results if compliance_results else None,
+            "metrics": result.metrics if result.metrics else None,
+            "timings": PipelineReporter.summarize_timings(result.timings) if result.timings else None
         }
         
         # Save to file if path provided
@@ -113,6 +123,9 @@ class PipelineReporter:
             f"  Assets Reused: {report['summary']['assets_reused']}",
         ]
         
+        if report['summary'].get('assets_up_to_date'):
+            lines.append(f"  Assets Up-to-date: {report['summary']['assets_up_to_date']}")
+        
         if report['errors']:
             lines.extend([
                 "",
@@ -133,6 +146,283 @@ class PipelineReporter:
                     for violation in comp['violations']:
                         lines.append(f"    * {violation}")
         
+        preview = (report.get('metrics') or {}).get('preview')
+        if preview:
+            lines.extend([
+                "",
+                "PREVIEW:",
+                f"  {preview['variants']} draft variants at {preview['scale']:.0%} resolution",
+                f"  Contact sheet: {preview['contact_sheet']}",
+            ])
+        
+        stages = (report.get('metrics') or {}).get('stages')
+        if stages:
+            lines.extend([
+                "",
+                "STAGE UTILIZATION:",
+            ])
+            for name, stage in stages.items():
+                lines.append(
+                    f"  - {name}: {stage['utilization'] * 100:.0f}% busy "
+                    f"({stage['workers']} workers, {stage['items']} items, "
+                    f"max queue {stage['max_queue_depth']})"
+                )
+            bottleneck = max(stages.items(), key=lambda entry: entry[1]['utilization'])[0]
+            lines.append(f"  Bottleneck: {bottleneck}")
+        
+        cache = (report.get('metrics') or {}).get('genai_cache')
+        if cache:
+            lines.extend([
+                "",
+                "GENAI CACHE:",
+                f"  Hits: {cache['hits']}, Misses: {cache['misses']}, Evictions: {cache['evictions']}",
+                f"  Read: {cache['bytes_read'] / 1024 ** 2:.1f} MB, Written: {cache['bytes_written'] / 1024 ** 2:.1f} MB, "
+                f"Size: {cache['total_bytes'] / 1024 ** 2:.1f} MB ({cache['entries']} entries)",
+            ])
+        
+        rate_limit = (report.get('metrics') or {}).get('genai_rate_limit')
+        if rate_limit and (rate_limit['waited'] or rate_limit['rate_limited'] or rate_limit.get('concurrency_limit')):
+            lines.extend([
+                "",
+                "GENAI RATE LIMIT:",
+                f"  Waited: {rate_limit['waited']}/{rate_limit['requests']} requests, "
+                f"{rate_limit['wait_seconds']:.1f}s total (max {rate_limit['max_wait_seconds']:.1f}s)",
+                f"  Rate limited by provider: {rate_limit['rate_limited']} times",
+            ])
+            if rate_limit.get('concurrency_limit'):
+                lines.append(
+                    f"  Concurrency limit: {rate_limit['concurrency_limit']} "
+                    f"(raised {rate_limit['concurrency_increases']}x, cut {rate_limit['concurrency_decreases']}x)"
+                )
+        
+        providers = (report.get('metrics') or {}).get('genai_providers')
+        if providers:
+            lines.extend([
+                "",
+                "GENAI PROVIDERS (wins / requests, p50 / p95):",
+            ])
+            for name, provider in providers.items():
+                latency = (
+                    f"{provider['p50_seconds']:.2f}s / {provider['p95_seconds']:.2f}s"
+                    if provider['p50_seconds'] is not None else "n/a"
+                )
+                lines.append(
+                    f"  - {name}: {provider['wins']} / {provider['requests']}, {latency} "
+                    f"({provider['failures']} failed, {provider['hedges']} hedged, {provider['cancelled']} cancelled)"
+                )
+        
+        breakers = (report.get('metrics') or {}).get('genai_circuit_breakers') or {}
+        tripped = {
+            name: breaker for name, breaker in breakers.items()
+            if breaker['state'] != 'closed' or breaker['transitions'] or breaker['rejected']
+        }
+        if tripped:
+            lines.extend([
+                "",
+                "GENAI CIRCUIT BREAKERS:",
+            ])
+            for name, breaker in tripped.items():
+                lines.append(
+                    f"  - {name}: {breaker['state']} (opened {breaker['opened']}x, "
+                    f"{breaker['rejected']} rejected, {breaker['failures']} failures)"
+                )
+                for transition in breaker['transitions']:
+                    lines.append(
+                        f"      {transition['at']} {transition['from']} -> {transition['to']}: "
+                        f"{transition['reason']}"
+                    )
+        
+        budgets = (report.get('metrics') or {}).get('genai_retry_budgets') or {}
+        retried = {name: budget for name, budget in budgets.items() if budget['retries'] or budget['denied']}
+        if retried:
+            lines.extend([
+                "",
+                "GENAI RETRY BUDGETS:",
+            ])
+            for name, budget in retried.items():
+                limit = (
+                    f"{budget['ratio']:.0%} of successes, {budget['available']} left in window"
+                    if budget['ratio'] is not None else "unlimited"
+                )
+                lines.append(
+                    f"  - {name}: {budget['retries']} retries for {budget['successes']} successes, "
+                    f"{budget['denied']} denied ({limit})"
+                )
+        
+        size_plan = (report.get('metrics') or {}).get('genai_size_plan')
+        if size_plan:
+            sizes = ", ".join(f"{width}x{height}" for width, height in size_plan['sizes'])
+            lines.extend([
+                "",
+                "GENAI SIZE PLAN:" if size_plan['enabled'] else "GENAI SIZE PLAN (planning disabled):",
+                f"  Sizes: {sizes} ({size_plan['calls_per_product']} calls per product, "
+                f"{size_plan['images']} images for {size_plan['products']} products)",
+                f"  Pixel efficiency: {size_plan['pixel_efficiency']:.0%}",
+            ])
+        
+        coalescing = (report.get('metrics') or {}).get('genai_coalescing')
+        if coalescing and coalescing['coalesced']:
+            lines.extend([
+                "",
+                "GENAI COALESCING:",
+                f"  Requests: {coalescing['requests']}, Coalesced: {coalescing['coalesced']}",
+            ])
+        
+        timings = report.get('timings')
+        if timings:
+            lines.extend([
+                "",
+                "STAGE TIMINGS (total / p50 / p95 / max):",
+            ])
+            for name, stage in timings['stages'].items():
+                lines.append(
+                    f"  - {name}: {stage['total_seconds']:.2f}s / {stage['p50_seconds']:.3f}s / "
+                    f"{stage['p95_seconds']:.3f}s / {stage['max_seconds']:.3f}s ({stage['count']} spans)"
+                )
+            lines.append("  Slowest:")
+            for span in timings['slowest']:
+                unit = span['product_id'] + (f" ({span['aspect_ratio']})" if span['aspect_ratio'] else "")
+                lines.append(f"    * {span['stage']} {unit}: {span['seconds']:.3f}s")
+        
+        lines.append("=" * 60)
+        
+        return "\n".join(lines)
+
+    @staticmethod
+    def summarize_timings(spans: List[StageTiming]) -> dict:
+        """
+        Aggregate timing spans per stage.
+        
+        Args:
+            spans: Stage timing spans of a run
+        
+        Returns:
+            Dictionary with "stages" (count, total, p50, p95 and max seconds per
+            stage, slowest total first) and "slowest" (the TOP_OFFENDERS longest spans)
+        """
+        by_stage = {}
+        for span in spans:
+            by_stage.setdefault(span.stage, []).append(span.seconds)
+        
+        stages = {}
+        for stage, durations in sorted(by_stage.items(), key=lambda entry: -sum(entry[1])):
+            durations.sort()
+            stages[stage] = {
+                "count": len(durations),
+                "total_seconds": round(sum(durations), 4),
+                "p50_seconds": round(percentile(durations, 50), 4),
+                "p95_seconds": round(percentile(durations, 95), 4),
+                "max_seconds": round(durations[-1], 4)
+            }
+        
+        slowest = sorted(spans, key=lambda span: span.seconds, reverse=True)[:TOP_OFFENDERS]
+        return {
+            "stages": stages,
+            "slowest": [
+                {
+                    "stage": span.stage,
+                    "product_id": span.product_id,
+                    "aspect_ratio": span.aspect_ratio,
+                    "seconds": round(span.seconds, 4)
+                }
+                for span in slowest
+            ]
+        }
+    
+    @staticmethod
+    def generate_batch_report(
+        brief_paths: List[str],
+        results: List[PipelineResult],
+        start_time: datetime,
+        end_time: datetime,
+        output_dir: str,
+        output_path: Optional[str] = None
+    ) -> dict:
+        """
+        Generate an aggregated report for a multi-brief batch run.
+        
+        Args:
+            brief_paths: Brief files in the order they were submitted
+            results: PipelineResult for each brief, in the same order
+            start_time: Batch start timestamp
+            end_time: Batch end timestamp
+            output_dir: Output root containing the per-campaign reports
+            output_path: Optional path to save report as JSON file
+        
+        Returns:
+            Dictionary containing the batch report data
+        """
+        campaigns = []
+        for brief_path, result in zip(brief_paths, results):
+            campaigns.append({
+                "brief": brief_path,
+                "campaign_id": result.campaign_id,
+                "success": result.success,
+                "execution_time_seconds": result.execution_time,
+                "total_assets": len(result.outputs),
+                "assets_generated": sum(1 for asset in result.outputs if asset.was_generated),
+                "report_path": str(Path(output_dir) / result.campaign_id / "report.json"),
+                "errors": result.errors
+            })
+        
+        briefs_succeeded = sum(1 for result in results if result.success)
+        report = {
+            "timestamp": end_time.isoformat(),
+            "execution_time_seconds": (end_time - start_time).total_seconds(),
+            "success": briefs_succeeded == len(results),
+            "summary": {
+                "briefs_total": len(results),
+                "briefs_succeeded": briefs_succeeded,
+                "briefs_failed": len(results) - briefs_succeeded,
+                "total_assets": sum(campaign["total_assets"] for campaign in campaigns),
+                "assets_generated": sum(campaign["assets_generated"] for campaign in campaigns)
+            },
+            "campaigns": campaigns
+        }
+        
+        # Save to file if path provided
+        if output_path:
+            output_file = Path(output_path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            with open(output_file, 'w') as f:
+                json.dump(report, f, indent=2)
+        
+        return report
+    
+    @staticmethod
+    def format_batch_summary(report: dict) -> str:
+        """
+        Format a batch report as human-readable summary text.
+        
+        Args:
+            report: Report dictionary from generate_batch_report()
+        
+        Returns:
+            Formatted summary string
+        """
+        summary = report['summary']
+        lines = [
+            "=" * 60,
+            "BATCH EXECUTION SUMMARY",
+            "=" * 60,
+            f"Timestamp: {report['timestamp']}",
+            f"Status: {'SUCCESS' if report['success'] else 'FAILED'}",
+            f"Execution Time: {report['execution_time_seconds']:.2f} seconds",
+            f"Briefs: {summary['briefs_total']} "
+            f"({summary['briefs_succeeded']} succeeded, {summary['briefs_failed']} failed)",
+            f"Total Assets: {summary['total_assets']}",
+            "",
+            "CAMPAIGNS:",
+        ]
+        
+        for campaign in report['campaigns']:
+            status = "SUCCESS" if campaign['success'] else "FAILED"
+            lines.append(
+                f"  - {campaign['campaign_id']}: {status}, "
+                f"{campaign['total_assets']} assets, {campaign['execution_time_seconds']:.2f}s"
+            )
+        
         lines.append("=" * 60)
         
         return "\n".join(lines)
@@ -0,0 +1,198 @@
+"""Process-wide retry budgets that keep GenAI retries from turning into retry storms."""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+
+# Child of the pipeline logger, so exhaustion reaches its console and file handlers
+logger = logging.getLogger("CreativeAutomationPipeline.genai")
+
+
+class RetryBudgetExhaustedError(Exception):
+    """Raised instead of retrying a provider call once the retry budget is spent."""
+
+
+class RetryBudget:
+    """
+    Sliding-window retry budget shared by every call to one provider.
+    
+    Each client still retries a failed call up to its own max_retries, but
+    every retry must first be taken from the provider's budget: over the
+    last window_seconds, retries may not exceed min_retries plus ratio
+    times the successful calls. While the provider mostly succeeds this
+    never gets in the way; during a partial outage successes dry up, the
+    budget runs out after a handful of retries and further failures are
+    raised at once instead of multiplying the load on the provider and
+    stretching the run with backoff sleeps. An unconfigured budget (ratio
+    None) allows every retry and only counts them.
+    """
+    
+    # stats() values that describe current state rather than counting events
+    STATS_GAUGES = ('ratio', 'available')
+    
+    def __init__(self, provider: str, ratio: Optional[float] = None,
+                 window_seconds: float = 60.0, min_retries: int = 10):
+        """
+        Initialize the budget.
+        
+        Args:
+            provider: Provider name, used in errors and log messages
+            ratio: Retries allowed per successful call in the window; None
+                means unlimited
+            window_seconds: Length of the sliding window
+            min_retries: Retries allowed in the window regardless of successes
+        """
+        self.provider = provider
+        self._lock = threading.Lock()
+        self._successes = deque()
+        self._retries = deque()
+        self._exhausted = False
+        self._counters = {
+            "successes": 0,
+            "retries": 0,
+            "denied": 0
+        }
+        self.configure(ratio, window_seconds, min_retries)
+    
+    def configure(self, ratio: Optional[float] = None, window_seconds: float = 60.0,
+                  min_retries: int = 10) -> None:
+        """
+        Replace the budget (see __init__); the window and counters are kept.
+        
+        Args:
+            ratio: Retries allowed per successful call in the window; None
+                means unlimited
+            window_seconds: Length of the sliding window
+            min_retries: Retries allowed in the window regardless of successes
+        """
+        with self._lock:
+            self.ratio = None if ratio is None else max(0.0, float(ratio))
+            self.window_seconds = max(0.0, float(window_seconds))
+            self.min_retries = max(0, int(min_retries))
+    
+    @property
+    def available(self) -> Optional[int]:
+        """Retries left in the current window, or None when unlimited."""
+        with self._lock:
+            return self._available(time.monotonic())
+    
+    def on_success(self) -> None:
+        """Record a successful call; each one earns ratio retries for the window."""
+        with self._lock:
+            self._successes.append(time.monotonic())
+            self._counters['successes'] += 1
+    
+    def spend(self, error: Optional[BaseException] = None) -> None:
+        """
+        Take one retry from the budget.
+        
+        Args:
+            error: The failure about to be retried, quoted if the retry is refused
+        
+        Raises:
+            RetryBudgetExhaustedError: If no retries are left in the window
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._available(now) != 0:
+                self._retries.append(now)
+                self._counters['retries'] += 1
+                self._exhausted = False
+                return
+            self._counters['denied'] += 1
+            newly_exhausted, self._exhausted = not self._exhausted, True
+            spent = len(self._retries)
+        
+        if newly_exhausted:
+            logger.warning(f"GenAI retry budget for {self.provider} exhausted; failing calls without retrying")
+        detail = f": {error}" if error is not None else ""
+        raise RetryBudgetExhaustedError(
+            f"{self.provider} retry budget exhausted ({spent} retries in the last "
+            f"{self.window_seconds:.0f}s); not retrying{detail}"
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the budget, retries left in the window and cumulative counters."""
+        with self._lock:
+            return {
+                "ratio": self.ratio,
+                "available": self._available(time.monotonic()),
+                **self._counters
+            }
+    
+    def _available(self, now: float) -> Optional[int]:
+        """Drop events older than the window and count retries left; caller holds the lock."""
+        cutoff = now - self.window_seconds
+        for events in (self._successes, self._retries):
+            while events and events[0] <= cutoff:
+                events.popleft()
+        if self.ratio is None:
+            return None
+        allowed = math.ceil(self.min_retries + self.ratio * len(self._successes))
+        return max(0, allowed - len(self._retries))
+
+
+class RetryBudgetGroup:
+    """Reports the retry budgets of several providers together."""
+    
+    # stats() values that describe current state rather than counting events
+    STATS_GAUGES = RetryBudget.STATS_GAUGES
+    
+    def __init__(self, providers: Iterable[str]):
+        """
+        Initialize the group.
+        
+        Args:
+            providers: Provider names (duplicates are ignored)
+        """
+        self.providers = list(dict.fromkeys(providers))
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return each provider's budget stats, by provider."""
+        return {provider: get_retry_budget(provider).stats() for provider in self.providers}
+
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(provider: str) -> RetryBudget:
+    """
+    Return the process-wide retry budget of a provider, creating an unlimited one.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+    
+    Returns:
+        RetryBudget shared by every client of the provider
+    """
+    with _budgets_lock:
+        budget = _budgets.get(provider)
+        if budget is None:
+            budget = _budgets[provider] = RetryBudget(provider)
+        return budget
+
+
+def configure_retry_budget(provider: str, settings: Dict[str, Any]) -> RetryBudget:
+    """
+    Apply a retry budget to a provider's shared budget.
+    
+    Args:
+        provider: Provider name (e.g., "openai")
+        settings: ratio (default 0.1), window_seconds (default 60),
+            min_retries (default 10)
+    
+    Returns:
+        The configured budget
+    """
+    budget = get_retry_budget(provider)
+    budget.configure(
+        ratio=settings.get('ratio', 0.1),
+        window_seconds=float(settings.get('window_seconds', 60.0)),
+        min_retries=int(settings.get('min_retries', 10))
+    )
+    return budget
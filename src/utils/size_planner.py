@@ -0,0 +1,166 @@
+"""Plans the generation sizes that aspect ratio variants are cropped from."""
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Size generated when a provider is not told otherwise
+DEFAULT_GENERATION_SIZE = (1024, 1024)
+
+
+def parse_aspect_ratio(ratio: str) -> float:
+    """
+    Convert an aspect ratio string to width / height.
+    
+    Args:
+        ratio: Aspect ratio as "W:H" (e.g., "9:16")
+    
+    Returns:
+        Width divided by height
+    
+    Raises:
+        ValueError: If the string is not a valid ratio
+    """
+    try:
+        width, height = (float(part) for part in ratio.split(':'))
+        return width / height
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid aspect ratio: {ratio}")
+
+
+def crop_size(size: Tuple[int, int], ratio: str) -> Tuple[int, int]:
+    """
+    Return the largest crop of an aspect ratio that fits in an image (as the compositor crops).
+    
+    Args:
+        size: Source image size as (width, height)
+        ratio: Aspect ratio string
+    
+    Returns:
+        Crop size as (width, height)
+    """
+    width, height = size
+    target = parse_aspect_ratio(ratio)
+    if width / height > target:
+        return int(height * target), height
+    return width, int(width / target)
+
+
+@dataclass
+class GenerationPlan:
+    """
+    Which generation size each aspect ratio variant is cropped from.
+    
+    A product needs one provider call per distinct size; variants that
+    share a size are cropped from the same image.
+    """
+    
+    sources: Dict[str, Tuple[int, int]]
+    
+    @classmethod
+    def single(cls, aspect_ratios: Sequence[str],
+               size: Tuple[int, int] = DEFAULT_GENERATION_SIZE) -> 'GenerationPlan':
+        """Plan every variant from one image of the given size."""
+        return cls({ratio: tuple(size) for ratio in aspect_ratios})
+    
+    @property
+    def sizes(self) -> List[Tuple[int, int]]:
+        """Distinct sizes to generate, in the order of the aspect ratios that use them."""
+        return list(dict.fromkeys(self.sources.values()))
+    
+    @property
+    def calls(self) -> int:
+        """Provider calls per product."""
+        return len(self.sizes)
+    
+    def crop(self, ratio: str) -> Tuple[int, int]:
+        """Size of a variant's crop from its source image."""
+        return crop_size(self.sources[ratio], ratio)
+    
+    @property
+    def pixel_efficiency(self) -> float:
+        """Average share of its source image's pixels that each variant keeps."""
+        if not self.sources:
+            return 1.0
+        shares = [
+            _area(self.crop(ratio)) / _area(size) for ratio, size in self.sources.items()
+        ]
+        return sum(shares) / len(shares)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the plan for reports."""
+        return {
+            "sizes": [list(size) for size in self.sizes],
+            "calls_per_product": self.calls,
+            "pixel_efficiency": round(self.pixel_efficiency, 4),
+            "variants": {
+                ratio: {"source": list(size), "crop": list(self.crop(ratio))}
+                for ratio, size in self.sources.items()
+            }
+        }
+
+
+def plan_generation_sizes(aspect_ratios: Sequence[str],
+                          native_sizes: Optional[Sequence[Tuple[int, int]]] = None,
+                          max_calls: Optional[int] = None,
+                          default_size: Tuple[int, int] = DEFAULT_GENERATION_SIZE) -> GenerationPlan:
+    """
+    Choose the generation sizes that give the aspect ratios the most usable pixels.
+    
+    Every combination of at most max_calls candidate sizes is tried, each
+    aspect ratio taking the size that yields its largest crop (the smaller
+    image on a tie). The plan with the most crop pixels in total wins; ties
+    go to fewer calls, then fewer generated pixels. So without a limit,
+    variants that the same native size serves best share one call.
+    
+    Args:
+        aspect_ratios: Aspect ratio strings to produce
+        native_sizes: Sizes the provider generates natively, or None if it
+            accepts any size (candidates are then default_size and, per
+            aspect ratio, an image of that ratio with as many pixels)
+        max_calls: Most provider calls per product (default: one per aspect ratio)
+        default_size: Size generated without planning
+    
+    Returns:
+        GenerationPlan covering every aspect ratio
+    """
+    ratios = list(dict.fromkeys(aspect_ratios))
+    if not ratios:
+        return GenerationPlan({})
+    
+    if native_sizes:
+        candidates = list(dict.fromkeys(tuple(size) for size in native_sizes))
+    else:
+        pixels = _area(default_size)
+        candidates = list(dict.fromkeys(
+            [tuple(default_size)] + [_size_for_ratio(ratio, pixels) for ratio in ratios]
+        ))
+    
+    limit = min(len(candidates), len(ratios), max(1, len(ratios) if max_calls is None else max_calls))
+    best_score, best_plan = None, None
+    for count in range(1, limit + 1):
+        for subset in itertools.combinations(candidates, count):
+            plan = GenerationPlan({
+                ratio: max(subset, key=lambda size: (_area(crop_size(size, ratio)), -_area(size)))
+                for ratio in ratios
+            })
+            score = (
+                sum(_area(plan.crop(ratio)) for ratio in ratios),
+                -plan.calls,
+                -sum(_area(size) for size in plan.sizes)
+            )
+            if best_score is None or score > best_score:
+                best_score, best_plan = score, plan
+    return best_plan
+
+
+def _area(size: Tuple[int, int]) -> int:
+    return size[0] * size[1]
+
+
+def _size_for_ratio(ratio: str, pixels: int) -> Tuple[int, int]:
+    """Size of an image with the aspect ratio and about the given pixel count."""
+    target = parse_aspect_ratio(ratio)
+    return round(math.sqrt(pixels * target)), round(math.sqrt(pixels / target))
@@ -0,0 +1,55 @@
+"""Per-stage timing spans for pipeline runs."""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from ..models import StageTiming
+
+
+class TimingRecorder:
+    """Thread-safe collector of stage timing spans for one pipeline run."""
+    
+    def __init__(self):
+        self._spans: List[StageTiming] = []
+        self._lock = threading.Lock()
+    
+    def record(self, stage: str, product_id: str, aspect_ratio: Optional[str],
+               seconds: float) -> None:
+        """
+        Record a finished span.
+        
+        Args:
+            stage: Stage name (e.g., "generate", "save")
+            product_id: Product the work belonged to
+            aspect_ratio: Aspect ratio, or None for per-product stages
+            seconds: Wall-clock duration
+        """
+        span = StageTiming(stage=stage, product_id=product_id,
+                           aspect_ratio=aspect_ratio, seconds=seconds)
+        with self._lock:
+            self._spans.append(span)
+    
+    @contextmanager
+    def span(self, stage: str, product_id: str,
+             aspect_ratio: Optional[str] = None) -> Iterator[None]:
+        """Time the enclosed block; the span is recorded even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, product_id, aspect_ratio, time.perf_counter() - start)
+    
+    @property
+    def spans(self) -> List[StageTiming]:
+        """All spans recorded so far, in completion order."""
+        with self._lock:
+            return list(self._spans)
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
@@ -3,6 +3,7 @@
 import pytest
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 from PIL import Image
 
 from src.managers.asset_manager import AssetManager
@@ -92,6 +93,16 @@ class TestAssetManager:
         
         assert retrieved is None
 
+    def test_has_asset_without_loading(self, asset_manager, temp_dirs, sample_image):
+        """Test that has_asset probes for the file without opening it."""
+        input_dir, _ = temp_dirs
+        sample_image.save(Path(input_dir) / 'product_a.jpg')
+        
+        with patch('src.managers.asset_manager.Image.open') as image_open:
+            assert asset_manager.has_asset('product_a') is True
+            assert asset_manager.has_asset('nonexistent_product') is False
+        image_open.assert_not_called()
+
     def test_save_asset_creates_directory_structure(self, asset_manager, temp_dirs, sample_image):
         """Test that save_asset creates the proper directory structure."""
         _, output_dir = temp_dirs
@@ -233,3 +244,15 @@ class TestAssetManager:
         """Test filename generation normalizes case."""
         filename = asset_manager._generate_filename('product_a', '1X1')
         assert filename == '1x1_product_a.png'
+
+    def test_save_asset_as_jpeg(self, temp_dirs):
+        """Test that JPEG output uses the .jpg extension and drops alpha."""
+        input_dir, output_dir = temp_dirs
+        manager = AssetManager(input_dir, output_dir, output_format='jpeg')
+        
+        file_path = manager.save_asset('campaign_001', 'product_a', '1x1', Image.new('RGBA', (64, 64), 'red'))
+        
+        assert file_path.endswith('1x1_product_a.jpg')
+        assert Image.open(file_path).format == 'JPEG'
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            AssetManager(input_dir, output_dir, output_format='webp')
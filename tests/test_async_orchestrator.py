@@ -0,0 +1,165 @@
+"""Integration tests for AsyncPipelineOrchestrator."""
+
+import pytest
+import tempfile
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+from PIL import Image
+
+from src.async_orchestrator import AsyncPipelineOrchestrator
+from src.orchestrator import PipelineOrchestrator, create_orchestrator
+from src.models import PipelineResult
+
+
+@pytest.fixture
+def temp_dirs():
+    """Create temporary directories for testing."""
+    with tempfile.TemporaryDirectory() as input_dir, \
+         tempfile.TemporaryDirectory() as output_dir:
+        yield {
+            'input_dir': input_dir,
+            'output_dir': output_dir
+        }
+
+
+@pytest.fixture
+def test_config(temp_dirs):
+    """Create test configuration for the async engine."""
+    return {
+        'storage': {
+            'input_dir': temp_dirs['input_dir'],
+            'output_dir': temp_dirs['output_dir']
+        },
+        'aspect_ratios': ['1:1', '9:16', '16:9'],
+        'logging': {
+            'level': 'INFO',
+            'file': None
+        },
+        'performance': {
+            'engine': 'async',
+            'max_inflight_generations': 4,
+            'cpu_workers': 2
+        }
+    }
+
+
+@pytest.fixture
+def brief_file(temp_dirs):
+    """Create a brief with five products."""
+    brief_data = {
+        'campaign_id': 'async_campaign',
+        'products': [
+            {'product_id': f'product_{i}', 'name': f'Product {i}'}
+            for i in range(5)
+        ],
+        'target_region': 'US',
+        'target_audience': 'everyone',
+        'campaign_message': 'Buy now'
+    }
+    brief_path = Path(temp_dirs['input_dir']) / 'async_brief.json'
+    with open(brief_path, 'w') as f:
+        json.dump(brief_data, f)
+    return str(brief_path)
+
+
+def test_create_orchestrator_selects_engine(test_config):
+    """Test that performance.engine selects the orchestrator class."""
+    assert isinstance(create_orchestrator(test_config), AsyncPipelineOrchestrator)
+    
+    test_config['performance']['engine'] = 'sync'
+    orchestrator = create_orchestrator(test_config)
+    assert type(orchestrator) is PipelineOrchestrator
+    
+    test_config['performance']['engine'] = 'warp'
+    with pytest.raises(ValueError, match="Unsupported pipeline engine"):
+        create_orchestrator(test_config)
+
+
+def test_async_run_keeps_generations_in_flight(test_config, brief_file):
+    """Test that several generation requests overlap and outputs keep brief order."""
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+    
+    def slow_generate(prompt, *args, **kwargs):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        # Later products finish first
+        time.sleep(0.02 * (5 - int(prompt[-1])))
+        with lock:
+            state['active'] -= 1
+        return Image.new('RGB', (256, 256), color='green')
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(side_effect=lambda product_name, **kwargs: product_name)
+    mock_client.generate_image = Mock(side_effect=slow_generate)
+    
+    orchestrator = AsyncPipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    result = orchestrator.run(brief_file)
+    
+    assert isinstance(result, PipelineResult)
+    assert result.success is True
+    assert state['peak'] == 4
+    expected = [
+        (f'product_{i}', ratio)
+        for i in range(5)
+        for ratio in ['1:1', '9:16', '16:9']
+    ]
+    assert [(a.product_id, a.aspect_ratio) for a in result.outputs] == expected
+    assert all(a.was_generated for a in result.outputs)
+
+
+def test_async_run_isolates_failures(test_config, brief_file, temp_dirs):
+    """Test that one failed generation does not stop other products."""
+    # product_0 has an input asset and is never generated
+    Image.new('RGB', (300, 300), color='red').save(Path(temp_dirs['input_dir']) / 'product_0.png')
+    
+    def generate(prompt, *args, **kwargs):
+        if prompt.endswith('3'):
+            raise Exception("Generation failed")
+        return Image.new('RGB', (256, 256), color='green')
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(side_effect=lambda product_name, **kwargs: product_name)
+    mock_client.generate_image = Mock(side_effect=generate)
+    
+    orchestrator = AsyncPipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    result = orchestrator.run(brief_file)
+    
+    assert result.success is False
+    assert len(result.errors) == 1
+    assert 'product_3' in result.errors[0]
+    assert len(result.outputs) == 12
+    assert mock_client.generate_image.call_count == 4
+    assert [a.was_generated for a in result.outputs[:3]] == [False, False, False]
+
+
+def test_async_run_awaits_native_async_clients(test_config, brief_file):
+    """Test that clients with agenerate_image are awaited instead of run on threads."""
+    from src.clients.local_client import LocalImageClient
+    
+    class AsyncOnlyClient(LocalImageClient):
+        closed = False
+        
+        def generate_image(self, prompt, size=(1024, 1024)):
+            raise AssertionError("blocking path used")
+        
+        async def aclose(self):
+            self.closed = True
+    
+    client = AsyncOnlyClient(latency=0.05, image_size=(128, 128))
+    orchestrator = AsyncPipelineOrchestrator(test_config)
+    orchestrator.genai_client = client
+    
+    result = orchestrator.run(brief_file)
+    
+    assert result.success is True
+    assert len(result.outputs) == 15
+    assert client.closed is True
@@ -0,0 +1,159 @@
+"""Tests for multi-brief batch execution."""
+
+import pytest
+import tempfile
+import json
+from pathlib import Path
+from unittest.mock import Mock
+from PIL import Image
+
+from src.batch import BatchRunner, resolve_briefs
+from src.orchestrator import PipelineOrchestrator
+from src.utils.reporter import PipelineReporter
+
+
+@pytest.fixture
+def temp_dirs():
+    """Create temporary directories for testing."""
+    with tempfile.TemporaryDirectory() as input_dir, \
+         tempfile.TemporaryDirectory() as output_dir, \
+         tempfile.TemporaryDirectory() as brief_dir:
+        yield {
+            'input_dir': input_dir,
+            'output_dir': output_dir,
+            'brief_dir': brief_dir
+        }
+
+
+@pytest.fixture
+def test_config(temp_dirs):
+    """Create test configuration."""
+    return {
+        'storage': {
+            'input_dir': temp_dirs['input_dir'],
+            'output_dir': temp_dirs['output_dir']
+        },
+        'aspect_ratios': ['1:1', '16:9'],
+        'logging': {
+            'level': 'INFO',
+            'file': None
+        }
+    }
+
+
+def brief_data(campaign_id):
+    """Build a one-product brief."""
+    return {
+        'campaign_id': campaign_id,
+        'products': [{'product_id': f'{campaign_id}_sku', 'name': 'Widget'}],
+        'target_region': 'US',
+        'target_audience': 'everyone',
+        'campaign_message': 'Buy now'
+    }
+
+
+@pytest.fixture
+def brief_files(temp_dirs):
+    """Write three JSON briefs and one unrelated file."""
+    brief_dir = Path(temp_dirs['brief_dir'])
+    paths = []
+    for name in ['campaign_b', 'campaign_a', 'campaign_c']:
+        path = brief_dir / f'{name}.json'
+        path.write_text(json.dumps(brief_data(name)))
+        paths.append(str(path))
+    (brief_dir / 'notes.txt').write_text('not a brief')
+    return sorted(paths)
+
+
+def test_resolve_briefs_directory(brief_files, temp_dirs):
+    """Test that a directory expands to its brief files in name order."""
+    assert resolve_briefs(temp_dirs['brief_dir'], temp_dirs['output_dir']) == brief_files
+
+
+def test_resolve_briefs_glob(brief_files, temp_dirs):
+    """Test that glob patterns are expanded."""
+    pattern = str(Path(temp_dirs['brief_dir']) / 'campaign_[ab].json')
+    assert resolve_briefs(pattern, temp_dirs['output_dir']) == brief_files[:2]
+
+
+def test_resolve_briefs_jsonl(temp_dirs):
+    """Test that each .jsonl line becomes its own brief file."""
+    jsonl_path = Path(temp_dirs['brief_dir']) / 'nightly.jsonl'
+    jsonl_path.write_text(
+        json.dumps(brief_data('first')) + '\n\n' + json.dumps(brief_data('second')) + '\n'
+    )
+    
+    briefs = resolve_briefs(str(jsonl_path), temp_dirs['output_dir'])
+    
+    assert len(briefs) == 2
+    assert json.loads(Path(briefs[1]).read_text())['campaign_id'] == 'second'
+
+
+def test_resolve_briefs_no_match(temp_dirs):
+    """Test that an empty match is reported."""
+    with pytest.raises(FileNotFoundError, match="No campaign briefs found"):
+        resolve_briefs(str(Path(temp_dirs['brief_dir']) / '*.yaml'), temp_dirs['output_dir'])
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_batch_runner_shares_orchestrator(test_config, brief_files, temp_dirs, concurrency):
+    """Test that every brief runs on one orchestrator and a batch report is written."""
+    def generate(prompt, *args, **kwargs):
+        return Image.new('RGB', (200, 200), color='orange')
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="prompt")
+    mock_client.generate_image = Mock(side_effect=generate)
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    results, report = BatchRunner(orchestrator, max_concurrent_briefs=concurrency).run(brief_files)
+    
+    assert [r.campaign_id for r in results] == ['campaign_a', 'campaign_b', 'campaign_c']
+    assert mock_client.generate_image.call_count == 3
+    assert report['success'] is True
+    assert report['summary']['briefs_total'] == 3
+    assert report['summary']['total_assets'] == 6
+    
+    batch_report_path = Path(temp_dirs['output_dir']) / 'batch_report.json'
+    with open(batch_report_path) as f:
+        saved = json.load(f)
+    assert saved['campaigns'][0]['campaign_id'] == 'campaign_a'
+    for campaign in saved['campaigns']:
+        assert Path(campaign['report_path']).exists()
+
+
+def test_batch_report_follows_preview_output_dir(test_config, brief_files, temp_dirs):
+    """Test that the reported batch report path is where a preview batch wrote it."""
+    test_config['preview'] = {'enabled': True}
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = Mock(_build_prompt=Mock(return_value="prompt"),
+                                     generate_image=Mock(return_value=Image.new('RGB', (200, 200))))
+    runner = BatchRunner(orchestrator)
+    
+    runner.run(brief_files)
+    
+    assert runner.default_report_path == str(Path(temp_dirs['output_dir']) / 'preview' / 'batch_report.json')
+    assert Path(runner.default_report_path).exists()
+    assert not (Path(temp_dirs['output_dir']) / 'batch_report.json').exists()
+
+
+def test_batch_runner_continues_after_failed_brief(test_config, brief_files, temp_dirs):
+    """Test that a broken brief is reported without stopping the batch."""
+    broken = Path(temp_dirs['brief_dir']) / 'broken.json'
+    broken.write_text('{ not json')
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="prompt")
+    mock_client.generate_image = Mock(return_value=Image.new('RGB', (200, 200)))
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    results, report = BatchRunner(orchestrator).run([str(broken)] + brief_files)
+    
+    assert report['success'] is False
+    assert report['summary']['briefs_failed'] == 1
+    assert report['summary']['briefs_succeeded'] == 3
+    assert "BATCH EXECUTION SUMMARY" in PipelineReporter.format_batch_summary(report)
@@ -0,0 +1,109 @@
+"""Tests for the synthetic throughput benchmark."""
+
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from src.bench import DEFERRED_MODULES, STARTUP_BUDGET_SECONDS, main, measure_startup, run_benchmark
+from src.utils import circuit_breaker
+
+
+def test_run_benchmark_reports_throughput():
+    """Test that the benchmark runs the pipeline and reports its metrics."""
+    result = run_benchmark(briefs=2, products=2, aspect_ratios=['1:1', '16:9'], image_size=128)
+    
+    metrics = result['results']
+    assert metrics['assets'] == 8
+    assert metrics['assets_per_second'] > 0
+    assert metrics['cpu_seconds'] >= 0
+    assert metrics['peak_rss_mb']['self'] > 0
+    assert metrics['stage_latency']['generate']['count'] == 4
+    assert metrics['stage_latency']['save']['count'] == 8
+    assert result['benchmark']['products_per_brief'] == 2
+
+
+def test_bench_cli_writes_json(tmp_path, capsys):
+    """Test the command-line entry point."""
+    output = tmp_path / 'bench.json'
+    
+    exit_code = main([
+        '--products', '1', '--aspect-ratios', '1:1', '--image-size', '64',
+        '--engine', 'streaming', '--output', str(output)
+    ])
+    
+    assert exit_code == 0
+    written = json.loads(output.read_text())
+    assert written == json.loads(capsys.readouterr().out)
+    assert written['benchmark']['engine'] == 'streaming'
+    assert written['results']['assets'] == 1
+
+
+def test_bench_measures_response_formats():
+    """Test that URL delivery pays the simulated download round-trip."""
+    b64 = run_benchmark(products=2, aspect_ratios=['1:1'], image_size=64, response_format='b64_json')
+    url = run_benchmark(products=2, aspect_ratios=['1:1'], image_size=64, response_format='url', round_trip=0.1)
+    
+    assert b64['benchmark']['response_format'] == 'b64_json'
+    assert url['benchmark']['round_trip_seconds'] == 0.1
+    assert url['results']['stage_latency']['generate']['p50_seconds'] >= 0.1
+    assert b64['results']['stage_latency']['generate']['p50_seconds'] < url['results']['stage_latency']['generate']['p50_seconds']
+
+
+def test_bench_injects_provider_failures(monkeypatch):
+    """Test that failure injection is reproducible and reported instead of raised."""
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    settings = {'failure_rate': 0.5, 'retry_delay': 0.0, 'max_retries': 1, 'seed': 3}
+    first = run_benchmark(products=8, aspect_ratios=['1:1'], image_size=32, local_settings=settings)
+    second = run_benchmark(products=8, aspect_ratios=['1:1'], image_size=32, local_settings=settings)
+    
+    assert 0 < first['results']['errors'] < 8
+    assert first['results']['errors'] == second['results']['errors']
+    assert first['results']['assets'] == 8 - first['results']['errors']
+    assert first['benchmark']['local_provider'] == settings
+    assert 'genai_rate_limit' in first['results']['genai'][0]
+
+
+def test_startup_stays_within_budget():
+    """Test that importing the pipeline defers GenAI SDKs and compliance dependencies."""
+    result = measure_startup(runs=3)
+    
+    assert result['deferred_loaded'] == []
+    assert result['import_seconds']['min'] <= STARTUP_BUDGET_SECONDS
+    assert result['slowest_imports']
+
+
+def test_asset_only_run_never_imports_genai_sdk(tmp_path):
+    """Test that a run where every product has an input asset leaves the SDKs unloaded."""
+    script = textwrap.dedent(f"""
+        import json, sys
+        from PIL import Image
+        from src.orchestrator import create_orchestrator
+        
+        input_dir = {str(tmp_path / 'input')!r}
+        Image.new('RGB', (64, 64), 'red').save(input_dir + '/shoe.png')
+        with open(input_dir + '/brief.json', 'w') as f:
+            json.dump({{'campaign_id': 'assets_only', 'products': [{{'product_id': 'shoe', 'name': 'Shoe'}}],
+                       'target_region': 'US', 'target_audience': 'runners',
+                       'campaign_message': 'Run further'}}, f)
+        
+        orchestrator = create_orchestrator({{
+            'storage': {{'input_dir': input_dir, 'output_dir': {str(tmp_path / 'output')!r}}},
+            'genai': {{'provider': 'openai', 'api_key': 'test-key', 'fallbacks': [
+                {{'provider': 'imagen', 'api_key': 'test-key'}}]}},
+            'aspect_ratios': ['1:1'],
+            'logging': {{'level': 'ERROR', 'file': None}}
+        }})
+        result = orchestrator.run(input_dir + '/brief.json')
+        orchestrator.close()
+        print(json.dumps({{'success': result.success, 'loaded': [
+            module for module in {DEFERRED_MODULES!r} if module in sys.modules]}}))
+    """)
+    (tmp_path / 'input').mkdir()
+    
+    completed = subprocess.run([sys.executable, '-c', script], cwd=Path(__file__).resolve().parent.parent,
+                               capture_output=True, text=True, check=True)
+    
+    outcome = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert outcome == {'success': True, 'loaded': []}
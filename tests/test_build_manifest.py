@@ -0,0 +1,82 @@
+"""Unit tests for BuildManifest and output fingerprints."""
+
+import json
+import pytest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from PIL import Image
+
+from src.managers.build_manifest import BuildManifest, compute_fingerprint, hash_image
+
+
+class TestFingerprints:
+    """Test suite for image hashing and fingerprint computation."""
+    
+    def test_hash_image_depends_on_pixels(self):
+        """Test that identical images hash equally and different pixels do not."""
+        red = Image.new('RGB', (10, 10), color='red')
+        assert hash_image(red) == hash_image(Image.new('RGB', (10, 10), color='red'))
+        assert hash_image(red) != hash_image(Image.new('RGB', (10, 10), color='blue'))
+        assert hash_image(red) != hash_image(Image.new('RGB', (10, 11), color='red'))
+    
+    def test_fingerprint_covers_all_inputs(self):
+        """Test that every input to an output changes its fingerprint."""
+        settings = {'font_size': 48, 'compositor_version': '1'}
+        base = compute_fingerprint('abc', '1:1', 'Hello', settings)
+        
+        assert base == compute_fingerprint('abc', '1:1', 'Hello', dict(settings))
+        assert base != compute_fingerprint('abd', '1:1', 'Hello', settings)
+        assert base != compute_fingerprint('abc', '9:16', 'Hello', settings)
+        assert base != compute_fingerprint('abc', '1:1', 'Hello!', settings)
+        assert base != compute_fingerprint('abc', '1:1', 'Hello', {**settings, 'font_size': 50})
+        assert base != compute_fingerprint('abc', '1:1', 'Hello', {**settings, 'compositor_version': '2'})
+
+
+class TestBuildManifest:
+    """Test suite for BuildManifest class."""
+    
+    @pytest.fixture
+    def temp_dir(self):
+        """Fixture providing a temporary directory."""
+        with TemporaryDirectory() as tmp:
+            yield Path(tmp)
+    
+    def test_record_and_reload(self, temp_dir):
+        """Test that recorded fingerprints survive a save and reload."""
+        output = temp_dir / 'out.png'
+        output.write_bytes(b'png')
+        manifest_path = temp_dir / 'manifest.json'
+        
+        manifest = BuildManifest(str(manifest_path))
+        key = BuildManifest.key('sku', '1:1')
+        assert manifest.is_up_to_date(key, 'fp1') is None
+        
+        manifest.record(key, 'fp1', str(output))
+        manifest.save()
+        
+        reloaded = BuildManifest(str(manifest_path))
+        assert reloaded.is_up_to_date(key, 'fp1') == str(output)
+        assert reloaded.is_up_to_date(key, 'fp2') is None
+    
+    def test_missing_output_is_stale(self, temp_dir):
+        """Test that a deleted output is rebuilt even with a matching fingerprint."""
+        manifest = BuildManifest(str(temp_dir / 'manifest.json'))
+        manifest.record('sku/1:1', 'fp1', str(temp_dir / 'gone.png'))
+        
+        assert manifest.is_up_to_date('sku/1:1', 'fp1') is None
+    
+    def test_corrupt_manifest_starts_empty(self, temp_dir):
+        """Test that an unreadable manifest falls back to a full rebuild."""
+        manifest_path = temp_dir / 'manifest.json'
+        manifest_path.write_text('{ broken')
+        
+        manifest = BuildManifest(str(manifest_path))
+        
+        assert manifest.is_up_to_date('sku/1:1', 'fp1') is None
+    
+    def test_save_skips_unchanged_manifest(self, temp_dir):
+        """Test that saving without new records does not write a file."""
+        manifest_path = temp_dir / 'manifest.json'
+        BuildManifest(str(manifest_path)).save()
+        
+        assert not manifest_path.exists()
@@ -0,0 +1,149 @@
+"""Unit tests for recording GenAI responses to cassettes and replaying them."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.clients.cassette_client import RecordingGenAIClient, ReplayGenAIClient
+from src.clients.genai_client import ImageRequest
+from src.clients.local_client import LocalImageClient
+from src.managers.cassette import Cassette, request_key
+
+
+class FlakyProvider(LocalImageClient):
+    """Local client that fails the prompts it is told to."""
+    
+    def __init__(self, failing=(), **kwargs):
+        super().__init__(**kwargs)
+        self.failing = failing
+    
+    def generate_image(self, prompt, size=(1024, 1024)):
+        if prompt in self.failing:
+            raise RuntimeError(f"upstream 503 for {prompt}")
+        return super().generate_image(prompt, size)
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """Record a few responses from a slowish local provider."""
+    cassette_dir = tmp_path / "cassette"
+    client = RecordingGenAIClient(FlakyProvider(failing=("broken",), latency=0.05),
+                                  Cassette(str(cassette_dir)))
+    client.generate_image("a red bicycle", (64, 64))
+    client.generate_image("a blue bicycle", (64, 64))
+    with pytest.raises(RuntimeError):
+        client.generate_image("broken", (64, 64))
+    return cassette_dir
+
+
+class TestCassette:
+    """Test suite for the cassette store."""
+    
+    def test_records_survive_reload(self, recorded):
+        """Test that a cassette reloads what was recorded."""
+        cassette = Cassette(str(recorded))
+        
+        assert len(cassette) == 3
+        [interaction] = cassette.interactions(request_key("a  red bicycle ", (64, 64)))
+        assert interaction['provider'] == "local"
+        assert interaction['seconds'] >= 0.05
+        assert cassette.load_image(interaction['image']).size == (64, 64)
+        [failure] = cassette.interactions(request_key("broken", (64, 64)))
+        assert failure['image'] is None
+        assert "upstream 503" in failure['error']
+    
+    def test_torn_final_line_is_dropped(self, recorded):
+        """Test that a partial record from a crash is discarded before appending."""
+        with open(recorded / "interactions.jsonl", 'a', encoding='utf-8') as f:
+            f.write('{"key": "torn')
+        
+        cassette = Cassette(str(recorded))
+        cassette.record("a green bicycle", (64, 64), "local", "local", 0.01, error=RuntimeError("x"))
+        
+        assert len(Cassette(str(recorded))) == 4
+
+
+class TestReplayGenAIClient:
+    """Test suite for replaying cassettes."""
+    
+    def test_replays_images_and_latency(self, recorded):
+        """Test that replay serves the recorded pixels after the recorded delay."""
+        client = ReplayGenAIClient(Cassette(str(recorded)))
+        live = LocalImageClient().generate_image("a red bicycle", (64, 64))
+        
+        start = time.perf_counter()
+        image = client.generate_image("a red bicycle", (64, 64))
+        
+        assert time.perf_counter() - start >= 0.05
+        assert image.tobytes() == live.tobytes()
+        assert client.stats() == {"requests": 1, "replayed": 1, "substituted": 0, "errors": 0}
+    
+    def test_replays_recorded_errors(self, recorded):
+        """Test that a recorded provider failure fails again."""
+        client = ReplayGenAIClient(Cassette(str(recorded)), latency_scale=0)
+        
+        with pytest.raises(Exception, match="upstream 503"):
+            client.generate_image("broken", (64, 64))
+        assert client.stats()['errors'] == 1
+    
+    def test_cycles_through_repeated_recordings(self, tmp_path):
+        """Test that repeated requests get the recordings in order, then wrap around."""
+        cassette = Cassette(str(tmp_path))
+        cassette.record("hero", (16, 16), "local", "local", 0, error=RuntimeError("first"))
+        cassette.record("hero", (16, 16), "local", "local", 0, image=LocalImageClient().generate_image("x", (16, 16)))
+        client = ReplayGenAIClient(cassette)
+        
+        with pytest.raises(Exception, match="first"):
+            client.generate_image("hero", (16, 16))
+        assert client.generate_image("hero", (16, 16)).size == (16, 16)
+        with pytest.raises(Exception, match="first"):
+            client.generate_image("hero", (16, 16))
+    
+    def test_unrecorded_requests(self, tmp_path):
+        """Test substitution of unrecorded requests, and strict mode."""
+        cassette = Cassette(str(tmp_path))
+        cassette.record("hero", (16, 16), "local", "local", 0, image=LocalImageClient().generate_image("x", (16, 16)))
+        lenient = ReplayGenAIClient(cassette)
+        strict = ReplayGenAIClient(cassette, strict=True)
+        
+        assert lenient.generate_image("a new prompt", (32, 48)).size == (32, 48)
+        assert lenient.stats()['substituted'] == 1
+        with pytest.raises(Exception, match="No recorded response"):
+            strict.generate_image("a new prompt", (32, 48))
+    
+    def test_empty_cassette_is_rejected(self, tmp_path):
+        """Test that replaying an empty cassette fails up front."""
+        with pytest.raises(ValueError, match="no recorded interactions"):
+            ReplayGenAIClient(Cassette(str(tmp_path / "missing")))
+    
+    def test_async_replay(self, recorded):
+        """Test that async replay serves the same recordings concurrently."""
+        client = ReplayGenAIClient(Cassette(str(recorded)), latency_scale=0.5)
+        
+        async def replay():
+            return await asyncio.gather(
+                client.agenerate_image("a red bicycle", (64, 64)),
+                client.agenerate_image("a blue bicycle", (64, 64))
+            )
+        
+        start = time.perf_counter()
+        images = asyncio.run(replay())
+        
+        assert time.perf_counter() - start < 0.09
+        assert [image.size for image in images] == [(64, 64), (64, 64)]
+    
+    def test_batch_recording_and_replay(self, tmp_path):
+        """Test that batch results are recorded one per image."""
+        cassette = Cassette(str(tmp_path))
+        recorder = RecordingGenAIClient(FlakyProvider(failing=("b",)), cassette)
+        
+        results = recorder.generate_images([ImageRequest("a", (16, 16)), ImageRequest("b", (16, 16))])
+        replayed = ReplayGenAIClient(Cassette(str(tmp_path))).generate_images(
+            [ImageRequest("a", (16, 16)), ImageRequest("b", (16, 16))]
+        )
+        
+        assert [result.ok for result in results] == [True, False]
+        assert [result.ok for result in replayed] == [True, False]
+        assert replayed[0].image.tobytes() == results[0].image.tobytes()
+
@@ -0,0 +1,200 @@
+"""Unit tests for the GenAI provider circuit breaker."""
+
+import time
+from unittest.mock import Mock, patch
+
+import openai
+import pytest
+
+from src.clients import gemini_client
+from src.clients.failover_client import FailoverGenAIClient
+from src.clients.gemini_client import ImagenClient
+from src.clients.local_client import LocalImageClient
+from src.clients.openai_client import OpenAIClient
+from src.utils import circuit_breaker
+from src.utils.circuit_breaker import (
+    CircuitBreaker, CircuitBreakerGroup, CircuitOpenError, configure_circuit_breaker, get_circuit_breaker
+)
+
+
+@pytest.fixture
+def fresh_breakers(monkeypatch):
+    """Give the test its own process-wide breaker registry."""
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the threshold of consecutive failures opens the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=3)
+        
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure(RuntimeError("503"))
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+        
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure(RuntimeError("503"))
+        
+        assert breaker.state == "open"
+        stats = breaker.stats()
+        assert stats['failures'] == 5
+        assert stats['opened'] == 1
+        assert stats['transitions'][-1]['to'] == "open"
+        assert "3 consecutive failures: 503" in stats['transitions'][-1]['reason']
+    
+    def test_open_circuit_fails_fast(self):
+        """Test that calls are rejected while the circuit is open."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+        breaker.before_call()
+        breaker.record_failure()
+        
+        with pytest.raises(CircuitOpenError, match="test circuit is open"):
+            breaker.before_call()
+        assert breaker.stats()['rejected'] == 1
+    
+    def test_half_open_probe_closes_on_success(self):
+        """Test that one probe is admitted after the reset timeout and closes the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        breaker.before_call()
+        breaker.record_failure()
+        time.sleep(0.06)
+        
+        breaker.before_call()
+        assert breaker.state == "half_open"
+        with pytest.raises(CircuitOpenError, match="probe in progress"):
+            breaker.before_call()
+        
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert [t['to'] for t in breaker.stats()['transitions']] == ["open", "half_open", "closed"]
+    
+    def test_half_open_probe_reopens_on_failure(self):
+        """Test that a failed probe opens the circuit again."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        breaker.before_call()
+        breaker.record_failure()
+        time.sleep(0.06)
+        
+        breaker.before_call()
+        breaker.record_failure(RuntimeError("still down"))
+        
+        assert breaker.state == "open"
+        assert breaker.stats()['opened'] == 2
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+    
+    def test_guard_ignores_listed_errors(self):
+        """Test that guard() counts failures but not ignored error types."""
+        breaker = CircuitBreaker("test", failure_threshold=1)
+        
+        with pytest.raises(KeyError):
+            with breaker.guard(failures=(LookupError,), ignored=(KeyError,)):
+                raise KeyError("rate limited")
+        assert breaker.state == "closed"
+        
+        with pytest.raises(IndexError):
+            with breaker.guard(failures=(LookupError,), ignored=(KeyError,)):
+                raise IndexError("server error")
+        assert breaker.state == "open"
+    
+    def test_breakers_are_shared_per_provider(self, fresh_breakers):
+        """Test the process-wide registry and the grouped stats."""
+        breaker = configure_circuit_breaker('test-shared', {'failure_threshold': 2, 'reset_timeout_seconds': 5})
+        
+        assert get_circuit_breaker('test-shared') is breaker
+        assert breaker.failure_threshold == 2
+        assert breaker.reset_timeout == 5
+        group = CircuitBreakerGroup(['test-shared', 'test-other', 'test-shared'])
+        assert list(group.stats()) == ['test-shared', 'test-other']
+
+
+class TestCircuitBreakerIntegration:
+    """Test the breaker inside provider and failover clients."""
+    
+    @patch.object(OpenAIClient, '_download_image')
+    def test_open_circuit_stops_openai_retries(self, mock_download, fresh_breakers):
+        """Test that the OpenAI client stops retrying once its circuit opens."""
+        configure_circuit_breaker('openai', {'failure_threshold': 2, 'reset_timeout_seconds': 60})
+        client = OpenAIClient(api_key="test-api-key")
+        client.max_retries = 5
+        
+        with patch.object(client.client.images, 'generate',
+                          side_effect=openai.InternalServerError("Service unavailable", response=Mock(),
+                                                                 body=None)) as mock_generate:
+            with patch('time.sleep'):
+                with pytest.raises(CircuitOpenError):
+                    client.generate_image("Test prompt")
+                with pytest.raises(CircuitOpenError):
+                    client.generate_image("Test prompt")
+        
+        assert mock_generate.call_count == 2
+        assert client.circuit_breaker.state == "open"
+    
+    @patch.object(OpenAIClient, '_download_image')
+    def test_rate_limits_do_not_open_the_circuit(self, mock_download, fresh_breakers):
+        """Test that 429s are left to the rate limiter."""
+        configure_circuit_breaker('openai', {'failure_threshold': 1})
+        client = OpenAIClient(api_key="test-api-key")
+        
+        with patch.object(client.client.images, 'generate',
+                          side_effect=openai.RateLimitError("Rate limit", response=Mock(), body=None)):
+            with patch('time.sleep'):
+                with pytest.raises(Exception, match="Rate limit exceeded"):
+                    client.generate_image("Test prompt")
+        
+        assert client.circuit_breaker.state == "closed"
+    
+    @patch.object(OpenAIClient, '_download_image')
+    def test_rejected_requests_do_not_open_the_circuit(self, mock_download, fresh_breakers):
+        """Test that 4xx errors such as content-policy rejections are not counted."""
+        configure_circuit_breaker('openai', {'failure_threshold': 1})
+        client = OpenAIClient(api_key="test-api-key")
+        
+        with patch.object(client.client.images, 'generate',
+                          side_effect=openai.BadRequestError("Content policy violation", response=Mock(),
+                                                             body=None)):
+            with patch('time.sleep'):
+                with pytest.raises(Exception, match="Content policy violation"):
+                    client.generate_image("Test prompt")
+        
+        assert client.circuit_breaker.state == "closed"
+        assert client.circuit_breaker.stats()['failures'] == 0
+    
+    def test_imagen_counts_only_outages(self, fresh_breakers, monkeypatch):
+        """Test that Imagen opens its circuit on 503s but not on invalid requests."""
+        monkeypatch.setattr(gemini_client, 'VERTEX_AVAILABLE', True)
+        configure_circuit_breaker('imagen', {'failure_threshold': 1})
+        client = ImagenClient(api_key="test-api-key", max_retries=1)
+        client._model = Mock()
+        
+        client._model.generate_images.side_effect = type('InvalidArgument', (Exception,), {'code': 400})("bad prompt")
+        with pytest.raises(Exception, match="bad prompt"):
+            client.generate_image("Test prompt")
+        assert client.circuit_breaker.state == "closed"
+        
+        client._model.generate_images.side_effect = type('ServiceUnavailable', (Exception,), {'code': 503})("down")
+        with pytest.raises(Exception, match="down"):
+            client.generate_image("Test prompt")
+        assert client.circuit_breaker.state == "open"
+    
+    def test_failover_skips_provider_with_open_circuit(self, fresh_breakers):
+        """Test that an open circuit sends requests straight to the next provider."""
+        get_circuit_breaker('openai').configure(failure_threshold=1, reset_timeout=60)
+        get_circuit_breaker('openai').record_failure()
+        primary = OpenAIClient(api_key="test-api-key")
+        secondary = LocalImageClient()
+        client = FailoverGenAIClient([primary, secondary])
+        
+        with patch.object(primary.client.images, 'generate') as mock_generate:
+            image = client.generate_image("a red bicycle", (64, 64))
+        
+        assert image.size == (64, 64)
+        mock_generate.assert_not_called()
+        assert client.stats()['openai']['failures'] == 1
+        assert client.stats()['local']['wins'] == 1
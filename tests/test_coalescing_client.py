@@ -0,0 +1,177 @@
+"""Unit tests for CoalescingGenAIClient."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+from src.clients.coalescing_client import CoalescingGenAIClient
+from src.clients.genai_client import ImageRequest
+from src.clients.local_client import LocalImageClient
+
+
+class GatedClient(LocalImageClient):
+    """Local client whose generations block until released."""
+    
+    def __init__(self, error=None):
+        super().__init__()
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = 0
+        self.error = error
+    
+    def generate_image(self, prompt, size=(1024, 1024)):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return super().generate_image(prompt, size)
+
+
+def _run_concurrently(client, prompts, size=(64, 64)):
+    """Start one generation per prompt, release the inner client once all are waiting."""
+    with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+        futures = [executor.submit(client.generate_image, prompt, size) for prompt in prompts]
+        client.client.started.wait(5)
+        # Give followers time to join the in-flight call before it finishes
+        for _ in range(100):
+            if client.stats()['requests'] == len(prompts):
+                break
+            threading.Event().wait(0.01)
+        client.client.release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+class TestCoalescingGenAIClient:
+    """Test suite for in-flight request coalescing."""
+    
+    def test_identical_requests_share_one_call(self):
+        """Test that concurrent identical prompts make a single provider call."""
+        client = CoalescingGenAIClient(GatedClient())
+        
+        images = _run_concurrently(client, ["a red bicycle", "a  red bicycle ", "a red bicycle"])
+        
+        assert client.client.calls == 1
+        assert client.stats() == {"requests": 3, "coalesced": 2}
+        assert len({image.tobytes() for image in images}) == 1
+        # Every caller owns its image
+        assert len({id(image) for image in images}) == 3
+    
+    def test_different_requests_are_not_coalesced(self):
+        """Test that different prompts and sizes generate separately."""
+        client = CoalescingGenAIClient(LocalImageClient())
+        
+        client.generate_image("a red bicycle", (64, 64))
+        client.generate_image("a red bicycle", (32, 32))
+        client.generate_image("a blue bicycle", (64, 64))
+        
+        assert client.stats() == {"requests": 3, "coalesced": 0}
+    
+    def test_sequential_requests_generate_again(self):
+        """Test that nothing is reused once a call has completed."""
+        inner = GatedClient()
+        inner.release.set()
+        client = CoalescingGenAIClient(inner)
+        
+        client.generate_image("a red bicycle", (64, 64))
+        client.generate_image("a red bicycle", (64, 64))
+        
+        assert inner.calls == 2
+        assert client.stats()['coalesced'] == 0
+    
+    def test_error_is_raised_to_every_waiter(self):
+        """Test that a failed generation fails all coalesced callers."""
+        client = CoalescingGenAIClient(GatedClient(error=RuntimeError("provider down")))
+        
+        outcomes = _run_concurrently(client, ["a red bicycle"] * 3)
+        
+        assert client.client.calls == 1
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        
+        # The failed call is not remembered
+        client.client.error = None
+        assert client.generate_image("a red bicycle", (64, 64)).size == (64, 64)
+    
+    def test_delegates_identity(self):
+        """Test that provider and model come from the wrapped client."""
+        client = CoalescingGenAIClient(LocalImageClient(seed=3))
+        
+        assert client.provider_name == "local"
+        assert client.model_id == "local-seed3"
+    
+    def test_batch_shares_identical_requests(self):
+        """Test that identical requests in a batch make one provider call."""
+        inner = GatedClient()
+        inner.release.set()
+        client = CoalescingGenAIClient(inner)
+        requests = [ImageRequest("a red bicycle", (64, 64)), ImageRequest("a  red bicycle", (64, 64)),
+                    ImageRequest("a blue bicycle", (64, 64))]
+        
+        results = client.generate_images(requests)
+        
+        assert inner.calls == 2
+        assert client.stats() == {"requests": 3, "coalesced": 1}
+        assert [result.request for result in results] == requests
+        assert results[0].image.tobytes() == results[1].image.tobytes() != results[2].image.tobytes()
+        assert results[0].image is not results[1].image
+    
+    def test_batch_joins_request_in_flight(self):
+        """Test that a batch waits for an identical single request already running."""
+        client = CoalescingGenAIClient(GatedClient(error=RuntimeError("provider down")))
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            single = executor.submit(client.generate_image, "a red bicycle", (64, 64))
+            client.client.started.wait(5)
+            batch = executor.submit(client.generate_images, [ImageRequest("a red bicycle", (64, 64))])
+            for _ in range(100):
+                if client.stats()['requests'] == 2:
+                    break
+                threading.Event().wait(0.01)
+            client.client.release.set()
+        
+        assert client.client.calls == 1
+        assert isinstance(single.exception(), RuntimeError)
+        assert batch.result()[0].error == "provider down"
+
+    
+    def test_async_identical_requests_share_one_call(self):
+        """Test that concurrent identical async requests await a single generation."""
+        inner = LocalImageClient(latency=0.05)
+        inner.agenerate_image = AsyncMock(side_effect=inner.agenerate_image)
+        client = CoalescingGenAIClient(inner)
+        
+        async def generate_all():
+            return await asyncio.gather(
+                client.agenerate_image("a red bicycle", (64, 64)),
+                client.agenerate_image("a red bicycle", (64, 64)),
+                client.agenerate_image("a blue bicycle", (64, 64))
+            )
+        
+        first, second, other = asyncio.run(generate_all())
+        
+        assert inner.agenerate_image.await_count == 2
+        assert client.stats() == {"requests": 3, "coalesced": 1}
+        assert first.tobytes() == second.tobytes() != other.tobytes()
+        assert first is not second
+    
+    def test_async_error_is_raised_to_every_waiter(self):
+        """Test that a failed async generation fails all coalesced callers."""
+        async def fail(prompt, size):
+            await asyncio.sleep(0.05)
+            raise RuntimeError("provider down")
+        
+        inner = LocalImageClient()
+        inner.agenerate_image = fail
+        client = CoalescingGenAIClient(inner)
+        
+        async def generate_all():
+            return await asyncio.gather(
+                *[client.agenerate_image("a red bicycle", (64, 64)) for _ in range(3)],
+                return_exceptions=True
+            )
+        
+        outcomes = asyncio.run(generate_all())
+        
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert client.stats()['coalesced'] == 2
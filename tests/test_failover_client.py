@@ -0,0 +1,177 @@
+"""Unit tests for FailoverGenAIClient."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.clients.failover_client import MIN_HEDGE_SAMPLES, FailoverGenAIClient
+from src.clients.genai_client import ImageRequest
+from src.clients.local_client import LocalImageClient
+
+
+class FakeProvider(LocalImageClient):
+    """Local client with a configurable provider name, latency and failure."""
+    
+    def __init__(self, name, latency=0.0, error=None, seed=0):
+        super().__init__(latency=latency, seed=seed)
+        self.provider_name = name
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+    
+    def generate_image(self, prompt, size=(1024, 1024)):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error:
+            raise self.error
+        return self._render(prompt, size)
+    
+    async def agenerate_image(self, prompt, size=(1024, 1024)):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self._render(prompt, size)
+
+
+class TestFailoverGenAIClient:
+    """Test suite for provider failover and hedging."""
+    
+    def test_fails_over_in_priority_order(self):
+        """Test that a failing primary falls through to the next provider."""
+        primary = FakeProvider("openai", error=RuntimeError("provider down"))
+        secondary = FakeProvider("imagen", seed=1)
+        client = FailoverGenAIClient([primary, secondary])
+        
+        image = client.generate_image("a red bicycle", (64, 64))
+        
+        assert image.tobytes() == secondary._render("a red bicycle", (64, 64)).tobytes()
+        stats = client.stats()
+        assert stats['openai']['failures'] == 1
+        assert stats['imagen']['wins'] == 1
+        assert stats['imagen']['p50_seconds'] is not None
+    
+    def test_raises_when_every_provider_fails(self):
+        """Test that the combined error names every provider."""
+        client = FailoverGenAIClient([
+            FakeProvider("openai", error=RuntimeError("quota")),
+            FakeProvider("imagen", error=RuntimeError("outage"))
+        ])
+        
+        with pytest.raises(Exception, match="openai: quota; imagen: outage"):
+            client.generate_image("a red bicycle", (64, 64))
+    
+    def test_sync_hedge_takes_the_faster_provider(self):
+        """Test that a slow primary is hedged and the backup result is used."""
+        primary = FakeProvider("openai", latency=0.5)
+        secondary = FakeProvider("imagen", seed=1)
+        client = FailoverGenAIClient([primary, secondary], hedge=True,
+                                     hedge_min_delay=0.0, hedge_initial_delay=0.05)
+        
+        start = time.perf_counter()
+        image = client.generate_image("a red bicycle", (64, 64))
+        
+        assert time.perf_counter() - start < 0.4
+        assert image.tobytes() == secondary._render("a red bicycle", (64, 64)).tobytes()
+        stats = client.stats()
+        assert stats['imagen']['hedges'] == 1
+        assert stats['imagen']['wins'] == 1
+        assert stats['openai']['cancelled'] == 1
+        assert stats['openai']['wins'] == 0
+    
+    def test_concurrent_callers_do_not_trigger_hedges(self):
+        """Test that many concurrent callers are not hedged while each call is faster than the delay."""
+        primary = FakeProvider("openai", latency=0.2)
+        secondary = FakeProvider("imagen", seed=1)
+        client = FailoverGenAIClient([primary, secondary], hedge=True,
+                                     hedge_min_delay=0.3, hedge_initial_delay=0.3)
+        
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            images = list(executor.map(
+                lambda index: client.generate_image(f"a red bicycle {index}", (64, 64)), range(64)
+            ))
+        
+        assert len(images) == 64
+        stats = client.stats()
+        assert stats['openai']['wins'] == 64
+        assert stats['imagen']['hedges'] == 0
+        assert stats['openai']['cancelled'] == 0
+        assert secondary.calls == 0
+    
+    def test_async_hedge_cancels_the_loser(self):
+        """Test that the losing async request is cancelled."""
+        primary = FakeProvider("openai", latency=1.0)
+        secondary = FakeProvider("imagen", latency=0.01, seed=1)
+        client = FailoverGenAIClient([primary, secondary], hedge=True,
+                                     hedge_min_delay=0.0, hedge_initial_delay=0.05)
+        
+        image = asyncio.run(client.agenerate_image("a red bicycle", (64, 64)))
+        
+        assert image.tobytes() == secondary._render("a red bicycle", (64, 64)).tobytes()
+        assert primary.cancelled is True
+        assert client.stats()['openai']['cancelled'] == 1
+    
+    def test_async_fails_over_without_hedging(self):
+        """Test async failover when hedging is off."""
+        primary = FakeProvider("openai", error=RuntimeError("provider down"))
+        secondary = FakeProvider("imagen", seed=1)
+        client = FailoverGenAIClient([primary, secondary])
+        
+        asyncio.run(client.agenerate_image("a red bicycle", (64, 64)))
+        
+        assert client.stats()['openai']['failures'] == 1
+        assert client.stats()['imagen']['wins'] == 1
+        assert client.stats()['imagen']['hedges'] == 0
+    
+    def test_hedge_delay_follows_measured_latency(self):
+        """Test that the hedge delay uses the initial delay, then the percentile."""
+        client = FailoverGenAIClient([FakeProvider("openai"), FakeProvider("imagen")], hedge=True,
+                                     hedge_min_delay=0.5, hedge_initial_delay=10)
+        
+        assert client.hedge_delay(0) == 10
+        for seconds in [1.0, 1.2, 1.1, 3.0, 1.3]:
+            client._record_latency(0, seconds, win=True)
+        assert client.hedge_delay(0) == 3.0
+        
+        for _ in range(200):
+            client._record_latency(0, 0.1, win=True)
+        assert client.hedge_delay(0) == 0.5
+    
+    def test_batches_record_call_latency(self):
+        """Test that batch calls record their own duration as latency."""
+        client = FailoverGenAIClient([FakeProvider("openai", latency=0.05), FakeProvider("imagen")],
+                                     hedge=True, hedge_min_delay=0.0)
+        requests = [ImageRequest(f"product {i}", (32, 32)) for i in range(MIN_HEDGE_SAMPLES)]
+        
+        results = client.generate_images(requests)
+        
+        assert all(result.ok for result in results)
+        assert 0.05 <= client.stats()['openai']['p50_seconds'] < 0.5
+        assert 0.05 <= client.hedge_delay(0) < 0.5
+    
+    def test_identity(self):
+        """Test the composite provider and model identifiers."""
+        client = FailoverGenAIClient([FakeProvider("openai"), FakeProvider("openai", seed=2)])
+        
+        assert client.provider_name == "failover"
+        assert client.model_id == "openai:local-seed0+openai:local-seed2"
+        assert client.names == ["openai:local-seed0", "openai:local-seed2"]
+    
+    def test_repeated_providers_get_distinct_names(self):
+        """Test that the same provider and model twice keep separate stats."""
+        client = FailoverGenAIClient([FakeProvider("openai", error=RuntimeError("provider down")),
+                                      FakeProvider("openai"), FakeProvider("imagen")])
+        
+        client.generate_image("a red bicycle", (64, 64))
+        
+        assert client.names == ["openai:local-seed0", "openai:local-seed0#2", "imagen"]
+        stats = client.stats()
+        assert stats["openai:local-seed0"]['failures'] == 1
+        assert stats["openai:local-seed0#2"]['wins'] == 1
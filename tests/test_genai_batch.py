@@ -0,0 +1,118 @@
+"""Unit tests for batch generation through GenAIClient.generate_images."""
+
+from unittest.mock import MagicMock, Mock, patch
+
+from PIL import Image
+
+from src.clients.caching_client import CachingGenAIClient
+from src.clients.failover_client import FailoverGenAIClient
+from src.clients.genai_client import ImageRequest, plan_batches
+from src.clients.local_client import LocalImageClient
+from src.clients.openai_client import OpenAIClient
+from src.managers.genai_cache import GenAICache
+
+
+class BatchProvider(LocalImageClient):
+    """Local client that returns several images per call and records its calls."""
+    
+    def __init__(self, max_images_per_call=3, failing=(), short=()):
+        super().__init__()
+        self.max_images_per_call = max_images_per_call
+        self.failing = failing
+        self.short = short
+        self.calls = []
+    
+    def _generate_batch(self, prompt, size, count):
+        self.calls.append((prompt, count))
+        if prompt in self.failing:
+            raise RuntimeError(f"rejected: {prompt}")
+        if prompt in self.short:
+            count -= 1
+        return [self._render(prompt, size) for _ in range(count)]
+
+
+class TestGenerateImages:
+    """Test suite for the batch generation API."""
+    
+    def test_plan_batches_groups_identical_requests(self):
+        """Test that identical requests share calls of at most the batch size."""
+        requests = [ImageRequest("a"), ImageRequest("b"), ImageRequest("a"), ImageRequest("a"),
+                    ImageRequest("a", (512, 512))]
+        
+        assert plan_batches(requests, 2) == [[0, 2], [3], [1], [4]]
+        assert plan_batches(requests, 1) == [[0], [2], [3], [1], [4]]
+    
+    def test_results_in_request_order_with_partial_failure(self):
+        """Test that a failed call fails only its own requests."""
+        client = BatchProvider(failing=("b",))
+        requests = [ImageRequest("a", (32, 32)), ImageRequest("b", (32, 32)), ImageRequest("a", (32, 32))]
+        
+        results = client.generate_images(requests)
+        
+        assert client.calls == [("a", 2), ("b", 1)]
+        assert [result.request for result in results] == requests
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[1].error == "rejected: b"
+        assert results[0].image.size == (32, 32)
+    
+    def test_short_batch_fails_only_the_missing_requests(self):
+        """Test that requests left without an image are reported as failed."""
+        client = BatchProvider(short=("a",))
+        
+        results = client.generate_images([ImageRequest("a", (32, 32))] * 3, max_workers=2)
+        
+        assert [result.ok for result in results] == [True, True, False]
+        assert "fewer images" in results[2].error
+    
+    def test_default_client_makes_one_call_per_image(self):
+        """Test that providers without a batch endpoint still serve batches."""
+        client = LocalImageClient()
+        client.generate_image = Mock(side_effect=client.generate_image)
+        
+        results = client.generate_images([ImageRequest("a", (32, 32)), ImageRequest("b", (32, 32))],
+                                         max_workers=2)
+        
+        assert all(result.ok for result in results)
+        assert client.generate_image.call_count == 2
+    
+    def test_cache_serves_hits_and_batches_misses(self, tmp_path):
+        """Test that only cache misses reach the provider."""
+        provider = BatchProvider()
+        client = CachingGenAIClient(provider, GenAICache(str(tmp_path)))
+        client.generate_image("a", (32, 32))
+        
+        results = client.generate_images([ImageRequest("a", (32, 32)), ImageRequest("b", (32, 32))])
+        
+        assert all(result.ok for result in results)
+        assert provider.calls == [("b", 1)]
+        assert client.generate_images([ImageRequest("b", (32, 32))])[0].ok
+        assert len(provider.calls) == 1
+    
+    def test_failover_chunks_batches_for_fallbacks(self):
+        """Test that a fallback with smaller batches receives the batch in chunks."""
+        primary = BatchProvider(max_images_per_call=4, failing=("a",))
+        secondary = BatchProvider(max_images_per_call=1)
+        secondary.provider_name = "backup"
+        client = FailoverGenAIClient([primary, secondary])
+        
+        results = client.generate_images([ImageRequest("a", (32, 32))] * 3)
+        
+        assert all(result.ok for result in results)
+        assert primary.calls == [("a", 3)]
+        assert secondary.calls == [("a", 1)] * 3
+        assert client.stats()['backup']['wins'] == 1
+    
+    def test_openai_batches_with_dall_e_2(self):
+        """Test that DALL-E 2 receives several images in one API call."""
+        client = OpenAIClient(api_key="test-api-key", model="dall-e-2")
+        response = MagicMock()
+        response.data = [MagicMock(url=f"https://example.com/{i}.png") for i in range(3)]
+        
+        with patch.object(client.client.images, 'generate', return_value=response) as mock_generate, \
+                patch.object(OpenAIClient, '_download_image', return_value=Image.new('RGB', (32, 32))):
+            results = client.generate_images([ImageRequest("a")] * 3)
+        
+        assert all(result.ok for result in results)
+        assert mock_generate.call_count == 1
+        assert mock_generate.call_args.kwargs['n'] == 3
+        assert OpenAIClient(api_key="test-api-key").max_images_per_call == 1
@@ -0,0 +1,117 @@
+"""Unit tests for the GenAI image cache."""
+
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+from src.clients.caching_client import CachingGenAIClient
+from src.clients.local_client import LocalImageClient
+from src.managers import genai_cache
+from src.managers.genai_cache import GenAICache, cache_key
+
+
+@pytest.fixture
+def cache_dir():
+    """Create a temporary cache directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+def _noise(seed):
+    """Create a small image that does not compress to nothing."""
+    return LocalImageClient(seed=seed).generate_image("noise", (64, 64))
+
+
+def test_cache_key_normalises_prompt():
+    """Test that whitespace and Unicode form do not change the key."""
+    key = cache_key("openai", "dall-e-3", "Café  coffee\n", (1024, 1024))
+    
+    assert cache_key("openai", "dall-e-3", " Café coffee", (1024, 1024)) == key
+    assert cache_key("openai", "dall-e-3", "Café coffee", (1024, 1792)) != key
+    assert cache_key("imagen", "dall-e-3", "Café coffee", (1024, 1024)) != key
+
+
+def test_put_and_get_survive_reopen(cache_dir):
+    """Test a round trip through the disk cache and its counters."""
+    cache = GenAICache(cache_dir)
+    assert cache.get("a" * 64) is None
+    
+    image = _noise(1)
+    cache.put("a" * 64, image)
+    
+    reopened = GenAICache(cache_dir)
+    cached = reopened.get("a" * 64)
+    assert cached.tobytes() == image.tobytes()
+    
+    stats = reopened.stats()
+    assert stats['hits'] == 1
+    assert stats['entries'] == 1
+    assert stats['bytes_read'] == stats['total_bytes'] > 0
+    assert cache.stats()['misses'] == 1
+
+
+def test_concurrent_puts_keep_every_entry(cache_dir, monkeypatch):
+    """Test that an older index snapshot never overwrites a newer one."""
+    cache = GenAICache(cache_dir)
+    dump = json.dump
+    
+    def slow_dump(payload, f):
+        # Smaller (older) snapshots take longer to write
+        time.sleep(0.05 / len(payload['entries']))
+        dump(payload, f)
+    
+    monkeypatch.setattr(genai_cache.json, 'dump', slow_dump)
+    images = [_noise(seed) for seed in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda seed: cache.put(str(seed) * 64, images[seed]), range(4)))
+    
+    assert GenAICache(cache_dir).stats()['entries'] == 4
+
+
+def test_least_recently_used_entries_are_evicted(cache_dir):
+    """Test size-bounded LRU eviction."""
+    cache = GenAICache(cache_dir)
+    cache.put("a" * 64, _noise(1))
+    entry_bytes = cache.stats()['total_bytes']
+    cache.max_bytes = entry_bytes * 2 + entry_bytes // 2
+    
+    cache.put("b" * 64, _noise(2))
+    cache.get("a" * 64)  # "b" is now the least recently used
+    cache.put("c" * 64, _noise(3))
+    
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.get("c" * 64) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_entries_are_misses(cache_dir, monkeypatch):
+    """Test that entries older than the TTL are not served."""
+    cache = GenAICache(cache_dir, ttl_seconds=60)
+    cache.put("a" * 64, _noise(1))
+    
+    now = cache._entries["a" * 64]['created']
+    monkeypatch.setattr('src.managers.genai_cache.time.time', lambda: now + 61)
+    
+    assert cache.get("a" * 64) is None
+    assert cache.stats()['expired'] == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_caching_client_generates_once(cache_dir):
+    """Test that identical requests only reach the wrapped client once."""
+    inner = LocalImageClient()
+    inner.generate_image = Mock(side_effect=inner.generate_image)
+    client = CachingGenAIClient(inner, GenAICache(cache_dir))
+    
+    first = client.generate_image("a red bicycle", (64, 64))
+    second = client.generate_image("a  red bicycle ", (64, 64))
+    
+    assert inner.generate_image.call_count == 1
+    assert first.tobytes() == second.tobytes()
+    assert client._build_prompt("Tea", "everyone", "US") == inner._build_prompt("Tea", "everyone", "US")
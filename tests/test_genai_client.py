@@ -1,7 +1,10 @@
 """Integration tests for GenAI clients with mocked API."""
 
+import asyncio
+import base64
+import threading
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from PIL import Image
 from io import BytesIO
 import openai
@@ -46,6 +49,15 @@ class TestOpenAIClient:
         client = OpenAIClient(api_key=api_key, model="dall-e-2")
         assert client.model == "dall-e-2"
 
+    def test_sdk_client_created_on_first_use(self, client):
+        """Test that the SDK client is deferred until a request needs it."""
+        assert client._client is None
+        
+        sdk_client = client.client
+        
+        assert isinstance(sdk_client, openai.OpenAI)
+        assert client.client is sdk_client
+
     def test_build_prompt(self, client):
         """Test prompt construction with product, audience, and region context."""
         prompt = client._build_prompt(
@@ -81,12 +93,14 @@ class TestOpenAIClient:
         assert client._calculate_backoff(1) == 4  # 2 * 2^1
         assert client._calculate_backoff(2) == 8  # 2 * 2^2
 
-    @patch('src.clients.openai_client.requests.get')
+    @patch('src.clients.openai_client.requests.Session.get')
     def test_download_image_success(self, mock_get, client, mock_image_response):
         """Test successful image download and conversion."""
         # Mock successful HTTP response
         mock_response = Mock()
-        mock_response.content = mock_image_response
+        mock_response.iter_content = Mock(return_value=[
+            mock_image_response[i:i + 1000] for i in range(0, len(mock_image_response), 1000)
+        ])
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -95,8 +109,15 @@ class TestOpenAIClient:
         assert isinstance(image, Image.Image)
         assert image.mode == 'RGB'
         assert image.size == (1024, 1024)
+        assert mock_get.call_args.kwargs['stream'] is True
+        mock_response.close.assert_called_once()
 
-    @patch('src.clients.openai_client.requests.get')
+    def test_decode_image_decodes_eagerly(self, client, mock_image_response):
+        """Test that pixel data is decoded in _decode_image, not on first use."""
+        with pytest.raises(Exception, match="Failed to process downloaded image"):
+            client._decode_image(mock_image_response[:len(mock_image_response) // 2])
+
+    @patch('src.clients.openai_client.requests.Session.get')
     def test_download_image_network_error(self, mock_get, client):
         """Test image download handles network errors."""
         import requests
@@ -105,7 +126,7 @@ class TestOpenAIClient:
         with pytest.raises(Exception, match="Failed to download image"):
             client._download_image("https://example.com/image.png")
 
-    @patch('src.clients.openai_client.requests.get')
+    @patch('src.clients.openai_client.requests.Session.get')
     @patch.object(OpenAIClient, '_download_image')
     def test_generate_image_success(self, mock_download, mock_get, client, sample_image):
         """Test successful image generation."""
@@ -121,6 +142,26 @@ class TestOpenAIClient:
             assert isinstance(result, Image.Image)
             assert result.size == (1024, 1024)
 
+    @patch.object(OpenAIClient, '_download_image')
+    def test_generate_image_inline_b64(self, mock_download, api_key, mock_image_response):
+        """Test that b64_json responses are decoded without a download."""
+        client = OpenAIClient(api_key=api_key, response_format="b64_json")
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(b64_json=base64.b64encode(mock_image_response).decode('ascii'))]
+        
+        with patch.object(client.client.images, 'generate', return_value=mock_response) as mock_generate:
+            result = client.generate_image("Test prompt")
+        
+        assert result.size == (1024, 1024)
+        assert result.mode == 'RGB'
+        assert mock_generate.call_args.kwargs['response_format'] == "b64_json"
+        mock_download.assert_not_called()
+
+    def test_invalid_response_format(self, api_key):
+        """Test that unknown response formats are rejected."""
+        with pytest.raises(ValueError, match="response_format"):
+            OpenAIClient(api_key=api_key, response_format="png")
+
     @patch.object(OpenAIClient, '_download_image')
     def test_generate_image_with_retry_on_rate_limit(self, mock_download, client, sample_image):
         """Test that generation retries on rate limit errors."""
@@ -145,6 +186,26 @@ class TestOpenAIClient:
                 assert isinstance(result, Image.Image)
                 assert call_count == 3  # Failed twice, succeeded on third
 
+    @patch.object(OpenAIClient, '_download_image')
+    def test_rate_limit_reported_to_shared_limiter(self, mock_download, client, api_key, sample_image):
+        """Test that rate limits slow down the limiter shared by all OpenAI clients."""
+        mock_download.return_value = sample_image
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(url="https://example.com/generated.png")]
+        error = openai.RateLimitError("Rate limit exceeded", response=Mock(headers={'retry-after': '0'}), body=None)
+        
+        assert OpenAIClient(api_key=api_key).rate_limiter is client.rate_limiter
+        before = client.rate_limiter.stats()
+        
+        with patch.object(client.client.images, 'generate', side_effect=[error, mock_response]):
+            with patch('time.sleep'):
+                client.generate_image("Test prompt")
+        
+        after = client.rate_limiter.stats()
+        assert after['rate_limited'] - before['rate_limited'] == 1
+        assert after['requests'] - before['requests'] == 2
+        assert OpenAIClient._retry_after(error) == 0.0
+
     @patch.object(OpenAIClient, '_download_image')
     def test_generate_image_fails_after_max_retries(self, mock_download, client):
         """Test that generation fails after max retries."""
@@ -209,3 +270,102 @@ class TestOpenAIClient:
                          side_effect=ValueError("Unexpected error")):
             with pytest.raises(Exception, match="Unexpected error during image generation"):
                 client.generate_image("Test prompt")
+
+    def test_agenerate_image_success(self, client, sample_image):
+        """Test async generation through the async SDK and the download pool."""
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(url="https://example.com/generated.png")]
+        async_client = MagicMock()
+        async_client.images.generate = AsyncMock(return_value=mock_response)
+        
+        with patch.object(client, '_loop_clients', return_value=(async_client, None)), \
+                patch.object(OpenAIClient, '_download_image', return_value=sample_image) as mock_download:
+            result = asyncio.run(client.agenerate_image("Test prompt", (1024, 1792)))
+        
+        assert result is sample_image
+        assert async_client.images.generate.call_args.kwargs['size'] == "1024x1792"
+        mock_download.assert_called_once_with("https://example.com/generated.png")
+
+    def test_agenerate_image_retries_on_rate_limit(self, client, sample_image):
+        """Test that async generation backs off without blocking the loop."""
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(url="https://example.com/generated.png")]
+        async_client = MagicMock()
+        async_client.images.generate = AsyncMock(side_effect=[
+            openai.RateLimitError("Rate limit exceeded", response=Mock(), body=None),
+            mock_response
+        ])
+        
+        with patch.object(client, '_loop_clients', return_value=(async_client, None)), \
+                patch.object(OpenAIClient, '_download_image', return_value=sample_image), \
+                patch('src.clients.openai_client.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            result = asyncio.run(client.agenerate_image("Test prompt"))
+        
+        assert result is sample_image
+        assert async_client.images.generate.await_count == 2
+        mock_sleep.assert_awaited_once_with(2)
+
+    def test_async_clients_are_per_event_loop(self, client):
+        """Test that each event loop gets its own clients and aclose releases them."""
+        async def open_and_close():
+            first = client._loop_clients()
+            assert client._loop_clients() is first
+            await client.aclose()
+            return first
+        
+        first = asyncio.run(open_and_close())
+        second = asyncio.run(open_and_close())
+        
+        assert first[0] is not second[0]
+        assert len(client._async_clients) == 0
+
+    def test_adownload_image_uses_pooled_client(self, client, mock_image_response):
+        """Test that async downloads go through the pooled HTTP client."""
+        httpx = pytest.importorskip('httpx')
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=mock_image_response))
+        
+        async def download():
+            http_client = httpx.AsyncClient(transport=transport)
+            client._async_clients[asyncio.get_running_loop()] = (openai.AsyncOpenAI(api_key="key"), http_client)
+            try:
+                return await client._adownload_image("https://example.com/generated.png")
+            finally:
+                await client.aclose()
+        
+        image = asyncio.run(download())
+        assert image.size == (1024, 1024)
+        assert image.mode == 'RGB'
+
+    def test_agenerate_image_inline_b64(self, api_key, mock_image_response):
+        """Test that async b64_json responses are decoded without a download."""
+        client = OpenAIClient(api_key=api_key, response_format="b64_json")
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(b64_json=base64.b64encode(mock_image_response).decode('ascii'))]
+        async_client = MagicMock()
+        async_client.images.generate = AsyncMock(return_value=mock_response)
+        
+        with patch.object(client, '_loop_clients', return_value=(async_client, None)), \
+                patch.object(OpenAIClient, '_adownload_image') as mock_download:
+            result = asyncio.run(client.agenerate_image("Test prompt"))
+        
+        assert result.size == (1024, 1024)
+        mock_download.assert_not_called()
+
+
+class TestGenAIClientAsyncDefault:
+    """Test suite for the base class async fallback."""
+
+    def test_agenerate_image_runs_sync_client_in_thread(self):
+        """Test that clients without a native async API still support agenerate_image."""
+        from src.clients.genai_client import GenAIClient
+        
+        class SyncClient(GenAIClient):
+            def generate_image(self, prompt, size=(1024, 1024)):
+                self.thread = threading.get_ident()
+                return Image.new('RGB', size)
+        
+        client = SyncClient(api_key="key")
+        image = asyncio.run(client.agenerate_image("prompt", (32, 16)))
+        
+        assert image.size == (32, 16)
+        assert client.thread != threading.get_ident()
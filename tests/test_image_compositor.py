@@ -194,3 +194,26 @@ class TestImageCompositor:
                 expected_ratio = compositor.ASPECT_RATIOS[ratio_str]
                 actual_ratio = width / height
                 assert abs(actual_ratio - expected_ratio) < 0.01
+    
+    def test_load_font_is_cached(self, compositor):
+        """Test that fonts are resolved once per size and shared between compositors."""
+        font = compositor._load_font(40)
+        other = ImageCompositor(font_family="Arial", font_size=48)
+        
+        assert compositor._load_font(40) is font
+        assert other._load_font(40) is font
+    
+    def test_create_contact_sheet(self, compositor):
+        """Test that the sheet has one row per label and one cell per image."""
+        rows = [
+            ("Coffee (product_a)", [("1:1", Image.new('RGB', (100, 100))), ("16:9", Image.new('RGBA', (160, 90)))]),
+            ("Tea (product_b)", [("1:1", Image.new('RGB', (100, 100)))])
+        ]
+        
+        small = compositor.create_contact_sheet(rows, cell_size=64)
+        titled = compositor.create_contact_sheet(rows, title="campaign_001", cell_size=64)
+        
+        gap = ImageCompositor.CONTACT_SHEET_GAP
+        assert small.mode == 'RGB'
+        assert small.width == gap + 2 * (64 + gap)
+        assert titled.height > small.height > 2 * 64
@@ -0,0 +1,122 @@
+"""Unit tests for LocalImageClient."""
+
+import asyncio
+
+import pytest
+
+from src.clients.local_client import LocalImageClient
+from src.utils import circuit_breaker, rate_limiter
+from src.utils.circuit_breaker import CircuitOpenError, configure_circuit_breaker
+
+
+@pytest.fixture
+def fresh_registries(monkeypatch):
+    """Give the test its own process-wide rate limiters and circuit breakers."""
+    monkeypatch.setattr(rate_limiter, '_limiters', {})
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+
+
+class TestLocalImageClient:
+    """Test suite for the deterministic local generator."""
+    
+    def test_same_prompt_gives_same_pixels(self):
+        """Test that generation is deterministic."""
+        first = LocalImageClient().generate_image("a red bicycle", (128, 96))
+        second = LocalImageClient().generate_image("a red bicycle", (128, 96))
+        
+        assert first.size == (128, 96)
+        assert first.mode == 'RGB'
+        assert first.tobytes() == second.tobytes()
+    
+    def test_prompt_and_seed_change_the_image(self):
+        """Test that different prompts and seeds give different images."""
+        base = LocalImageClient().generate_image("a red bicycle", (64, 64)).tobytes()
+        
+        assert LocalImageClient().generate_image("a blue bicycle", (64, 64)).tobytes() != base
+        assert LocalImageClient(seed=1).generate_image("a red bicycle", (64, 64)).tobytes() != base
+    
+    def test_image_size_override(self):
+        """Test that a fixed image size replaces the requested one."""
+        client = LocalImageClient(image_size=(32, 48))
+        
+        assert client.generate_image("prompt").size == (32, 48)
+    
+    def test_async_matches_sync(self):
+        """Test that agenerate_image renders the same pixels as generate_image."""
+        client = LocalImageClient(latency=0.01)
+        
+        image = asyncio.run(client.agenerate_image("a red bicycle", (64, 48)))
+        
+        assert image.tobytes() == client.generate_image("a red bicycle", (64, 48)).tobytes()
+    
+    def test_simulated_response_formats_decode_to_same_pixels(self):
+        """Test that simulated transports return the directly rendered pixels."""
+        direct = LocalImageClient().generate_image("a red bicycle", (64, 48)).tobytes()
+        
+        for response_format in ("b64_json", "url"):
+            client = LocalImageClient(response_format=response_format)
+            assert client.generate_image("a red bicycle", (64, 48)).tobytes() == direct
+            assert asyncio.run(client.agenerate_image("a red bicycle", (64, 48))).tobytes() == direct
+    
+    def test_latency_and_failures_are_reproducible(self):
+        """Test that simulated calls depend only on the seed, request and attempt."""
+        def draws(client):
+            return [client._draw_call(prompt, (64, 64)) for prompt in ("a", "b", "a", "c")]
+        
+        settings = dict(latency=0.5, latency_distribution="lognormal", latency_spread=0.8,
+                        failure_rate=0.3, rate_limit_rate=0.2)
+        first = draws(LocalImageClient(**settings))
+        
+        assert [(seconds, repr(error)) for seconds, error in first] == \
+            [(seconds, repr(error)) for seconds, error in draws(LocalImageClient(**settings))]
+        assert first[0][0] != first[2][0]
+        assert len({seconds for seconds, _ in first}) > 1
+        assert all(seconds > 0 for seconds, _ in first)
+        assert draws(LocalImageClient(seed=1, **settings))[0][0] != first[0][0]
+    
+    def test_latency_distributions(self):
+        """Test the spread of each latency distribution."""
+        def sample(distribution, spread):
+            client = LocalImageClient(latency=1.0, latency_distribution=distribution, latency_spread=spread)
+            return [client._draw_call(f"prompt {i}", (64, 64))[0] for i in range(200)]
+        
+        assert set(sample("fixed", 0.5)) == {1.0}
+        uniform = sample("uniform", 0.5)
+        assert 0.5 <= min(uniform) and max(uniform) <= 1.5
+        assert sorted(sample("lognormal", 1.0))[100] == pytest.approx(1.0, rel=0.5)
+        assert min(sample("normal", 5.0)) == 0.0
+        with pytest.raises(ValueError, match="latency_distribution"):
+            LocalImageClient(latency_distribution="pareto")
+    
+    def test_injected_failures_are_retried(self, fresh_registries):
+        """Test that provider errors are retried and reported after the last attempt."""
+        client = LocalImageClient(failure_rate=0.5, retry_delay=0.0, max_retries=10)
+        images = [client.generate_image(f"prompt {i}", (32, 32)) for i in range(10)]
+        
+        assert all(image.size == (32, 32) for image in images)
+        assert sum(client._attempts.values()) > 10
+        
+        with pytest.raises(Exception, match="API error after 2 attempts: Simulated provider error"):
+            LocalImageClient(failure_rate=1.0, retry_delay=0.0, max_retries=2).generate_image("prompt", (32, 32))
+    
+    def test_injected_rate_limits_reach_the_shared_limiter(self, fresh_registries):
+        """Test that simulated 429s slow down the provider's rate limiter."""
+        client = LocalImageClient(rate_limit_rate=1.0, retry_after=0.0, retry_delay=0.0, max_retries=2)
+        
+        with pytest.raises(Exception, match="Rate limit exceeded after 2 attempts"):
+            asyncio.run(client.agenerate_image("prompt", (32, 32)))
+        
+        assert client.rate_limiter.stats()['rate_limited'] == 2
+        assert client.circuit_breaker.state == "closed"
+    
+    def test_injected_failures_open_the_circuit(self, fresh_registries):
+        """Test that an outage trips the circuit breaker and later calls fail fast."""
+        configure_circuit_breaker('local', {'failure_threshold': 3, 'reset_timeout_seconds': 60})
+        client = LocalImageClient(failure_rate=1.0, retry_delay=0.0, max_retries=5)
+        
+        with pytest.raises(CircuitOpenError):
+            client.generate_image("prompt", (32, 32))
+        with pytest.raises(CircuitOpenError):
+            client.generate_image("another prompt", (32, 32))
+        
+        assert client._attempts == {"32x32:prompt": 3}
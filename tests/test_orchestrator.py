@@ -3,11 +3,13 @@
 import pytest
 import tempfile
 import json
+import threading
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from PIL import Image
 
-from src.orchestrator import PipelineOrchestrator
+from src.orchestrator import PipelineOrchestrator, create_orchestrator
 from src.models import CampaignBrief, Product, PipelineResult
 
 
@@ -328,3 +330,752 @@ def test_report_generation(test_config, sample_brief_file, mock_image, temp_dirs
     assert report['summary']['total_assets'] == 6
     assert report['summary']['assets_reused'] == 6
     assert report['summary']['assets_generated'] == 0
+
+
+def test_parallel_processing_preserves_order(test_config, temp_dirs):
+    """Test that parallel mode returns outputs in brief order."""
+    brief_data = {
+        'campaign_id': 'parallel_campaign',
+        'products': [
+            {'product_id': f'product_{i}', 'name': f'Product {i}'}
+            for i in range(6)
+        ],
+        'target_region': 'US',
+        'target_audience': 'everyone',
+        'campaign_message': 'Buy now'
+    }
+    brief_path = Path(temp_dirs['input_dir']) / 'parallel_brief.json'
+    with open(brief_path, 'w') as f:
+        json.dump(brief_data, f)
+    
+    # Earlier products take longer so workers finish out of order
+    def slow_generate(prompt, *args, **kwargs):
+        index = int(prompt.split('_')[-1])
+        time.sleep(0.02 * (6 - index))
+        return Image.new('RGB', (256, 256), color='blue')
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(side_effect=lambda product_name, **kwargs: f"prompt_{product_name.split()[-1]}")
+    mock_client.generate_image = Mock(side_effect=slow_generate)
+    
+    test_config['performance'] = {'parallel_processing': True, 'max_workers': 4}
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    result = orchestrator.run(str(brief_path))
+    
+    assert result.success is True
+    expected = [
+        (f'product_{i}', ratio)
+        for i in range(6)
+        for ratio in ['1:1', '9:16', '16:9']
+    ]
+    assert [(a.product_id, a.aspect_ratio) for a in result.outputs] == expected
+
+
+def test_parallel_processing_runs_products_concurrently(test_config, sample_brief_file):
+    """Test that parallel mode overlaps product work."""
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+    
+    def tracking_generate(*args, **kwargs):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(0.1)
+        with lock:
+            state['active'] -= 1
+        return Image.new('RGB', (256, 256), color='blue')
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="test prompt")
+    mock_client.generate_image = Mock(side_effect=tracking_generate)
+    
+    test_config['performance'] = {'parallel_processing': True, 'max_workers': 2}
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    assert state['peak'] == 2
+
+
+def test_parallel_processing_isolates_product_errors(test_config, sample_brief_file, mock_image):
+    """Test that a failing product does not affect others in parallel mode."""
+    def failing_generate(prompt, *args, **kwargs):
+        if 'Coffee' in prompt:
+            raise Exception("Generation failed")
+        return mock_image
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(side_effect=lambda product_name, **kwargs: product_name)
+    mock_client.generate_image = Mock(side_effect=failing_generate)
+    
+    test_config['performance'] = {'parallel_processing': True, 'max_workers': 4}
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is False
+    assert len(result.errors) == 1
+    assert 'product_a' in result.errors[0]
+    assert {a.product_id for a in result.outputs} == {'product_b'}
+
+
+def test_process_compositing_generates_outputs(test_config, sample_brief_file, mock_image):
+    """Test that process-pool compositing produces the same outputs."""
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="test prompt")
+    mock_client.generate_image = Mock(return_value=mock_image)
+    
+    test_config['performance'] = {'process_compositing': True, 'compositing_workers': 2}
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    
+    try:
+        result = orchestrator.run(sample_brief_file)
+    finally:
+        orchestrator.close()
+    
+    assert result.success is True
+    assert len(result.outputs) == 6
+    for asset in result.outputs:
+        assert Path(asset.file_path).exists()
+    assert len([t for t in result.timings if t.stage == 'save']) == 6
+
+
+@pytest.mark.parametrize('engine', ['sync', 'streaming'])
+def test_incremental_rebuild_skips_unchanged_outputs(test_config, sample_brief_file, mock_image, temp_dirs, engine):
+    """Test that a rerun with unchanged inputs keeps existing outputs."""
+    input_dir = Path(temp_dirs['input_dir'])
+    for product_id in ['product_a', 'product_b']:
+        mock_image.save(input_dir / f'{product_id}.png')
+    
+    test_config['performance'] = {'incremental': True, 'engine': engine}
+    
+    first = create_orchestrator(test_config).run(sample_brief_file)
+    assert first.success is True
+    assert not any(asset.up_to_date for asset in first.outputs)
+    mtimes = {asset.file_path: Path(asset.file_path).stat().st_mtime_ns for asset in first.outputs}
+    
+    second = create_orchestrator(test_config).run(sample_brief_file)
+    assert second.success is True
+    assert [a.file_path for a in second.outputs] == [a.file_path for a in first.outputs]
+    assert all(asset.up_to_date for asset in second.outputs)
+    for asset in second.outputs:
+        assert Path(asset.file_path).stat().st_mtime_ns == mtimes[asset.file_path]
+    
+    report_path = Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'report.json'
+    with open(report_path) as f:
+        report = json.load(f)
+    assert report['summary']['assets_up_to_date'] == 6
+    assert {output['status'] for output in report['outputs']} == {'up-to-date'}
+
+
+def test_incremental_rebuild_detects_changes(test_config, sample_brief_file, mock_image, temp_dirs):
+    """Test that changed heroes, overlay settings and deleted files trigger rebuilds."""
+    input_dir = Path(temp_dirs['input_dir'])
+    for product_id in ['product_a', 'product_b']:
+        mock_image.save(input_dir / f'{product_id}.png')
+    
+    test_config['performance'] = {'incremental': True}
+    first = PipelineOrchestrator(test_config).run(sample_brief_file)
+    
+    # New hero for product_a, one deleted output for product_b
+    Image.new('RGB', (1024, 1024), color='red').save(input_dir / 'product_a.png')
+    deleted = next(a.file_path for a in first.outputs if a.product_id == 'product_b' and a.aspect_ratio == '9:16')
+    Path(deleted).unlink()
+    
+    second = PipelineOrchestrator(test_config).run(sample_brief_file)
+    rebuilt = {(a.product_id, a.aspect_ratio) for a in second.outputs if not a.up_to_date}
+    assert rebuilt == {('product_a', '1:1'), ('product_a', '9:16'), ('product_a', '16:9'), ('product_b', '9:16')}
+    assert Path(deleted).exists()
+    
+    # Overlay settings are part of every fingerprint
+    test_config['text_overlay']['font_size'] = 60
+    third = PipelineOrchestrator(test_config).run(sample_brief_file)
+    assert not any(asset.up_to_date for asset in third.outputs)
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async', 'streaming'])
+def test_resume_skips_journaled_work(test_config, sample_brief_file, mock_image, temp_dirs, engine):
+    """Test that a resumed run reuses journaled heroes and outputs."""
+    def flaky_generate(prompt, *args, **kwargs):
+        if 'Tea' in prompt:
+            raise Exception("Process killed")
+        return mock_image
+    
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(side_effect=lambda product_name, **kwargs: product_name)
+    mock_client.generate_image = Mock(side_effect=flaky_generate)
+    
+    test_config['performance'] = {'engine': engine, 'checkpoint': True}
+    orchestrator = create_orchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    interrupted = orchestrator.run(sample_brief_file)
+    assert interrupted.success is False
+    assert {a.product_id for a in interrupted.outputs} == {'product_a'}
+    
+    # Drop product_a's last journaled unit to simulate a crash mid-product
+    journal_path = Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'journal.jsonl'
+    lines = journal_path.read_text().splitlines(keepends=True)
+    journal_path.write_text(''.join(lines[:-1]) + lines[-1][:10])
+    
+    mock_client.generate_image = Mock(return_value=mock_image)
+    resumed = orchestrator.run(sample_brief_file, resume=True)
+    
+    # Only product_b needed a GenAI call; product_a's hero came from the checkpoint
+    assert mock_client.generate_image.call_count == 1
+    assert 'Tea' in mock_client.generate_image.call_args[0][0]
+    
+    uninterrupted = orchestrator.run(sample_brief_file)
+    assert resumed.success is True
+    assert [(a.product_id, a.aspect_ratio, a.file_path, a.was_generated) for a in resumed.outputs] == \
+        [(a.product_id, a.aspect_ratio, a.file_path, a.was_generated) for a in uninterrupted.outputs]
+
+
+def test_resume_restarts_when_brief_changed(test_config, sample_brief_data, sample_brief_file, mock_image,
+                                            temp_dirs):
+    """Test that a journal written for another brief is not resumed."""
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="test prompt")
+    mock_client.generate_image = Mock(return_value=mock_image)
+    
+    test_config['performance'] = {'checkpoint': True}
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    orchestrator.run(sample_brief_file)
+    
+    sample_brief_data['campaign_message'] = 'End your day right'
+    with open(sample_brief_file, 'w') as f:
+        json.dump(sample_brief_data, f)
+    resumed = orchestrator.run(sample_brief_file, resume=True)
+    
+    assert resumed.success is True
+    assert mock_client.generate_image.call_count == 4
+    journal_path = Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'journal.jsonl'
+    assert json.loads(journal_path.read_text().splitlines()[0])['event'] == 'start'
+
+
+def test_checkpoint_is_opt_in(test_config, sample_brief_file, mock_image, temp_dirs):
+    """Test that runs are only journaled with checkpoint enabled or when resuming."""
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="test prompt")
+    mock_client.generate_image = Mock(return_value=mock_image)
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    orchestrator.run(sample_brief_file)
+    journal_path = Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'journal.jsonl'
+    assert not journal_path.exists()
+    
+    orchestrator.run(sample_brief_file, resume=True)
+    assert journal_path.exists()
+
+
+def test_run_without_resume_ignores_journal(test_config, sample_brief_file, mock_image):
+    """Test that a normal rerun starts from scratch."""
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="test prompt")
+    mock_client.generate_image = Mock(return_value=mock_image)
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    orchestrator.run(sample_brief_file)
+    orchestrator.run(sample_brief_file)
+    
+    assert mock_client.generate_image.call_count == 4
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async', 'streaming'])
+def test_stage_timings_cover_every_unit(test_config, sample_brief_file, mock_image, temp_dirs, engine):
+    """Test that every stage of every (product, aspect ratio) unit is timed."""
+    mock_client = Mock()
+    mock_client._build_prompt = Mock(return_value="test prompt")
+    mock_client.generate_image = Mock(return_value=mock_image)
+    
+    test_config['performance'] = {'engine': engine}
+    orchestrator = create_orchestrator(test_config)
+    orchestrator.genai_client = mock_client
+    result = orchestrator.run(sample_brief_file)
+    
+    units = {(a.product_id, a.aspect_ratio) for a in result.outputs}
+    for stage in ['crop', 'overlay', 'save']:
+        assert {(t.product_id, t.aspect_ratio) for t in result.timings if t.stage == stage} == units
+    assert {t.product_id for t in result.timings if t.stage == 'generate'} == {'product_a', 'product_b'}
+    assert all(t.seconds >= 0 for t in result.timings)
+    
+    with open(Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'report.json') as f:
+        report = json.load(f)
+    assert report['timings']['stages']['save']['count'] == 6
+
+
+def test_genai_cache_serves_reruns(test_config, sample_brief_file, temp_dirs):
+    """Test that a rerun is served from the GenAI cache and reports it."""
+    from src.clients.caching_client import CachingGenAIClient
+    from src.clients.local_client import LocalImageClient
+    
+    inner = LocalImageClient()
+    inner.generate_image = Mock(side_effect=inner.generate_image)
+    test_config['performance'] = {
+        'cache_enabled': True,
+        'cache_dir': str(Path(temp_dirs['output_dir']) / 'cache')
+    }
+    
+    for _ in range(2):
+        orchestrator = PipelineOrchestrator(test_config)
+        assert orchestrator.genai_cache is not None
+        orchestrator.genai_client = CachingGenAIClient(inner, orchestrator.genai_cache)
+        result = orchestrator.run(sample_brief_file)
+        assert result.success is True
+    
+    assert inner.generate_image.call_count == 2
+    assert result.metrics['genai_cache']['hits'] == 2
+    assert result.metrics['genai_cache']['misses'] == 0
+    
+    with open(Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'report.json') as f:
+        report = json.load(f)
+    assert report['metrics']['genai_cache']['hit_rate'] == 1.0
+
+
+def test_genai_coalescing_metrics(test_config, sample_brief_file):
+    """Test that the provider client is coalesced and its counts are reported."""
+    from src.clients.coalescing_client import CoalescingGenAIClient
+    from src.clients.local_client import LocalImageClient
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    assert isinstance(orchestrator.genai_client, CoalescingGenAIClient)
+    orchestrator.genai_client.client = LocalImageClient()
+    result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    assert result.metrics['genai_coalescing'] == {'requests': 2, 'coalesced': 0}
+    
+    test_config['performance'] = {'coalesce_requests': False}
+    orchestrator = PipelineOrchestrator(test_config)
+    assert not isinstance(orchestrator.genai_client, CoalescingGenAIClient)
+
+
+def test_identical_heroes_generated_once(test_config, sample_brief_data, temp_dirs):
+    """Test that products with the same prompt share one generation on the sync engine."""
+    from src.clients.local_client import LocalImageClient
+    
+    sample_brief_data['products'] = [
+        {'product_id': f'product_{letter}', 'name': 'Premium Coffee'} for letter in 'abcd'
+    ]
+    brief_path = Path(temp_dirs['input_dir']) / 'same_prompt_brief.json'
+    with open(brief_path, 'w') as f:
+        json.dump(sample_brief_data, f)
+    test_config['performance'] = {'parallel_processing': True, 'max_workers': 4}
+    orchestrator = PipelineOrchestrator(test_config)
+    provider = LocalImageClient()
+    provider.generate_image = Mock(side_effect=provider.generate_image)
+    orchestrator.genai_client.client = provider
+    result = orchestrator.run(str(brief_path))
+    
+    assert result.success is True
+    assert provider.generate_image.call_count == 1
+    assert result.metrics['genai_coalescing'] == {'requests': 4, 'coalesced': 3}
+
+
+def test_planned_heroes_not_retained_for_input_assets(test_config, sample_brief_file, temp_dirs, mock_image):
+    """Test that input assets are only probed up front and load when their product is processed."""
+    from src.clients.local_client import LocalImageClient
+    
+    mock_image.save(Path(temp_dirs['input_dir']) / 'product_a.png')
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client.client = LocalImageClient()
+    events = []
+    get_asset = orchestrator.asset_manager.get_asset
+    composite = orchestrator._composite_product
+    
+    def record_load(product_id):
+        events.append(('load', product_id, dict(orchestrator._planned_heroes)))
+        return get_asset(product_id)
+    
+    def record_composite(brief, product, *args):
+        events.append(('composite', product.product_id))
+        return composite(brief, product, *args)
+    
+    with patch.object(orchestrator.asset_manager, 'get_asset', side_effect=record_load), \
+            patch.object(orchestrator, '_composite_product', side_effect=record_composite):
+        result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    assert [event[:2] for event in events] == [
+        ('load', 'product_a'), ('composite', 'product_a'), ('composite', 'product_b')
+    ]
+    plan = events[0][2]['test_campaign_001']
+    assert 'product_a' not in plan._offsets
+    assert result.metrics['genai_batch']['requests'] == 1
+
+
+def test_batch_generation_overlaps_compositing(test_config, sample_brief_file, mock_image):
+    """Test that a product composites while the next product's hero is still generating."""
+    from src.clients.local_client import LocalImageClient
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    composited = threading.Event()
+    
+    def generate(prompt, size=None):
+        if 'Organic Tea' in prompt:
+            assert composited.wait(5)
+        return mock_image
+    
+    provider = LocalImageClient()
+    provider.generate_image = Mock(side_effect=generate)
+    orchestrator.genai_client.client = provider
+    composite = orchestrator._composite_product
+    
+    def record_composite(brief, product, *args):
+        outputs = composite(brief, product, *args)
+        composited.set()
+        return outputs
+    
+    with patch.object(orchestrator, '_composite_product', side_effect=record_composite):
+        result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    assert len(result.outputs) == 6
+    assert result.metrics['genai_batch'] == {'requests': 2, 'planned_calls': 2, 'failed': 0}
+
+
+def test_rate_limits_configured_and_reported(test_config, sample_brief_file, mock_image):
+    """Test that configured provider limits apply and their waits are reported."""
+    from src.utils.rate_limiter import get_rate_limiter
+    
+    test_config['genai']['rate_limits'] = {'openai': {
+        'requests_per_minute': 6000, 'max_concurrent': 4, 'adaptive_concurrency': True, 'min_concurrent': 2
+    }}
+    try:
+        orchestrator = PipelineOrchestrator(test_config)
+        limiter = get_rate_limiter('openai')
+        assert limiter.requests_per_minute == 6000
+        assert limiter.max_concurrent == 4
+        
+        with patch.object(orchestrator.genai_client.client.client.images, 'generate',
+                          return_value=Mock(data=[Mock(url="https://example.com/a.png")])), \
+                patch('src.clients.openai_client.OpenAIClient._download_image', return_value=mock_image):
+            result = orchestrator.run(sample_brief_file)
+    finally:
+        # The limiter is process-wide; leave it unlimited for other tests
+        get_rate_limiter('openai').configure()
+    
+    assert result.success is True
+    assert result.metrics['genai_rate_limit']['requests'] == 2
+    assert result.metrics['genai_rate_limit']['rate_limited'] == 0
+    # One request at a time never fills the starting limit, so it is kept
+    assert result.metrics['genai_rate_limit']['concurrency_limit'] == 2
+
+
+def test_fallback_providers_fail_over_and_report(test_config, sample_brief_file, temp_dirs):
+    """Test that configured fallbacks take over and per-provider stats are reported."""
+    from src.clients.failover_client import FailoverGenAIClient
+    from src.clients.local_client import LocalImageClient
+    
+    test_config['genai']['fallbacks'] = [
+        {'provider': 'openai', 'api_key': 'test-key', 'model': 'dall-e-2'},
+        {'provider': 'stability', 'api_key': 'test-key'}
+    ]
+    orchestrator = PipelineOrchestrator(test_config)
+    failover = orchestrator.genai_client.client
+    assert isinstance(failover, FailoverGenAIClient)
+    assert failover.names == ['openai:dall-e-3', 'openai:dall-e-2']
+    
+    primary = LocalImageClient()
+    primary.generate_image = Mock(side_effect=Exception("provider down"))
+    failover.clients = [primary, LocalImageClient()]
+    result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    providers = result.metrics['genai_providers']
+    assert providers['openai:dall-e-3']['failures'] == 2
+    assert providers['openai:dall-e-2']['wins'] == 2
+    
+    with open(Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'report.json') as f:
+        report = json.load(f)
+    assert report['metrics']['genai_providers']['openai:dall-e-2']['requests'] == 2
+
+
+def test_runs_of_one_campaign_take_turns(test_config, sample_brief_file):
+    """Test that concurrent runs of the same campaign do not overlap."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.clients.local_client import LocalImageClient
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client.client = LocalImageClient(latency=0.05)
+    process_products = orchestrator._process_products
+    active = []
+    concurrent = []
+    
+    def tracked(brief, metrics):
+        active.append(brief.campaign_id)
+        concurrent.append(len(active))
+        try:
+            return process_products(brief, metrics)
+        finally:
+            active.remove(brief.campaign_id)
+    
+    orchestrator._process_products = tracked
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(orchestrator.run, [sample_brief_file] * 2))
+    
+    assert all(result.success for result in results)
+    assert concurrent == [1, 1]
+    assert orchestrator._campaign_locks['test_campaign_001'].locked() is False
+
+
+def test_sync_engine_hedges_slow_primary(test_config, sample_brief_file):
+    """Test that heroes generated in batches on the default engine are hedged."""
+    from src.clients.local_client import LocalImageClient
+    
+    test_config['genai']['fallbacks'] = [{'provider': 'openai', 'api_key': 'test-key', 'model': 'dall-e-2'}]
+    test_config['genai']['hedging'] = {'enabled': True, 'min_delay_seconds': 0.0, 'initial_delay_seconds': 0.05}
+    orchestrator = PipelineOrchestrator(test_config)
+    failover = orchestrator.genai_client.client
+    failover.clients = [LocalImageClient(latency=1.0), LocalImageClient()]
+    
+    start = time.perf_counter()
+    result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    assert time.perf_counter() - start < 1.0
+    providers = result.metrics['genai_providers']
+    assert providers['openai:dall-e-2']['hedges'] == 2
+    assert providers['openai:dall-e-2']['wins'] == 2
+    assert providers['openai:dall-e-3']['cancelled'] == 2
+
+
+def test_circuit_breakers_configured_and_reported(test_config, sample_brief_file, monkeypatch):
+    """Test that breaker settings apply and only the run's own state changes are reported."""
+    from src.clients.local_client import LocalImageClient
+    from src.utils import circuit_breaker
+    
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    test_config['genai']['circuit_breakers'] = {'openai': {'failure_threshold': 1, 'reset_timeout_seconds': 60}}
+    orchestrator = PipelineOrchestrator(test_config)
+    breaker = circuit_breaker.get_circuit_breaker('openai')
+    assert breaker.failure_threshold == 1
+    assert breaker.reset_timeout == 60
+    
+    # An outage seen before this run opened the circuit
+    breaker.record_failure(RuntimeError("earlier outage"))
+    orchestrator.genai_client.client = LocalImageClient()
+    result = orchestrator.run(sample_brief_file)
+    
+    assert result.success is True
+    metrics = result.metrics['genai_circuit_breakers']['openai']
+    assert metrics['state'] == 'open'
+    assert metrics['opened'] == 0
+    assert metrics['transitions'] == []
+
+
+def test_retry_budgets_configured_and_reported(test_config, sample_brief_file, monkeypatch):
+    """Test that budget settings apply and the run's retries are reported per provider."""
+    from src.clients.local_client import LocalImageClient
+    from src.utils import circuit_breaker, retry_budget
+    
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    monkeypatch.setattr(retry_budget, '_budgets', {})
+    test_config['genai'] = {
+        'provider': 'local',
+        'failure_rate': 1.0,
+        'retry_delay': 0,
+        'retry_budgets': {'local': {'ratio': 0.5, 'min_retries': 1}}
+    }
+    orchestrator = PipelineOrchestrator(test_config)
+    budget = retry_budget.get_retry_budget('local')
+    assert budget.ratio == 0.5
+    budget.spend()
+    
+    result = orchestrator.run(sample_brief_file)
+    
+    # The retry spent before the run leaves none for it
+    assert result.success is False
+    assert "retry budget exhausted" in result.errors[0]
+    metrics = result.metrics['genai_retry_budgets']['local']
+    assert metrics['retries'] == 0
+    assert metrics['denied'] >= 1
+    assert metrics['available'] == 0
+
+
+def test_missing_heroes_are_generated_in_one_batch(test_config, sample_brief_file, mock_image, temp_dirs):
+    """Test that missing heroes are planned up front and submitted through generate_images."""
+    from src.clients.local_client import LocalImageClient
+    
+    def generate(prompt, size=(1024, 1024)):
+        if 'Coffee' in prompt:
+            raise Exception("prompt rejected")
+        return mock_image
+    
+    mock_image.save(Path(temp_dirs['input_dir']) / 'product_b.png')
+    client = LocalImageClient()
+    client.generate_images = Mock(side_effect=client.generate_images)
+    client.generate_image = Mock(side_effect=generate)
+    
+    orchestrator = PipelineOrchestrator(test_config)
+    orchestrator.genai_client.client = client
+    result = orchestrator.run(sample_brief_file)
+    
+    # Only product_a was missing; its failure is reported for that product alone
+    assert client.generate_images.call_count == 1
+    assert len(client.generate_images.call_args[0][0]) == 1
+    assert result.metrics['genai_batch'] == {'requests': 1, 'planned_calls': 1, 'failed': 1}
+    assert result.errors == ["Failed to process product product_a: prompt rejected"]
+    assert {a.product_id for a in result.outputs} == {'product_b'}
+
+
+def test_local_provider_from_config(test_config, sample_brief_file, monkeypatch):
+    """Test that provider: local needs no API key and takes its simulation settings."""
+    from src.clients.local_client import LocalImageClient
+    from src.utils import circuit_breaker
+    
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    test_config['genai'] = {
+        'provider': 'local',
+        'latency_seconds': 0.01,
+        'latency_distribution': 'uniform',
+        'latency_spread': 0.005,
+        'failure_rate': 0.25,
+        'retry_delay': 0,
+        'image_size': [128, 128],
+        'seed': 7
+    }
+    orchestrator = PipelineOrchestrator(test_config)
+    client = orchestrator.genai_client.client
+    assert isinstance(client, LocalImageClient)
+    assert client.failure_rate == 0.25
+    assert client.image_size == (128, 128)
+    assert client.model_id == "local-seed7:128x128"
+    
+    result = orchestrator.run(sample_brief_file)
+    assert result.success is True
+    assert 'local' in result.metrics['genai_circuit_breakers']
+
+
+def test_orchestrator_records_then_replays(test_config, sample_brief_file, tmp_path, monkeypatch):
+    """Test a recorded run replayed without an API key."""
+    from src.clients.cassette_client import ReplayGenAIClient
+    from src.managers.cassette import Cassette
+    from src.utils import circuit_breaker
+    
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    cassette_dir = str(tmp_path / "cassette")
+    test_config['genai'] = {'provider': 'local', 'cassette': {'mode': 'record', 'dir': cassette_dir}}
+    assert PipelineOrchestrator(test_config).run(sample_brief_file).success is True
+    assert len(Cassette(cassette_dir)) > 0
+    
+    test_config['genai'] = {'provider': 'openai', 'cassette': {'mode': 'replay', 'dir': cassette_dir, 'strict': True}}
+    test_config['storage']['output_dir'] = str(tmp_path / "replayed")
+    orchestrator = PipelineOrchestrator(test_config)
+    result = orchestrator.run(sample_brief_file)
+    
+    assert isinstance(orchestrator.genai_client.client, ReplayGenAIClient)
+    assert result.success is True
+    assert result.metrics['genai_replay']['replayed'] == len(Cassette(cassette_dir))
+    assert result.metrics['genai_replay']['substituted'] == 0
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async', 'streaming'])
+def test_size_planning_crops_variants_from_native_sizes(test_config, sample_brief_file, temp_dirs, engine):
+    """Test that planned sizes are generated per product and each variant is cropped from its own."""
+    from src.clients.local_client import LocalImageClient
+    
+    class ShapedClient(LocalImageClient):
+        """Tall heroes are red, wide ones green."""
+        
+        def __init__(self):
+            super().__init__()
+            self.sizes = []
+        
+        def generate_image(self, prompt, size=(1024, 1024)):
+            self.sizes.append(tuple(size))
+            return Image.new('RGB', size, color='red' if size[1] > size[0] else 'green')
+        
+        async def agenerate_image(self, prompt, size=(1024, 1024)):
+            return self.generate_image(prompt, size)
+    
+    client = ShapedClient()
+    test_config['genai']['size_planning'] = {'enabled': True}
+    test_config['performance'] = {'engine': engine, 'checkpoint': True}
+    orchestrator = create_orchestrator(test_config)
+    orchestrator.genai_client.client = client
+    result = orchestrator.run(sample_brief_file)
+    
+    # DALL-E 3 covers 1:1 and 9:16 with its portrait size and 16:9 with its landscape one
+    assert result.success is True
+    assert sorted(client.sizes) == [(1024, 1792)] * 2 + [(1792, 1024)] * 2
+    for asset in result.outputs:
+        output = Image.open(asset.file_path).convert('RGB')
+        expected = (0, 128, 0) if asset.aspect_ratio == '16:9' else (255, 0, 0)
+        assert output.getpixel((output.width // 2, output.height // 4)) == expected
+    plan = result.metrics['genai_size_plan']
+    assert plan['enabled'] is True
+    assert (plan['calls_per_product'], plan['products'], plan['images']) == (2, 2, 4)
+    assert plan['pixel_efficiency'] > 0.8
+    
+    # Resuming restores the journaled extra size instead of regenerating
+    journal_path = Path(temp_dirs['output_dir']) / 'test_campaign_001' / 'journal.jsonl'
+    lines = journal_path.read_text().splitlines(keepends=True)
+    journal_path.write_text(''.join(lines[:-1]))
+    resumed = orchestrator.run(sample_brief_file, resume=True)
+    assert resumed.success is True
+    assert len(client.sizes) == 4
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async', 'streaming'])
+def test_preview_writes_drafts_and_full_run_reuses_generations(test_config, sample_brief_file, temp_dirs, tmp_path,
+                                                              engine):
+    """Test that a preview generates the cheapest planned size once and the full run reuses it."""
+    from src.clients.local_client import LocalImageClient
+    
+    class CountingClient(LocalImageClient):
+        """Records every requested size."""
+        
+        def __init__(self):
+            super().__init__()
+            self.sizes = []
+        
+        def generate_image(self, prompt, size=(1024, 1024)):
+            self.sizes.append(tuple(size))
+            return super().generate_image(prompt, size)
+        
+        async def agenerate_image(self, prompt, size=(1024, 1024)):
+            self.sizes.append(tuple(size))
+            return super().generate_image(prompt, size)
+    
+    client = CountingClient()
+    test_config['genai']['size_planning'] = {'enabled': True}
+    test_config['performance'] = {'engine': engine, 'cache_enabled': True, 'cache_dir': str(tmp_path / 'cache')}
+    test_config['preview'] = {'enabled': True, 'scale': 0.25}
+    preview = create_orchestrator(test_config)
+    preview.genai_client.client.client = client
+    result = preview.run(sample_brief_file)
+    
+    # One call per product at the plan's first DALL-E 3 size, drafts at a quarter of full size
+    assert result.success is True
+    assert client.sizes == [(1024, 1792)] * 2
+    preview_dir = Path(temp_dirs['output_dir']) / 'preview' / 'test_campaign_001'
+    for asset in result.outputs:
+        assert Path(asset.file_path).parent.parent == preview_dir
+        assert asset.file_path.endswith('.jpg')
+    sizes = {asset.aspect_ratio: Image.open(asset.file_path).size for asset in result.outputs}
+    assert sizes == {'1:1': (256, 256), '9:16': (252, 448), '16:9': (256, 144)}
+    assert result.metrics['preview'] == {
+        'contact_sheet': str(preview_dir / 'contact_sheet.jpg'), 'scale': 0.25, 'variants': 6
+    }
+    assert Image.open(preview_dir / 'contact_sheet.jpg').format == 'JPEG'
+    assert not (Path(temp_dirs['output_dir']) / 'test_campaign_001').exists()
+    
+    # The full run only generates the sizes the preview skipped
+    del test_config['preview']
+    full = create_orchestrator(test_config)
+    full.genai_client.client.client = client
+    result = full.run(sample_brief_file)
+    
+    assert result.success is True
+    assert sorted(client.sizes) == [(1024, 1792)] * 2 + [(1792, 1024)] * 2
+    assert result.metrics['genai_cache']['hits'] == 2
+    assert {Path(asset.file_path).suffix for asset in result.outputs} == {'.png'}
@@ -0,0 +1,77 @@
+"""Unit tests for ProcessCompositor."""
+
+import pytest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from PIL import Image, ImageChops
+
+from src.compositors.image_compositor import ImageCompositor
+from src.compositors.process_compositor import ProcessCompositor
+
+
+COMPOSITOR_SETTINGS = {
+    'font_family': 'Arial',
+    'font_size': 48,
+    'text_color': '#FFFFFF',
+    'text_position': 'bottom',
+    'padding': 20,
+    'background_opacity': 0.6
+}
+
+
+@pytest.fixture(scope='module')
+def process_compositor():
+    """Create a ProcessCompositor shared by the tests in this module."""
+    compositor = ProcessCompositor(COMPOSITOR_SETTINGS, max_workers=2)
+    yield compositor
+    compositor.shutdown()
+
+
+class TestProcessCompositor:
+    """Test suite for ProcessCompositor class."""
+    
+    @pytest.fixture
+    def output_dir(self):
+        """Create a temporary output directory."""
+        with TemporaryDirectory() as tmp:
+            yield Path(tmp)
+    
+    @pytest.fixture
+    def hero_image(self):
+        """Create a non-uniform hero image so crops are distinguishable."""
+        img = Image.new('RGB', (800, 600), color='blue')
+        img.paste(Image.new('RGB', (200, 600), color='red'), (0, 0))
+        return img
+    
+    def test_render_variants_matches_in_process_output(self, process_compositor, output_dir, hero_image):
+        """Test that worker output is pixel-identical to in-process compositing."""
+        ratios = ['1:1', '9:16', '16:9']
+        paths = {ratio: str(output_dir / f"{ratio.replace(':', 'x')}.png") for ratio in ratios}
+        
+        saved = process_compositor.render_variants(hero_image, ratios, "Hello world", paths)
+        
+        assert list(saved.keys()) == ratios
+        local = ImageCompositor(**COMPOSITOR_SETTINGS)
+        for ratio, variant in local.create_variants(hero_image, ratios).items():
+            expected = local.add_text_overlay(variant, "Hello world")
+            with Image.open(saved[ratio]) as actual:
+                assert actual.size == expected.size
+                assert ImageChops.difference(actual.convert('RGBA'), expected).getbbox() is None
+    
+    def test_render_variants_rejects_unknown_ratio(self, process_compositor, output_dir, hero_image):
+        """Test that unsupported ratios fail before any work is submitted."""
+        with pytest.raises(ValueError, match="Unsupported aspect ratio"):
+            process_compositor.render_variants(
+                hero_image, ['4:5'], "Hello", {'4:5': str(output_dir / 'out.png')}
+            )
+    
+    def test_render_variants_accepts_rgba_input(self, process_compositor, output_dir):
+        """Test that RGBA heroes are shared without conversion."""
+        hero = Image.new('RGBA', (400, 400), color=(10, 20, 30, 255))
+        path = str(output_dir / 'square.png')
+        
+        saved = process_compositor.render_variants(hero, ['1:1'], "Square", {'1:1': path})
+        
+        assert Path(saved['1:1']).exists()
+        with Image.open(saved['1:1']) as img:
+            assert img.size == (400, 400)
@@ -0,0 +1,151 @@
+"""Unit tests for the GenAI provider rate limiter."""
+
+import threading
+import time
+
+from src.utils.rate_limiter import RateLimiter, configure_rate_limiter, get_rate_limiter
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter."""
+    
+    def test_unlimited_never_waits(self):
+        """Test that an unconfigured limiter admits every request at once."""
+        limiter = RateLimiter()
+        
+        for _ in range(20):
+            with limiter.acquire():
+                pass
+        
+        stats = limiter.stats()
+        assert stats['requests'] == 20
+        assert stats['waited'] == 0
+        assert stats['requests_per_minute'] is None
+    
+    def test_requests_are_spaced_at_the_rate(self):
+        """Test that requests beyond the burst wait for tokens."""
+        limiter = RateLimiter(requests_per_minute=600, burst=1)
+        
+        start = time.monotonic()
+        for _ in range(3):
+            with limiter.acquire():
+                pass
+        elapsed = time.monotonic() - start
+        
+        # One token up front, then one every 0.1s
+        assert elapsed >= 0.18
+        stats = limiter.stats()
+        assert stats['waited'] == 2
+        assert stats['wait_seconds'] >= 0.18
+        assert stats['max_wait_seconds'] > 0
+    
+    def test_max_concurrent_caps_in_flight_requests(self):
+        """Test that no more than max_concurrent requests run at once."""
+        limiter = RateLimiter(max_concurrent=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def request():
+            with limiter.acquire():
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.05)
+                with lock:
+                    active.pop()
+        
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert max(peak) == 2
+        assert limiter.stats()['requests'] == 6
+    
+    def test_rate_limit_halves_rate_and_recovers(self):
+        """Test that a provider rate limit slows down and successes restore the rate."""
+        limiter = RateLimiter(requests_per_minute=120)
+        
+        limiter.on_rate_limited(retry_after=0)
+        assert limiter.stats()['requests_per_minute'] == 60
+        assert limiter.stats()['rate_limited'] == 1
+        
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.stats()['requests_per_minute'] == 120
+    
+    def test_retry_after_pauses_every_caller(self):
+        """Test that Retry-After blocks the next request even when unlimited."""
+        limiter = RateLimiter()
+        
+        limiter.on_rate_limited(retry_after=0.15)
+        start = time.monotonic()
+        with limiter.acquire():
+            pass
+        
+        assert time.monotonic() - start >= 0.14
+    
+    def test_adaptive_concurrency_grows_while_latency_is_flat(self):
+        """Test that the in-flight limit rises to max_concurrent and halves on rate limits."""
+        limiter = RateLimiter(max_concurrent=8, adaptive_concurrency=True)
+        assert limiter.concurrency_limit == 1
+        
+        def worker():
+            for _ in range(15):
+                with limiter.acquire():
+                    time.sleep(0.02)
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = limiter.stats()
+        assert stats['concurrency_limit'] == 8
+        assert stats['concurrency_increases'] == 7
+        
+        limiter.on_rate_limited(retry_after=0)
+        limiter.on_rate_limited(retry_after=0)
+        assert limiter.stats()['concurrency_limit'] == 2
+        assert limiter.stats()['concurrency_decreases'] == 2
+    
+    def test_adaptive_concurrency_backs_off_when_latency_rises(self):
+        """Test that a provider slowing down under load caps the in-flight limit."""
+        limiter = RateLimiter(max_concurrent=12, adaptive_concurrency=True)
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def worker():
+            for _ in range(10):
+                with limiter.acquire():
+                    with lock:
+                        active.append(1)
+                        in_flight = len(active)
+                        peak.append(in_flight)
+                    # Fine up to three requests at once, then slower with each one
+                    time.sleep(0.01 * max(1, in_flight - 2))
+                    with lock:
+                        active.pop()
+        
+        threads = [threading.Thread(target=worker) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert limiter.stats()['concurrency_decreases'] >= 1
+        assert max(peak) < 12
+    
+    def test_limiters_are_shared_per_provider(self):
+        """Test that the registry returns one limiter per provider and applies settings."""
+        limiter = configure_rate_limiter('test-shared', {'requests_per_minute': 30, 'max_concurrent': 2})
+        
+        assert get_rate_limiter('test-shared') is limiter
+        assert get_rate_limiter('test-other') is not limiter
+        assert limiter.requests_per_minute == 30
+        assert limiter.max_concurrent == 2
+        assert limiter.cooldown_seconds == 1.0
@@ -7,7 +7,7 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from src.utils.reporter import PipelineReporter
-from src.models import PipelineResult, GeneratedAsset, ComplianceResult
+from src.models import PipelineResult, GeneratedAsset, ComplianceResult, StageTiming
 
 
 class TestPipelineReporter:
@@ -330,3 +330,124 @@ class TestPipelineReporter:
         assert report["summary"]["assets_generated"] == 0
         assert report["summary"]["assets_reused"] == 0
         assert report["summary"]["products_processed"] == 0
+
+    def test_generate_report_stage_timings(self, sample_assets):
+        """Test per-stage totals, percentiles and slowest spans."""
+        timings = [StageTiming("generate", "product_a", None, 4.0)]
+        timings += [StageTiming("save", "product_a", "1:1", 0.1 * i) for i in range(1, 21)]
+        result = PipelineResult(
+            campaign_id="campaign_001",
+            outputs=sample_assets,
+            execution_time=10.0,
+            success=True,
+            timings=timings
+        )
+        
+        start_time = datetime.now()
+        report = PipelineReporter.generate_report(result, start_time, start_time + timedelta(seconds=10))
+        
+        stages = report["timings"]["stages"]
+        assert list(stages) == ["save", "generate"]  # Largest total first
+        assert stages["save"]["count"] == 20
+        assert stages["save"]["total_seconds"] == pytest.approx(21.0)
+        assert stages["save"]["p50_seconds"] == pytest.approx(1.0)
+        assert stages["save"]["p95_seconds"] == pytest.approx(1.9)
+        assert stages["save"]["max_seconds"] == pytest.approx(2.0)
+        assert report["timings"]["slowest"][0] == {
+            "stage": "generate", "product_id": "product_a", "aspect_ratio": None, "seconds": 4.0
+        }
+        assert len(report["timings"]["slowest"]) == 5
+        
+        summary = PipelineReporter.format_summary(report)
+        assert "STAGE TIMINGS" in summary
+        assert "generate product_a: 4.000s" in summary
+
+    def test_generate_report_without_timings(self, sample_result):
+        """Test that runs without spans report no timings."""
+        start_time = datetime.now()
+        report = PipelineReporter.generate_report(sample_result, start_time, start_time)
+        
+        assert report["timings"] is None
+        assert "STAGE TIMINGS" not in PipelineReporter.format_summary(report)
+
+    def test_format_summary_genai_providers(self, sample_assets):
+        """Test the per-provider section of the summary."""
+        provider = {"requests": 3, "wins": 2, "failures": 1, "hedges": 1, "cancelled": 1,
+                    "p50_seconds": 8.5, "p95_seconds": 14.0}
+        idle = {"requests": 0, "wins": 0, "failures": 0, "hedges": 0, "cancelled": 0,
+                "p50_seconds": None, "p95_seconds": None}
+        result = PipelineResult(
+            campaign_id="campaign_001",
+            outputs=sample_assets,
+            execution_time=10.0,
+            success=True,
+            metrics={"genai_providers": {"openai": provider, "imagen": idle}}
+        )
+        
+        start_time = datetime.now()
+        summary = PipelineReporter.format_summary(PipelineReporter.generate_report(result, start_time, start_time))
+        
+        assert "GENAI PROVIDERS" in summary
+        assert "openai: 2 / 3, 8.50s / 14.00s (1 failed, 1 hedged, 1 cancelled)" in summary
+        assert "imagen: 0 / 0, n/a" in summary
+
+    def test_format_summary_genai_circuit_breakers(self, sample_assets):
+        """Test that only providers whose breaker acted are listed."""
+        tripped = {"state": "open", "failures": 5, "rejected": 3, "opened": 1,
+                   "transitions": [{"from": "closed", "to": "open", "at": "2025-01-01T10:00:00",
+                                    "reason": "5 consecutive failures: 503"}]}
+        healthy = {"state": "closed", "failures": 1, "rejected": 0, "opened": 0, "transitions": []}
+        result = PipelineResult(
+            campaign_id="campaign_001",
+            outputs=sample_assets,
+            execution_time=10.0,
+            success=True,
+            metrics={"genai_circuit_breakers": {"openai": tripped, "imagen": healthy}}
+        )
+        
+        start_time = datetime.now()
+        summary = PipelineReporter.format_summary(PipelineReporter.generate_report(result, start_time, start_time))
+        
+        assert "GENAI CIRCUIT BREAKERS" in summary
+        assert "openai: open (opened 1x, 3 rejected, 5 failures)" in summary
+        assert "closed -> open: 5 consecutive failures: 503" in summary
+        assert "imagen:" not in summary
+
+    def test_format_summary_genai_retry_budgets(self, sample_assets):
+        """Test that providers that retried are listed with their remaining budget."""
+        spent = {"ratio": 0.1, "available": 0, "successes": 20, "retries": 12, "denied": 4}
+        unlimited = {"ratio": None, "available": None, "successes": 5, "retries": 2, "denied": 0}
+        idle = {"ratio": 0.1, "available": 10, "successes": 3, "retries": 0, "denied": 0}
+        result = PipelineResult(
+            campaign_id="campaign_001",
+            outputs=sample_assets,
+            execution_time=10.0,
+            success=True,
+            metrics={"genai_retry_budgets": {"openai": spent, "local": unlimited, "imagen": idle}}
+        )
+        
+        start_time = datetime.now()
+        summary = PipelineReporter.format_summary(PipelineReporter.generate_report(result, start_time, start_time))
+        
+        assert "GENAI RETRY BUDGETS" in summary
+        assert "openai: 12 retries for 20 successes, 4 denied (10% of successes, 0 left in window)" in summary
+        assert "local: 2 retries for 5 successes, 0 denied (unlimited)" in summary
+        assert "imagen:" not in summary
+
+    def test_format_summary_preview(self, sample_assets):
+        """Test that preview runs point to their contact sheet."""
+        result = PipelineResult(
+            campaign_id="campaign_001",
+            outputs=sample_assets,
+            execution_time=1.0,
+            success=True,
+            metrics={"preview": {"contact_sheet": "output/preview/campaign_001/contact_sheet.jpg",
+                                 "scale": 0.25, "variants": 6}}
+        )
+        
+        start_time = datetime.now()
+        summary = PipelineReporter.format_summary(PipelineReporter.generate_report(result, start_time, start_time))
+        
+        assert "PREVIEW:" in summary
+        assert "6 draft variants at 25% resolution" in summary
+        assert "Contact sheet: output/preview/campaign_001/contact_sheet.jpg" in summary
@@ -0,0 +1,117 @@
+"""Unit tests for the GenAI provider retry budget."""
+
+import time
+from unittest.mock import Mock, patch
+
+import openai
+import pytest
+
+from src.clients.local_client import LocalImageClient
+from src.clients.openai_client import OpenAIClient
+from src.utils import retry_budget
+from src.utils.retry_budget import (
+    RetryBudget, RetryBudgetExhaustedError, RetryBudgetGroup, configure_retry_budget, get_retry_budget
+)
+
+
+@pytest.fixture
+def fresh_budgets(monkeypatch):
+    """Give the test its own process-wide retry budget registry."""
+    monkeypatch.setattr(retry_budget, '_budgets', {})
+
+
+class TestRetryBudget:
+    """Test suite for RetryBudget."""
+    
+    def test_unlimited_budget_only_counts(self):
+        """Test that an unconfigured budget allows every retry."""
+        budget = RetryBudget("test")
+        
+        for _ in range(50):
+            budget.spend()
+        
+        stats = budget.stats()
+        assert stats['retries'] == 50
+        assert stats['denied'] == 0
+        assert stats['available'] is None
+    
+    def test_retries_are_a_fraction_of_successes(self):
+        """Test that successes earn retries on top of the minimum."""
+        budget = RetryBudget("test", ratio=0.5, min_retries=2)
+        for _ in range(4):
+            budget.on_success()
+        assert budget.available == 4
+        
+        for _ in range(4):
+            budget.spend()
+        with pytest.raises(RetryBudgetExhaustedError, match="test retry budget exhausted.*: 503"):
+            budget.spend(RuntimeError("503"))
+        
+        stats = budget.stats()
+        assert stats['available'] == 0
+        assert stats['retries'] == 4
+        assert stats['denied'] == 1
+    
+    def test_budget_refills_as_the_window_slides(self):
+        """Test that retries older than the window no longer count."""
+        budget = RetryBudget("test", ratio=0.1, window_seconds=0.1, min_retries=1)
+        budget.spend()
+        with pytest.raises(RetryBudgetExhaustedError):
+            budget.spend()
+        
+        time.sleep(0.12)
+        budget.spend()
+        assert budget.stats()['retries'] == 2
+    
+    def test_budgets_are_shared_per_provider(self, fresh_budgets):
+        """Test that the registry returns one budget per provider and applies settings."""
+        budget = configure_retry_budget('test-shared', {'ratio': 0.2, 'min_retries': 3})
+        
+        assert get_retry_budget('test-shared') is budget
+        assert get_retry_budget('test-other').ratio is None
+        assert budget.ratio == 0.2
+        assert budget.window_seconds == 60
+        assert budget.available == 3
+        group = RetryBudgetGroup(['test-shared', 'test-other', 'test-shared'])
+        assert list(group.stats()) == ['test-shared', 'test-other']
+
+
+class TestRetryBudgetIntegration:
+    """Test the budget inside provider clients."""
+    
+    @patch.object(OpenAIClient, '_download_image')
+    def test_exhausted_budget_stops_openai_retries(self, mock_download, fresh_budgets):
+        """Test that an outage fails fast once the shared budget is spent."""
+        configure_retry_budget('openai', {'ratio': 0.1, 'min_retries': 3})
+        client = OpenAIClient(api_key="test-api-key")
+        client.max_retries = 3
+        
+        with patch.object(client.client.images, 'generate',
+                          side_effect=openai.RateLimitError("Rate limit", response=Mock(), body=None)) as mock_generate:
+            with patch('time.sleep'):
+                with pytest.raises(Exception, match="Rate limit exceeded after 3 attempts"):
+                    client.generate_image("Test prompt")
+                with pytest.raises(RetryBudgetExhaustedError):
+                    client.generate_image("Test prompt")
+                with pytest.raises(RetryBudgetExhaustedError):
+                    client.generate_image("Test prompt")
+        
+        # 3 calls (2 retries), 2 calls (the last retry), then 1 call that is not retried
+        assert mock_generate.call_count == 3 + 2 + 1
+        assert client.retry_budget.stats()['denied'] == 2
+    
+    def test_successes_refill_local_budget(self, fresh_budgets):
+        """Test that the local provider earns retries with each success."""
+        configure_retry_budget('local', {'ratio': 1.0, 'min_retries': 0})
+        failing = LocalImageClient(failure_rate=1.0, retry_delay=0)
+        
+        with pytest.raises(RetryBudgetExhaustedError):
+            failing.generate_image("a red bicycle", (32, 32))
+        
+        LocalImageClient().generate_image("a red bicycle", (32, 32))
+        with pytest.raises(Exception, match="API error after 2 attempts"):
+            # One success earned the one retry this call needs
+            LocalImageClient(failure_rate=1.0, retry_delay=0, max_retries=2).generate_image("a red bicycle", (32, 32))
+        assert failing.retry_budget.stats() == {
+            'ratio': 1.0, 'available': 0, 'successes': 1, 'retries': 1, 'denied': 1
+        }
@@ -0,0 +1,136 @@
+"""Unit tests for RunJournal."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from src.managers.run_journal import RunJournal, compute_run_fingerprint
+from src.models import CampaignBrief, ComplianceResult, GeneratedAsset, Product
+
+
+@pytest.fixture
+def campaign_dir():
+    """Create a temporary campaign output directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+def _asset(campaign_dir, aspect_ratio='1:1'):
+    """Create an output file and its GeneratedAsset record."""
+    path = Path(campaign_dir) / 'product_a' / f"{aspect_ratio.replace(':', 'x')}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new('RGB', (10, 10)).save(path)
+    return GeneratedAsset(
+        product_id='product_a',
+        aspect_ratio=aspect_ratio,
+        file_path=str(path),
+        was_generated=True,
+        compliance_status=ComplianceResult(passed=False, details='Brand check', violations=['Logo not detected'])
+    )
+
+
+def test_records_survive_reopen(campaign_dir):
+    """Test that heroes and units are reloaded on resume."""
+    journal = RunJournal(campaign_dir)
+    journal.start()
+    journal.record_hero('product_a', Image.new('RGB', (32, 32), color='blue'))
+    asset = _asset(campaign_dir)
+    journal.record_unit(asset)
+    journal.close()
+    
+    resumed = RunJournal(campaign_dir)
+    resumed.start(resume=True)
+    
+    assert resumed.completed_units == 1
+    assert resumed.get_unit('product_a', '1:1') == asset
+    assert resumed.get_hero('product_a').size == (32, 32)
+    assert resumed.get_hero('product_b') is None
+
+
+def test_torn_final_line_is_discarded(campaign_dir):
+    """Test that a partial write at crash time does not break resume."""
+    journal = RunJournal(campaign_dir)
+    journal.start()
+    journal.record_unit(_asset(campaign_dir, '1:1'))
+    journal.close()
+    
+    with open(journal.journal_path, 'a') as f:
+        f.write('{"event": "unit", "product_')
+    
+    resumed = RunJournal(campaign_dir)
+    resumed.start(resume=True)
+    resumed.record_unit(_asset(campaign_dir, '9:16'))
+    resumed.close()
+    
+    reloaded = RunJournal(campaign_dir)
+    reloaded.start(resume=True)
+    assert reloaded.completed_units == 2
+
+
+def test_unit_with_missing_file_is_not_reused(campaign_dir):
+    """Test that deleted outputs are rebuilt on resume."""
+    journal = RunJournal(campaign_dir)
+    journal.start()
+    asset = _asset(campaign_dir)
+    journal.record_unit(asset)
+    Path(asset.file_path).unlink()
+    
+    assert journal.get_unit('product_a', '1:1') is None
+
+
+def test_start_without_resume_discards_previous_run(campaign_dir):
+    """Test that a fresh start clears the journal and hero checkpoints."""
+    journal = RunJournal(campaign_dir)
+    journal.start()
+    journal.record_hero('product_a', Image.new('RGB', (8, 8)))
+    journal.record_unit(_asset(campaign_dir))
+    journal.close()
+    
+    fresh = RunJournal(campaign_dir)
+    fresh.start(resume=False)
+    
+    assert fresh.completed_units == 0
+    assert fresh.get_hero('product_a') is None
+    assert fresh.journal_path.read_text() == ''
+
+
+def test_resume_with_other_fingerprint_starts_fresh(campaign_dir):
+    """Test that a journal recorded for another brief or settings is discarded."""
+    journal = RunJournal(campaign_dir)
+    assert journal.start(fingerprint='first') is False
+    journal.record_hero('product_a', Image.new('RGB', (8, 8)))
+    journal.record_unit(_asset(campaign_dir))
+    journal.close()
+    
+    same = RunJournal(campaign_dir)
+    assert same.start(resume=True, fingerprint='first') is True
+    assert same.completed_units == 1
+    same.close()
+    
+    changed = RunJournal(campaign_dir)
+    assert changed.start(resume=True, fingerprint='second') is False
+    assert changed.completed_units == 0
+    assert changed.get_hero('product_a') is None
+    changed.close()
+    
+    reloaded = RunJournal(campaign_dir)
+    assert reloaded.start(resume=True, fingerprint='second') is True
+
+
+def test_run_fingerprint_covers_brief_and_settings():
+    """Test that the fingerprint changes with the brief and with the settings."""
+    brief = CampaignBrief(
+        campaign_id='test_campaign',
+        products=[Product(product_id='product_a', name='Premium Coffee')],
+        target_region='US',
+        target_audience='millennials',
+        campaign_message='Start your day right'
+    )
+    fingerprint = compute_run_fingerprint(brief, {'aspect_ratios': ['1:1']})
+    
+    assert compute_run_fingerprint(brief, {'aspect_ratios': ['1:1']}) == fingerprint
+    assert compute_run_fingerprint(brief, {'aspect_ratios': ['9:16']}) != fingerprint
+    brief.products[0].name = 'Organic Tea'
+    assert compute_run_fingerprint(brief, {'aspect_ratios': ['1:1']}) != fingerprint
@@ -0,0 +1,136 @@
+"""Tests for the pipeline daemon server."""
+
+import json
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+from src.orchestrator import PipelineOrchestrator
+from src.server import PipelineServer, ServerUnavailableError
+
+
+@pytest.fixture
+def orchestrator():
+    """Create an orchestrator with a mocked GenAI client."""
+    with tempfile.TemporaryDirectory() as input_dir, \
+         tempfile.TemporaryDirectory() as output_dir:
+        config = {
+            'storage': {'input_dir': input_dir, 'output_dir': output_dir},
+            'genai': {'provider': 'openai', 'api_key': 'test-key'},
+            'aspect_ratios': ['1:1', '16:9'],
+            'logging': {'level': 'WARNING', 'file': None}
+        }
+        orchestrator = PipelineOrchestrator(config)
+        orchestrator.genai_client = Mock()
+        orchestrator.genai_client._build_prompt = Mock(return_value="test prompt")
+        orchestrator.genai_client.generate_image = Mock(return_value=Image.new('RGB', (256, 256), 'blue'))
+        yield orchestrator
+        orchestrator.close()
+
+
+@pytest.fixture
+def brief():
+    """Create a minimal campaign brief."""
+    return {
+        'campaign_id': 'server_campaign',
+        'products': [{'product_id': 'product_a', 'name': 'Premium Coffee'}],
+        'target_region': 'US',
+        'target_audience': 'commuters',
+        'campaign_message': 'Wake up'
+    }
+
+
+def _request(server, method, path, payload=None):
+    """Send a request and return (status, decoded JSON body)."""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(f"http://127.0.0.1:{server.port}{path}", data=data, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_submit_and_stream_job(orchestrator, brief):
+    """Test that a submitted brief runs and its events stream to completion."""
+    server = PipelineServer(orchestrator, port=0)
+    server.start()
+    try:
+        status, job = _request(server, 'POST', '/jobs', {'brief': brief})
+        assert status == 202
+        
+        url = f"http://127.0.0.1:{server.port}/jobs/{job['job_id']}/events"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            events = [json.loads(line) for line in response.read().splitlines()]
+        
+        assert [event['status'] for event in events] == ['queued', 'running', 'succeeded']
+        result = events[-1]['result']
+        assert result['campaign_id'] == 'server_campaign'
+        assert len(result['outputs']) == 2
+        
+        status, final = _request(server, 'GET', f"/jobs/{job['job_id']}")
+        assert status == 200
+        assert final['status'] == 'succeeded'
+        # The staged brief is removed once the job ends
+        assert not Path(final['brief_path']).exists()
+    finally:
+        server.shutdown()
+
+
+def test_submitted_brief_file_is_kept(orchestrator, brief, tmp_path):
+    """Test that only briefs staged by the server are deleted."""
+    brief_path = tmp_path / 'brief.json'
+    brief_path.write_text(json.dumps(brief))
+    server = PipelineServer(orchestrator, port=0)
+    server.start()
+    
+    job = server.submit(brief_path=str(brief_path))
+    server.shutdown(drain=True)
+    
+    assert job.status == 'succeeded'
+    assert brief_path.exists()
+
+
+def test_invalid_submissions_are_rejected(orchestrator):
+    """Test error responses for bad requests."""
+    server = PipelineServer(orchestrator, port=0)
+    server.start()
+    try:
+        assert _request(server, 'POST', '/jobs', {'brief_path': '/missing/brief.json'})[0] == 400
+        assert _request(server, 'GET', '/jobs/unknown')[0] == 404
+        status, health = _request(server, 'GET', '/health')
+        assert status == 200
+        assert health['status'] == 'ok'
+    finally:
+        server.shutdown()
+
+
+def test_queue_is_bounded_and_drained_on_shutdown(orchestrator, brief):
+    """Test backpressure on a full queue and that shutdown finishes queued jobs."""
+    release = threading.Event()
+    generate = orchestrator.genai_client.generate_image.return_value
+    orchestrator.genai_client.generate_image = Mock(side_effect=lambda prompt: release.wait(10) and generate)
+    
+    server = PipelineServer(orchestrator, port=0, max_concurrent_jobs=1, max_queued_jobs=1)
+    server.start()
+    
+    running = server.submit(brief=brief)
+    server.wait_for_events(running, 1, timeout=10)  # Wait until it leaves the queue
+    queued = server.submit(brief=brief)
+    with pytest.raises(ServerUnavailableError):
+        server.submit(brief=brief)
+    
+    release.set()
+    server.shutdown(drain=True)
+    
+    assert running.status == 'succeeded'
+    assert queued.status == 'succeeded'
+    assert list(server.staging_dir.iterdir()) == []
+    with pytest.raises(ServerUnavailableError):
+        server.submit(brief=brief)
@@ -0,0 +1,73 @@
+"""Unit tests for planning generation sizes."""
+
+import pytest
+
+from src.clients.coalescing_client import CoalescingGenAIClient
+from src.clients.openai_client import OpenAIClient
+from src.utils.size_planner import GenerationPlan, crop_size, parse_aspect_ratio, plan_generation_sizes
+
+
+DALLE3_SIZES = [(1024, 1024), (1024, 1792), (1792, 1024)]
+IMAGEN_SIZES = [(1024, 1024), (768, 1408), (1408, 768), (1280, 896), (896, 1280)]
+RATIOS = ['1:1', '9:16', '16:9']
+
+
+def test_crop_size_matches_compositor():
+    """Test that crops are the largest of the ratio that fit the source."""
+    assert crop_size((1024, 1024), '9:16') == (576, 1024)
+    assert crop_size((1024, 1024), '16:9') == (1024, 576)
+    assert crop_size((1024, 1792), '1:1') == (1024, 1024)
+    with pytest.raises(ValueError, match="Invalid aspect ratio"):
+        parse_aspect_ratio('wide')
+
+
+def test_single_square_hero_wastes_pixels():
+    """Test the efficiency of cropping every ratio from one square image."""
+    plan = GenerationPlan.single(RATIOS)
+    
+    assert plan.calls == 1
+    assert plan.pixel_efficiency == pytest.approx((1 + 0.5625 + 0.5625) / 3)
+
+
+def test_variants_share_a_native_size_when_it_serves_them_best():
+    """Test that 1:1 is cropped from DALL-E 3's portrait size rather than costing a call."""
+    plan = plan_generation_sizes(RATIOS, DALLE3_SIZES)
+    
+    assert plan.sizes == [(1024, 1792), (1792, 1024)]
+    assert plan.crop('1:1') == (1024, 1024)
+    assert plan.crop('9:16') == (1008, 1792)
+    assert plan.pixel_efficiency > 0.84
+    assert plan.as_dict()['variants']['16:9'] == {'source': [1792, 1024], 'crop': [1792, 1008]}
+
+
+def test_max_calls_limits_sizes():
+    """Test that a call budget keeps the size giving the most usable pixels."""
+    assert plan_generation_sizes(RATIOS, DALLE3_SIZES, max_calls=1).sizes == [(1024, 1792)]
+    assert plan_generation_sizes(RATIOS, IMAGEN_SIZES, max_calls=1).sizes == [(1024, 1024)]
+    assert plan_generation_sizes(RATIOS, DALLE3_SIZES, max_calls=0).calls == 1
+
+
+def test_native_aspect_ratios_get_their_own_size():
+    """Test that ratios the provider generates natively are not cropped."""
+    plan = plan_generation_sizes(RATIOS + ['4:3'], IMAGEN_SIZES)
+    
+    assert plan.sources == {
+        '1:1': (1024, 1024), '9:16': (768, 1408), '16:9': (1408, 768), '4:3': (1280, 896)
+    }
+    assert plan.pixel_efficiency > 0.96
+
+
+def test_any_size_provider_gets_exact_ratios():
+    """Test that providers without native sizes are asked for each ratio at the default pixel count."""
+    plan = plan_generation_sizes(RATIOS)
+    
+    assert plan.sizes == [(1024, 1024), (768, 1365), (1365, 768)]
+    assert plan.pixel_efficiency > 0.99
+
+
+def test_clients_report_native_sizes():
+    """Test that native sizes follow the model and pass through wrappers."""
+    client = OpenAIClient(api_key="test-key")
+    
+    assert CoalescingGenAIClient(client).native_sizes == DALLE3_SIZES
+    assert OpenAIClient(api_key="test-key", model="dall-e-2").native_sizes == [(1024, 1024)]
@@ -0,0 +1,149 @@
+"""Integration tests for StreamingPipelineOrchestrator."""
+
+import pytest
+import tempfile
+import json
+import time
+from pathlib import Path
+from unittest.mock import Mock
+from PIL import Image
+
+from src.streaming_orchestrator import StreamingPipelineOrchestrator, STAGES
+from src.orchestrator import create_orchestrator
+from src.utils.reporter import PipelineReporter
+
+
+@pytest.fixture
+def temp_dirs():
+    """Create temporary directories for testing."""
+    with tempfile.TemporaryDirectory() as input_dir, \
+         tempfile.TemporaryDirectory() as output_dir:
+        yield {
+            'input_dir': input_dir,
+            'output_dir': output_dir
+        }
+
+
+@pytest.fixture
+def test_config(temp_dirs):
+    """Create test configuration for the streaming engine."""
+    return {
+        'storage': {
+            'input_dir': temp_dirs['input_dir'],
+            'output_dir': temp_dirs['output_dir']
+        },
+        'aspect_ratios': ['1:1', '9:16', '16:9'],
+        'logging': {
+            'level': 'INFO',
+            'file': None
+        },
+        'performance': {
+            'engine': 'streaming',
+            'queue_size': 2,
+            'stage_workers': {'generate': 3, 'overlay': 2}
+        }
+    }
+
+
+@pytest.fixture
+def brief_file(temp_dirs):
+    """Create a brief with six products."""
+    brief_data = {
+        'campaign_id': 'streaming_campaign',
+        'products': [
+            {'product_id': f'product_{i}', 'name': f'Product {i}'}
+            for i in range(6)
+        ],
+        'target_region': 'US',
+        'target_audience': 'everyone',
+        'campaign_message': 'Buy now'
+    }
+    brief_path = Path(temp_dirs['input_dir']) / 'streaming_brief.json'
+    with open(brief_path, 'w') as f:
+        json.dump(brief_data, f)
+    return str(brief_path)
+
+
+def make_client(fail_on=None):
+    """Create a mock GenAI client with a small, uneven latency."""
+    def generate(prompt, *args, **kwargs):
+        index = int(prompt[-1])
+        time.sleep(0.01 * (6 - index))
+        if index == fail_on:
+            raise Exception("Generation failed")
+        return Image.new('RGB', (200, 200), color='purple')
+    
+    client = Mock()
+    client._build_prompt = Mock(side_effect=lambda product_name, **kwargs: product_name)
+    client.generate_image = Mock(side_effect=generate)
+    return client
+
+
+def test_create_orchestrator_streaming(test_config):
+    """Test that the streaming engine is selectable from config."""
+    assert isinstance(create_orchestrator(test_config), StreamingPipelineOrchestrator)
+
+
+def test_unknown_stage_rejected(test_config):
+    """Test that misspelled stage names are reported."""
+    test_config['performance']['stage_workers'] = {'resize': 2}
+    with pytest.raises(ValueError, match="Unknown pipeline stage"):
+        StreamingPipelineOrchestrator(test_config)
+
+
+def test_streaming_run_outputs_in_brief_order(test_config, brief_file):
+    """Test that the stage pipeline returns every output in brief order."""
+    orchestrator = StreamingPipelineOrchestrator(test_config)
+    orchestrator.genai_client = make_client()
+    
+    result = orchestrator.run(brief_file)
+    
+    assert result.success is True
+    expected = [
+        (f'product_{i}', ratio)
+        for i in range(6)
+        for ratio in ['1:1', '9:16', '16:9']
+    ]
+    assert [(a.product_id, a.aspect_ratio) for a in result.outputs] == expected
+    for asset in result.outputs:
+        assert Path(asset.file_path).exists()
+
+
+def test_streaming_run_reports_stage_metrics(test_config, brief_file, temp_dirs):
+    """Test that queue depths and utilisation are exposed per stage."""
+    orchestrator = StreamingPipelineOrchestrator(test_config)
+    orchestrator.genai_client = make_client()
+    
+    result = orchestrator.run(brief_file)
+    
+    stages = result.metrics['stages']
+    assert list(stages.keys()) == STAGES
+    assert stages['generate']['workers'] == 3
+    assert stages['lookup']['items'] == 6
+    assert stages['crop']['items'] == 6
+    assert stages['overlay']['items'] == 18
+    assert stages['report']['items'] == 18
+    for stage in stages.values():
+        assert stage['max_queue_depth'] <= 2
+        assert 0.0 <= stage['utilization'] <= 1.0
+    
+    report_path = Path(temp_dirs['output_dir']) / 'streaming_campaign' / 'report.json'
+    with open(report_path) as f:
+        report = json.load(f)
+    assert report['metrics']['stages']['save']['items'] == 18
+    assert "Bottleneck:" in PipelineReporter.format_summary(report)
+
+
+def test_streaming_run_isolates_failures(test_config, brief_file):
+    """Test that a failing product is reported while the rest complete."""
+    orchestrator = StreamingPipelineOrchestrator(test_config)
+    orchestrator.genai_client = make_client(fail_on=2)
+    
+    result = orchestrator.run(brief_file)
+    
+    assert result.success is False
+    assert len(result.errors) == 1
+    assert 'product_2' in result.errors[0]
+    assert len(result.outputs) == 15
+    assert 'product_2' not in {a.product_id for a in result.outputs}
+    assert result.metrics['stages']['generate']['failures'] == 1